@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Depends
+from .query_stats import router as query_stats_router
+from .dependencies import require_admin_token
+
+router = APIRouter(
+    prefix="/v2/admin", tags=["Admin"], dependencies=[Depends(require_admin_token)]
+)
+
+router.include_router(query_stats_router)
@@ -0,0 +1,20 @@
+import secrets
+
+from typing import Optional
+from fastapi import Header, HTTPException, status
+
+from core.config import env
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    # Hidden entirely unless an admin token is configured
+    if not env.admin_api_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    # Compared as bytes: compare_digest rejects non-ASCII str with TypeError
+    if not x_admin_token or not secrets.compare_digest(
+        x_admin_token.encode(), env.admin_api_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token"
+        )
@@ -0,0 +1,21 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+
+from core.query_stats import query_stats
+from core.rate_limiter import RateLimiter
+
+router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60))])
+
+
+@router.get("/queries")
+async def top_queries(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: Literal["total_time", "count", "p99", "rows"] = "total_time",
+):
+    return ORJSONResponse(
+        content={
+            "slow_threshold_ms": query_stats.slow_threshold * 1000,
+            "fingerprints": query_stats.top(limit=limit, order_by=order_by),
+        }
+    )
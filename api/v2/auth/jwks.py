@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+
+from core.jwt_keys import key_ring
+
+router = APIRouter()
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks():
+    # Public keys only; lets downstream services verify tokens locally
+    return ORJSONResponse(
+        content=key_ring.jwks(), headers={"Cache-Control": "public, max-age=300"}
+    )
@@ -10,6 +10,7 @@ from fastapi import (
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from core.query_budget import query_budget
 from core.rate_limiter import RateLimiter
 from database.models.auth_identities import AuthIdentity
 from database.models.users import Users
@@ -26,6 +27,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
 
 
 @router.post("/login", response_model=LoginOut)
+@query_budget(db=1, redis=1)
 async def login(
     response: Response,
     request: Request,
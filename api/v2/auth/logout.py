@@ -3,7 +3,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.logger import logger
 from core.rate_limiter import RateLimiter
-from database.models.jti_blocklist import JtiBlocklist
+from core.token_blocklist import cache_revoked_jti, revoke_jti
 from core.utils import get_valid_refresh_payload
 from api.v2.schemas.authorization_schemas import LogoutResponse
 from database.db.session import get_db
@@ -18,11 +18,8 @@ async def logout(
 
     payload = await get_valid_refresh_payload(request, db)
 
-    jti_value = payload.jti
-    blacklisted_jti = JtiBlocklist(jti=jti_value)
-
     try:
-        db.add(blacklisted_jti)
+        await revoke_jti(db, payload)
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -41,6 +38,8 @@ async def logout(
             detail="Internal Server Error",
         )
 
+    await cache_revoked_jti(payload)
+
     response.delete_cookie(
         key="refresh_token",
         httponly=True,
@@ -1,9 +1,9 @@
 from fastapi import Depends, APIRouter, HTTPException, Request, Response, status
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.logger import logger
 from core.rate_limiter import RateLimiter
-from database.models.jti_blocklist import JtiBlocklist
+from core.token_blocklist import cache_revoked_jti, revoke_jti
 from core.utils import get_valid_refresh_payload
 from api.v2.schemas.authorization_schemas import Token
 from database.db.session import get_db
@@ -22,12 +22,16 @@ async def refresh_token(
 
     payload = await get_valid_refresh_payload(request, db)
 
-    jti_value = payload.jti
-    blacklisted_jti = JtiBlocklist(jti=jti_value)
-
     try:
-        db.add(blacklisted_jti)
+        await revoke_jti(db, payload)
         await db.commit()
+    except IntegrityError:
+        # A concurrent refresh with the same cookie revoked it first: a replay
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token expired or blocklisted",
+        )
     except SQLAlchemyError as e:
         await db.rollback()
 
@@ -44,6 +48,8 @@ async def refresh_token(
             detail="Internal Server Error",
         )
 
+    await cache_revoked_jti(payload)
+
     access_token_data = {
         "user_id": payload.user_id,
         "token_type": "access",
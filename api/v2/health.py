@@ -4,6 +4,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.v2.schemas.health_schemas import Health
+from core.kafka.kafka_producer import kafka_producer
 
 router = APIRouter(tags=["Health"])
 
@@ -23,3 +24,13 @@ async def check_db(db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="DB not ready",
         )
+
+
+@router.get("/health/kafka", response_model=Health)
+def check_kafka():
+    if not kafka_producer.connected.is_set():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Kafka not connected, events are spooled",
+        )
+    return {"status": "kafka ready"}
@@ -6,6 +6,10 @@ from .select import router as select_router
 from .update import router as update_router
 from .delete import router as delete_router
 from .remove_member import router as remove_member_router
+from .export_users import router as export_users_router
+from .list_audit_logs import router as list_audit_logs_router
+from .bulk_members import router as bulk_members_router
+from .sync_members import router as sync_members_router
 
 router = APIRouter(prefix="/v2/organizations", tags=["Organizations"])
 
@@ -16,3 +20,7 @@ router.include_router(register_router)
 router.include_router(update_router)
 router.include_router(delete_router)
 router.include_router(remove_member_router)
+router.include_router(export_users_router)
+router.include_router(list_audit_logs_router)
+router.include_router(bulk_members_router)
+router.include_router(sync_members_router)
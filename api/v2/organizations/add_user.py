@@ -3,6 +3,8 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.logger import logger
+from core.query_budget import query_budget
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from database.models.organization_member import OrganizationMember
 from api.v2.schemas.organization_schemas import (
@@ -18,6 +20,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
 
 
 @router.post("/member", status_code=status.HTTP_201_CREATED, response_model=AddUsersOut)
+@query_budget(db=6, redis=9)
 async def add_user(
     request: Request,
     input: AddUsers,
@@ -139,6 +142,19 @@ async def add_user(
         )
 
         db.add(new_member)
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            action="user.added",
+            resource_type="organizations",
+            organization_id=membership.organization_id,
+            status="success",
+            meta_data={"email": input.email, "role": membership.role},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/organization/add_user",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -157,19 +173,6 @@ async def add_user(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=current_user.id,
-        action="user.added",
-        resource_type="organizations",
-        organization_id=membership.organization_id,
-        status="success",
-        meta_data={"email": input.email, "role": membership.role},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="/organization/add_user",
-    )
-
     await invalidate_redis_keys_on_mem_change(
         org_id=membership.organization_id, user_id=existing_user.id
     )
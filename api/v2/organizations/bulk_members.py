@@ -0,0 +1,311 @@
+from fastapi import BackgroundTasks, Request, status, HTTPException, Depends, APIRouter
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.logger import logger
+from core.oauth2 import get_user_and_membership
+from core.outbox import add_outbox_event
+from core.query_budget import query_budget
+from core.rate_limiter import RateLimiter
+from core.utils import (
+    audit_logs,
+    dialect_insert,
+    invalidate_redis_keys_on_bulk_mem_change,
+)
+from api.v2.schemas.organization_schemas import (
+    BulkAddUsers,
+    BulkMembersOut,
+    BulkRemoveMembers,
+)
+from database.db.session import get_db
+from database.models.organization_member import OrganizationMember, OrgRole
+from database.models.project_member import ProjectMember
+from database.models.projects import Project
+from database.models.users import Users
+
+router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=5, time_frame=60))])
+
+
+async def resolve_members(db: AsyncSession, org_id: int, emails):
+    """Maps each email that belongs to a live user to (user_id, org role or
+    None if not a member), with one IN query."""
+    rows = await db.execute(
+        select(Users.email, Users.id, OrganizationMember.role)
+        .outerjoin(
+            OrganizationMember,
+            and_(
+                OrganizationMember.user_id == Users.id,
+                OrganizationMember.organization_id == org_id,
+            ),
+        )
+        .where(Users.email.in_(emails), Users.is_deleted.is_(False))
+    )
+    return {
+        email: (user_id, role.value if isinstance(role, OrgRole) else role)
+        for email, user_id, role in rows
+    }
+
+
+@router.post(
+    "/members/bulk", status_code=status.HTTP_200_OK, response_model=BulkMembersOut
+)
+@query_budget(db=5, redis=9)
+async def bulk_add_users(
+    request: Request,
+    input: BulkAddUsers,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user_and_membership=Depends(get_user_and_membership),
+):
+
+    current_user, membership = current_user_and_membership
+    org_id = membership.organization_id
+
+    if membership.role not in ("owner", "admin"):
+        background_tasks.add_task(
+            audit_logs,
+            actor_user_id=current_user.id,
+            action="addition.failed",
+            resource_type="organizations",
+            organization_id=org_id,
+            status="failed",
+            meta_data={"emails": len(input.members), "role": membership.role},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/organization/members/bulk",
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authorized to add users to organization",
+        )
+
+    # First occurrence of an email wins; later ones are reported as duplicates
+    requested = {}
+    for member in input.members:
+        requested.setdefault(member.email, member.role)
+
+    found = await resolve_members(db, org_id, list(requested))
+
+    missing = requested.keys() - found.keys()
+    existing = {email for email, (_, role) in found.items() if role is not None}
+    forbidden = (
+        {email for email, role in requested.items() if role == "owner"}
+        if membership.role == "admin"
+        else set()
+    )
+    new = requested.keys() - missing - existing - forbidden
+
+    added = set()
+    if new:
+        try:
+            inserted = await db.execute(
+                dialect_insert(db, OrganizationMember)
+                .values(
+                    [
+                        {
+                            "user_id": found[email][0],
+                            "organization_id": org_id,
+                            "role": requested[email],
+                        }
+                        for email in new
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["user_id", "organization_id"])
+                .returning(OrganizationMember.user_id)
+            )
+            added_ids = set(inserted.scalars().all())
+            # Anyone not inserted was added concurrently by another request
+            added = {email for email in new if found[email][0] in added_ids}
+
+            for email in sorted(added):
+                add_outbox_event(
+                    db,
+                    actor_user_id=current_user.id,
+                    action="user.added",
+                    resource_type="organizations",
+                    organization_id=org_id,
+                    status="success",
+                    meta_data={"email": email, "role": requested[email]},
+                    ip_address=request.client.host if request.client else None,
+                    user_agent=request.headers.get("user-agent"),
+                    endpoint="/organization/members/bulk",
+                )
+
+            await db.commit()
+
+        except SQLAlchemyError as e:
+            await db.rollback()
+
+            logger.exception(
+                "Database error",
+                extra={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                },
+            )
+
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error",
+            )
+
+    if added:
+        await invalidate_redis_keys_on_bulk_mem_change(
+            org_id=org_id, user_ids=[found[email][0] for email in added]
+        )
+
+    results = []
+    seen = set()
+    for member in input.members:
+        email = member.email
+        if email in seen:
+            member_status = "duplicate"
+        elif email in missing:
+            member_status = "not_found"
+        elif email in forbidden:
+            member_status = "forbidden"
+        elif email in added:
+            member_status = "added"
+        else:
+            member_status = "already_member"
+        seen.add(email)
+        results.append({"email": email, "status": member_status})
+
+    return {"results": results}
+
+
+@router.delete(
+    "/members/bulk", status_code=status.HTTP_200_OK, response_model=BulkMembersOut
+)
+@query_budget(db=7, redis=9)
+async def bulk_remove_members(
+    request: Request,
+    payload: BulkRemoveMembers,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user_and_membership=Depends(get_user_and_membership),
+):
+
+    current_user, membership = current_user_and_membership
+    org_id = membership.organization_id
+
+    if membership.role not in ("owner", "admin"):
+        background_tasks.add_task(
+            audit_logs,
+            actor_user_id=current_user.id,
+            action="remove.member",
+            resource_type="organizations",
+            organization_id=org_id,
+            status="failed",
+            meta_data={"emails": len(payload.emails), "role": membership.role},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/delete/organization/members/bulk",
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to remove the member from the organization",
+        )
+
+    requested = list(dict.fromkeys(payload.emails))
+    found = await resolve_members(db, org_id, requested)
+
+    missing = set(requested) - found.keys()
+    not_member = {email for email, (_, role) in found.items() if role is None}
+    owners = {email for email, (_, role) in found.items() if role == "owner"}
+    forbidden = owners if membership.role == "admin" else set()
+    removable = set(requested) - missing - not_member - forbidden
+
+    last_owner = set()
+    owners_removed = owners & removable
+    if owners_removed:
+        owners_count = (
+            await db.execute(
+                select(func.count()).where(
+                    OrganizationMember.organization_id == org_id,
+                    OrganizationMember.role == "owner",
+                )
+            )
+        ).scalar_one()
+        # Never leave the organization without an owner
+        if len(owners_removed) >= owners_count:
+            last_owner = owners_removed
+            removable -= owners_removed
+
+    if removable:
+        user_ids = [found[email][0] for email in removable]
+        try:
+            # Delete members from the organization's projects
+            await db.execute(
+                delete(ProjectMember).where(
+                    ProjectMember.user_id.in_(user_ids),
+                    ProjectMember.project_id.in_(
+                        select(Project.id).where(
+                            Project.organization_id == org_id,
+                            Project.is_deleted.is_(False),
+                        )
+                    ),
+                )
+            )
+
+            # Delete members from the organization
+            await db.execute(
+                delete(OrganizationMember).where(
+                    OrganizationMember.organization_id == org_id,
+                    OrganizationMember.user_id.in_(user_ids),
+                )
+            )
+
+            for email in sorted(removable):
+                add_outbox_event(
+                    db,
+                    actor_user_id=current_user.id,
+                    action="remove.member",
+                    resource_type="organizations",
+                    organization_id=org_id,
+                    status="success",
+                    meta_data={"user_id": found[email][0]},
+                    ip_address=request.client.host if request.client else None,
+                    user_agent=request.headers.get("user-agent"),
+                    endpoint="/delete/organization/members/bulk",
+                )
+
+            await db.commit()
+
+        except SQLAlchemyError as e:
+            await db.rollback()
+
+            logger.exception(
+                "Database error",
+                extra={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                },
+            )
+
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error",
+            )
+
+        await invalidate_redis_keys_on_bulk_mem_change(org_id=org_id, user_ids=user_ids)
+
+    results = []
+    seen = set()
+    for email in payload.emails:
+        if email in seen:
+            member_status = "duplicate"
+        elif email in missing:
+            member_status = "not_found"
+        elif email in not_member:
+            member_status = "not_member"
+        elif email in forbidden:
+            member_status = "forbidden"
+        elif email in last_owner:
+            member_status = "last_owner"
+        else:
+            member_status = "removed"
+        seen.add(email)
+        results.append({"email": email, "status": member_status})
+
+    return {"results": results}
@@ -3,6 +3,7 @@ from sqlalchemy import delete, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.logger import logger
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from core.utils import audit_logs, invalidate_redis_keys_on_org_delete
 from database.models.organization import Organization
@@ -106,6 +107,19 @@ async def delete_organization(
             )
         )
 
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            action="org.deleted",
+            resource_type="organizations",
+            organization_id=membership.organization_id,
+            status="success",
+            meta_data={"action": "soft_delete"},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/organization/delete",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -124,19 +138,6 @@ async def delete_organization(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=current_user.id,
-        action="org.deleted",
-        resource_type="organizations",
-        organization_id=membership.organization_id,
-        status="success",
-        meta_data={"action": "soft_delete"},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="/organization/delete",
-    )
-
     await invalidate_redis_keys_on_org_delete(org_id=membership.organization_id)
 
     return {"response": "Organization deleted", "action": "logout the user"}
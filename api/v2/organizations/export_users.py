@@ -0,0 +1,95 @@
+import hashlib
+
+from fastapi import Query, Request, Response, status, HTTPException, Depends, APIRouter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.export import (
+    EXPORT_BATCH_SIZE,
+    MEDIA_TYPES,
+    ExportFormat,
+    etag_matches,
+    stream_rows,
+)
+from core.query_budget import query_budget
+from core.rate_limiter import RateLimiter
+from core.redis.versioned_cache import resolve_versions
+from database.models.organization_member import OrganizationMember
+from database.models.users import Users
+from database.db.session import get_db
+from core.oauth2 import get_user_and_membership
+
+router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60))])
+
+EXPORT_FIELDS = ["user_id", "name", "email", "role"]
+
+
+@router.get("/users/export", status_code=status.HTTP_200_OK)
+@query_budget(db=4, redis=9)
+async def export_users(
+    request: Request,
+    format: ExportFormat = Query("ndjson"),
+    db: AsyncSession = Depends(get_db),
+    current_user_and_membership=Depends(get_user_and_membership),
+):
+
+    user, membership = current_user_and_membership
+
+    if membership.role not in ("owner", "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to export users of organization",
+        )
+
+    org_id = membership.organization_id
+
+    # The org version covers membership changes, each member's user version
+    # covers their profile, so together they validate the whole export
+    member_ids = (
+        await db.scalars(
+            select(OrganizationMember.user_id)
+            .join(Users, Users.id == OrganizationMember.user_id)
+            .where(
+                OrganizationMember.organization_id == org_id,
+                Users.is_deleted.is_(False),
+            )
+            .order_by(OrganizationMember.user_id.asc())
+        )
+    ).all()
+    version, *member_versions = await resolve_versions(
+        [f"org_id:{org_id}:version"]
+        + [f"user_id:{member_id}:version" for member_id in member_ids]
+    )
+    members_digest = hashlib.blake2b(
+        ",".join(
+            f"{member_id}:{member_version}"
+            for member_id, member_version in zip(member_ids, member_versions)
+        ).encode(),
+        digest_size=8,
+    ).hexdigest()
+    etag = f'W/"org-{org_id}-members-v{version}-{members_digest}-{format}"'
+
+    if etag_matches(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    result = await db.stream(
+        select(Users.id, Users.name, Users.email, OrganizationMember.role)
+        .join(OrganizationMember, OrganizationMember.user_id == Users.id)
+        .where(
+            OrganizationMember.organization_id == org_id,
+            Users.is_deleted.is_(False),
+        )
+        .order_by(Users.id.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    return StreamingResponse(
+        stream_rows(result, EXPORT_FIELDS, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "ETag": etag,
+            "Content-Disposition": f'attachment; filename="org-{org_id}-members.{format}"',
+        },
+    )
@@ -0,0 +1,160 @@
+import hashlib
+import orjson
+
+from datetime import datetime
+from typing import Optional
+from fastapi import Query, status, HTTPException, Depends, APIRouter
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import cast, select, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.v2.schemas.organization_schemas import ListAuditLogs
+from core.oauth2 import get_user_and_membership
+from core.pagination import decode_time_cursor, encode_time_cursor
+from core.query_budget import query_budget
+from core.rate_limiter import RateLimiter
+from core.redis.versioned_cache import get_versioned, set_versioned
+from database.db.session import get_db
+from database.models.audit_log import AuditLog
+
+router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=30, time_frame=60))])
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# New events do not bump the org version, so the newest page may lag by this
+AUDIT_LOG_CACHE_TTL_SECONDS = 30
+
+
+@router.get("/audit-logs", status_code=status.HTTP_200_OK, response_model=ListAuditLogs)
+@query_budget(db=3, redis=11)
+async def list_audit_logs(
+    action: Optional[str] = Query(None),
+    actor_user_id: Optional[int] = Query(None),
+    resource_type: Optional[str] = Query(None),
+    resource_id: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    meta: Optional[str] = Query(
+        None,
+        description='JSON object the event\'s meta_data must contain, e.g. {"role": "admin"}',
+    ),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user_and_membership=Depends(get_user_and_membership),
+):
+
+    user, membership = current_user_and_membership
+
+    if membership.role not in ("owner", "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view audit logs of organization",
+        )
+
+    org_id = membership.organization_id
+    position = decode_time_cursor(after)
+
+    meta_filter = None
+    if meta is not None:
+        try:
+            meta_filter = orjson.loads(meta)
+        except orjson.JSONDecodeError:
+            meta_filter = None
+        if not isinstance(meta_filter, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="meta must be a JSON object",
+            )
+
+    filters = orjson.dumps(
+        [
+            action,
+            actor_user_id,
+            resource_type,
+            resource_id,
+            since,
+            until,
+            meta_filter,
+            after,
+            page_size,
+        ],
+        option=orjson.OPT_SORT_KEYS,
+    )
+    digest = hashlib.sha1(filters).hexdigest()
+
+    cache_key, cached_audit_logs = await get_versioned(
+        "list_audit_logs",
+        [f"org_id:{org_id}:version"],
+        lambda version: f"org_id:{org_id}:v{version}:audit_logs:{digest}",
+    )
+
+    if cached_audit_logs:
+        return ORJSONResponse(content=cached_audit_logs)
+
+    # Newest first; every filter below is served by an index ending in
+    # (timestamp, id), so each page is one index range scan
+    query = (
+        select(AuditLog)
+        .where(AuditLog.organization_id == org_id)
+        .order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+        .limit(page_size + 1)
+    )
+
+    if action is not None:
+        query = query.where(AuditLog.action == action)
+    if actor_user_id is not None:
+        query = query.where(AuditLog.actor_user_id == actor_user_id)
+    if resource_type is not None:
+        query = query.where(AuditLog.resource_type == resource_type)
+    if resource_id is not None:
+        query = query.where(AuditLog.resource_id == resource_id)
+    if since is not None:
+        query = query.where(AuditLog.timestamp >= since)
+    if until is not None:
+        query = query.where(AuditLog.timestamp < until)
+    if meta_filter is not None:
+        query = query.where(
+            AuditLog.meta_data.op("@>")(cast(orjson.dumps(meta_filter).decode(), JSONB))
+        )
+    if position is not None:
+        query = query.where(tuple_(AuditLog.timestamp, AuditLog.id) < position)
+
+    audit_logs = (await db.execute(query)).scalars().all()
+
+    # one extra row tells us whether another page exists
+    next_cursor = None
+    if len(audit_logs) > page_size:
+        audit_logs = audit_logs[:page_size]
+        next_cursor = encode_time_cursor(audit_logs[-1].timestamp, audit_logs[-1].id)
+
+    audit_logs_in_org = ListAuditLogs(
+        organization_id=org_id,
+        page_size=page_size,
+        audit_logs=[
+            {
+                "id": log.id,
+                "timestamp": log.timestamp,
+                "actor_user_id": log.actor_user_id,
+                "action": log.action,
+                "resource_type": log.resource_type,
+                "resource_id": log.resource_id,
+                "status": log.status,
+                "meta_data": log.meta_data,
+                "ip_address": log.ip_address,
+                "user_agent": log.user_agent,
+                "endpoint": log.endpoint,
+            }
+            for log in audit_logs
+        ],
+        next_cursor=next_cursor,
+    )
+
+    await set_versioned(
+        cache_key,
+        audit_logs_in_org.model_dump(mode="json"),
+        ex=AUDIT_LOG_CACHE_TTL_SECONDS,
+    )
+
+    return audit_logs_in_org
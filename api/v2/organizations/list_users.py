@@ -1,9 +1,9 @@
-import orjson
-
-from core.redis.redis_config import redis_client as redis
+from core.redis.versioned_cache import get_versioned, set_versioned
+from typing import Optional
 from fastapi import Query, status, HTTPException, Depends, APIRouter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from core.pagination import decode_cursor, encode_cursor
 from core.rate_limiter import RateLimiter
 from database.models.organization_member import OrganizationMember
 from api.v2.schemas.organization_schemas import ListUsers
@@ -22,6 +22,7 @@ MAX_PAGE_SIZE = 100
 async def list_users(
     page: int = Query(1, ge=1),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user_and_membership=Depends(get_user_and_membership),
 ):
@@ -34,51 +35,66 @@ async def list_users(
             detail="Not authorized to view users organization",
         )
 
-    # get current version for this org from Redis (or default to 1)
-    version_key = f"org_id:{membership.organization_id}:version"
-    version = await redis.get(version_key)
-    if not version:
-        version = 1
-        await redis.set(version_key, version)
+    org_id = membership.organization_id
+
+    # `after` (keyset) takes precedence over `page` (offset) when both are given
+    after_id = decode_cursor(after)
+    position = f"after:{after_id}" if after_id is not None else f"page:{page}"
 
-    cache_key = f"org_id:{membership.organization_id}:v{version}:page:{page}:page_size:{page_size}/organizations/users"
-    cached_users_in_org = await redis.get(cache_key)
+    # current version for this org (seeded to 1) and the cached page in one go
+    cache_key, cached_users_in_org = await get_versioned(
+        "list_users",
+        [f"org_id:{org_id}:version"],
+        lambda version: (
+            f"org_id:{org_id}:v{version}:{position}:page_size:{page_size}/organizations/users"
+        ),
+    )
 
     if cached_users_in_org:
-        cached_data = orjson.loads(cached_users_in_org)
-        return ORJSONResponse(content=cached_data)
+        return ORJSONResponse(content=cached_users_in_org)
 
     else:
-        offset = (page - 1) * page_size
-
-        users_in_org = (
-            await db.execute(
-                select(Users.id, Users.name, Users.email)
-                .join(OrganizationMember, OrganizationMember.user_id == Users.id)
-                .where(
-                    OrganizationMember.organization_id == membership.organization_id,
-                    Users.is_deleted.is_(False),
-                )
-                .order_by(Users.id.asc())
-                .offset(offset)
-                .limit(page_size)
+        query = (
+            select(Users.id, Users.name, Users.email)
+            .join(OrganizationMember, OrganizationMember.user_id == Users.id)
+            .where(
+                OrganizationMember.organization_id == membership.organization_id,
+                Users.is_deleted.is_(False),
             )
-        ).all()
+            .order_by(Users.id.asc())
+            .limit(page_size + 1)
+        )
+
+        if after_id is not None:
+            query = query.where(Users.id > after_id)
+        else:
+            query = query.offset((page - 1) * page_size)
+
+        users_in_org = (await db.execute(query)).all()
 
         if not users_in_org:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="No users in Organization"
             )
 
+        # one extra row tells us whether another page exists
+        next_cursor = None
+        if len(users_in_org) > page_size:
+            users_in_org = users_in_org[:page_size]
+            next_cursor = encode_cursor(users_in_org[-1].id)
+
         user_details = [
             {"user_id": user.id, "name": user.name, "email": user.email}
             for user in users_in_org
         ]
 
         users_in_org = ListUsers(
-            page=page, page_size=page_size, user_details=user_details
+            page=page,
+            page_size=page_size,
+            user_details=user_details,
+            next_cursor=next_cursor,
         )
 
-        await redis.set(cache_key, orjson.dumps(users_in_org.model_dump()), ex=60 * 5)
+        await set_versioned(cache_key, users_in_org.model_dump())
 
         return users_in_org
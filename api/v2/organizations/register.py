@@ -3,6 +3,8 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.logger import logger
+from core.query_budget import query_budget
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from database.models.organization import Organization
 from database.models.organization_member import OrganizationMember
@@ -20,6 +22,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
 @router.post(
     "/register", status_code=status.HTTP_201_CREATED, response_model=OrganizationOut
 )
+@query_budget(db=5, redis=3)
 async def register_organization(
     request: Request,
     organization: OrganizationCreate,
@@ -73,6 +76,20 @@ async def register_organization(
             user_id=current_user.id, organization_id=new_organization.id, role="owner"
         )
         db.add(membership)
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            organization_id=new_organization.id,
+            action="org.registered",
+            resource_type="organizations",
+            resource_id=str(new_organization.id),
+            status="success",
+            meta_data={"org_slug": slug_name},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/organization/register",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -91,17 +108,4 @@ async def register_organization(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=current_user.id,
-        action="org.registered",
-        resource_type="organizations",
-        resource_id=str(new_organization.id),
-        status="success",
-        meta_data={"org_slug": slug_name},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="/organization/register",
-    )
-
     return new_organization
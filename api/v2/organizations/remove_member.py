@@ -3,6 +3,7 @@ from sqlalchemy import delete, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.logger import logger
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from core.utils import audit_logs, invalidate_redis_keys_on_mem_change
 from database.models.organization_member import OrganizationMember
@@ -180,6 +181,19 @@ async def remove_member(
             )
         )
 
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            action="remove.member",
+            resource_type="organizations",
+            organization_id=membership.organization_id,
+            status="success",
+            meta_data={"user_id": existing_user.id},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/delete/organization/member",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -198,19 +212,6 @@ async def remove_member(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=current_user.id,
-        action="remove.member",
-        resource_type="organizations",
-        organization_id=membership.organization_id,
-        status="success",
-        meta_data={"user_id": existing_user.id},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="/delete/organization/member",
-    )
-
     await invalidate_redis_keys_on_mem_change(
         org_id=membership.organization_id, user_id=existing_user.id
     )
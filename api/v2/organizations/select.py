@@ -1,6 +1,7 @@
 from fastapi import status, HTTPException, Depends, APIRouter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from core.query_budget import query_budget
 from core.rate_limiter import RateLimiter
 from database.models.organization_member import OrganizationMember
 from api.v2.schemas.authorization_schemas import Token
@@ -15,6 +16,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
     status_code=status.HTTP_202_ACCEPTED,
     response_model=Token,
 )
+@query_budget(db=2, redis=3)
 async def select_organization(
     organization_id: int,
     db: AsyncSession = Depends(get_db),
@@ -0,0 +1,262 @@
+from fastapi import (
+    BackgroundTasks,
+    Query,
+    Request,
+    status,
+    HTTPException,
+    Depends,
+    APIRouter,
+)
+from sqlalchemy import and_, case, cast, delete, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.logger import logger
+from core.oauth2 import get_user_and_membership
+from core.outbox import add_outbox_event
+from core.query_budget import query_budget
+from core.rate_limiter import RateLimiter
+from core.utils import (
+    audit_logs,
+    dialect_insert,
+    invalidate_redis_keys_on_bulk_mem_change,
+)
+from api.v2.schemas.organization_schemas import SyncMembersIn, SyncMembersOut
+from database.db.session import get_db
+from database.models.organization_member import OrganizationMember, OrgRole
+from database.models.project_member import ProjectMember
+from database.models.projects import Project
+from database.models.users import Users
+
+router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=5, time_frame=60))])
+
+
+def _role(role):
+    return role.value if isinstance(role, OrgRole) else role
+
+
+@router.put(
+    "/members/sync", status_code=status.HTTP_200_OK, response_model=SyncMembersOut
+)
+@query_budget(db=7, redis=9)
+async def sync_members(
+    request: Request,
+    payload: SyncMembersIn,
+    background_tasks: BackgroundTasks,
+    dry_run: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current_user_and_membership=Depends(get_user_and_membership),
+):
+
+    current_user, membership = current_user_and_membership
+    org_id = membership.organization_id
+
+    def audit_failure(reason: str):
+        background_tasks.add_task(
+            audit_logs,
+            actor_user_id=current_user.id,
+            action="members.synced",
+            resource_type="organizations",
+            organization_id=org_id,
+            status="failed",
+            meta_data={
+                "reason": reason,
+                "members": len(payload.members),
+                "role": membership.role,
+            },
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/organization/members/sync",
+        )
+
+    # Sync can add, demote and remove owners, so only owners may run it
+    if membership.role != "owner":
+        audit_failure("not_owner")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only organization owners can sync members",
+        )
+
+    desired = {member.email: member.role for member in payload.members}
+    if len(desired) != len(payload.members):
+        audit_failure("duplicate_email")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each email may appear only once",
+        )
+    # The diff in one statement: every live user in the desired set plus
+    # every current member, with their current and desired role
+    desired_role = case(desired, value=Users.email, else_=None)
+    current_role = OrganizationMember.role
+    change = case(
+        (current_role.is_(None), "add"),
+        (desired_role.is_(None), "remove"),
+        (cast(current_role, Users.email.type) != desired_role, "role_change"),
+        else_="unchanged",
+    )
+    rows = (
+        await db.execute(
+            select(
+                Users.id,
+                Users.email,
+                current_role.label("current_role"),
+                desired_role.label("desired_role"),
+                change.label("change"),
+            )
+            .select_from(Users)
+            .outerjoin(
+                OrganizationMember,
+                and_(
+                    OrganizationMember.user_id == Users.id,
+                    OrganizationMember.organization_id == org_id,
+                ),
+            )
+            .where(
+                or_(
+                    and_(Users.email.in_(desired), Users.is_deleted.is_(False)),
+                    OrganizationMember.id.isnot(None),
+                )
+            )
+            .order_by(Users.email)
+        )
+    ).all()
+
+    diff = {"add": [], "remove": [], "role_change": []}
+    found = set()
+    for row in rows:
+        found.add(row.email)
+        if row.change in diff:
+            diff[row.change].append(row)
+
+    # Only emails that resolved to a live user count; an unknown or deleted
+    # owner email would otherwise let the sync remove every real owner
+    if not any(row.desired_role == "owner" and row.change != "remove" for row in rows):
+        audit_failure("no_owner")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The organization must keep at least one owner",
+        )
+
+    result = {
+        "dry_run": dry_run,
+        "added": [
+            {"email": row.email, "user_id": row.id, "to_role": row.desired_role}
+            for row in diff["add"]
+        ],
+        "removed": [
+            {
+                "email": row.email,
+                "user_id": row.id,
+                "from_role": _role(row.current_role),
+            }
+            for row in diff["remove"]
+        ],
+        "role_changed": [
+            {
+                "email": row.email,
+                "user_id": row.id,
+                "from_role": _role(row.current_role),
+                "to_role": row.desired_role,
+            }
+            for row in diff["role_change"]
+        ],
+        "not_found": sorted(desired.keys() - found),
+    }
+
+    changed = diff["add"] or diff["remove"] or diff["role_change"]
+    if dry_run or not changed:
+        return result
+
+    added_ids = [row.id for row in diff["add"]]
+    removed_ids = [row.id for row in diff["remove"]]
+    new_roles = {row.id: row.desired_role for row in diff["role_change"]}
+
+    try:
+        if added_ids:
+            await db.execute(
+                dialect_insert(db, OrganizationMember)
+                .values(
+                    [
+                        {
+                            "user_id": row.id,
+                            "organization_id": org_id,
+                            "role": row.desired_role,
+                        }
+                        for row in diff["add"]
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["user_id", "organization_id"])
+            )
+
+        if new_roles:
+            await db.execute(
+                update(OrganizationMember)
+                .where(
+                    OrganizationMember.organization_id == org_id,
+                    OrganizationMember.user_id.in_(new_roles),
+                )
+                .values(
+                    role=cast(
+                        case(new_roles, value=OrganizationMember.user_id),
+                        OrganizationMember.role.type,
+                    )
+                )
+            )
+
+        if removed_ids:
+            # Removed members also leave every project of the organization
+            await db.execute(
+                delete(ProjectMember).where(
+                    ProjectMember.user_id.in_(removed_ids),
+                    ProjectMember.project_id.in_(
+                        select(Project.id).where(Project.organization_id == org_id)
+                    ),
+                )
+            )
+            await db.execute(
+                delete(OrganizationMember).where(
+                    OrganizationMember.organization_id == org_id,
+                    OrganizationMember.user_id.in_(removed_ids),
+                )
+            )
+
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            action="members.synced",
+            resource_type="organizations",
+            organization_id=org_id,
+            status="success",
+            meta_data={
+                "added": [row.email for row in diff["add"]],
+                "removed": [row.email for row in diff["remove"]],
+                "role_changed": [row.email for row in diff["role_change"]],
+            },
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/organization/members/sync",
+        )
+
+        await db.commit()
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        logger.exception(
+            "Database error",
+            extra={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+            },
+        )
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+    # Role changes are covered by the org version bump
+    await invalidate_redis_keys_on_bulk_mem_change(
+        org_id=org_id, user_ids=added_ids + removed_ids
+    )
+
+    return result
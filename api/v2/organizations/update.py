@@ -3,6 +3,7 @@ from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.logger import logger
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from database.models.organization import Organization
 from api.v2.schemas.organization_schemas import (
@@ -84,6 +85,20 @@ async def update(
         updated_org = Organization(name=payload.new_name, slug=new_slug_name)
 
         db.add(updated_org)
+        add_outbox_event(
+            db,
+            actor_user_id=user.id,
+            action="org.updated",
+            resource_type="organizations",
+            organization_id=membership.organization_id,
+            resource_id=str(membership.organization_id),
+            status="success",
+            meta_data={"new_name": payload.new_name, "role": membership.role},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/organization/update",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -102,18 +117,4 @@ async def update(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=user.id,
-        action="org.updated",
-        resource_type="organizations",
-        organization_id=membership.organization_id,
-        resource_id=str(membership.organization_id),
-        status="success",
-        meta_data={"new_name": payload.new_name, "role": membership.role},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="/organization/update",
-    )
-
     return {"message": "Organization details updated"}
@@ -6,6 +6,8 @@ from .list_projects import router as list_projects_router
 from .remove_user import router as remove_user_router
 from .update import router as update_router
 from .delete import router as delete_router
+from .export_projects import router as export_projects_router
+from .sync_members import router as sync_members_router
 
 router = APIRouter(prefix="/v2/projects", tags=["Projects"])
 
@@ -16,3 +18,5 @@ router.include_router(list_members_router)
 router.include_router(list_projects_router)
 router.include_router(add_user_router)
 router.include_router(remove_user_router)
+router.include_router(export_projects_router)
+router.include_router(sync_members_router)
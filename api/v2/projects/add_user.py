@@ -1,4 +1,4 @@
-from fastapi import BackgroundTasks, Request, status, HTTPException, Depends, APIRouter
+from fastapi import Request, status, HTTPException, Depends, APIRouter
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,13 +7,15 @@ from api.v2.schemas.projects_schema import (
     AddUsersOut,
 )
 from core.logger import logger
+from core.query_budget import query_budget
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from database.models.organization_member import OrganizationMember
 from database.models.project_member import ProjectMember
 from database.models.projects import Project
 
 from database.db.session import get_db
-from core.utils import audit_logs, invalidate_redis_keys_on_project_mem_change
+from core.utils import invalidate_redis_keys_on_project_mem_change
 from core.oauth2 import get_user_and_membership
 from database.models.users import Users
 
@@ -25,11 +27,11 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
     response_model=AddUsersOut,
     status_code=status.HTTP_201_CREATED,
 )
+@query_budget(db=8, redis=8)
 async def add_user(
     project_id: int,
     request: Request,
     payload: AddUsersIn,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user_and_membership=Depends(get_user_and_membership),
 ):
@@ -133,6 +135,19 @@ async def add_user(
 
         new_project_member_id = new_project_member.id
 
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            organization_id=membership.organization_id,
+            action="user.added",
+            resource_type="projects",
+            resource_id=str(new_project_member_id),
+            meta_data={"project_id": project_id, "project_name": project.name},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="project/add_user",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -151,19 +166,6 @@ async def add_user(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=current_user.id,
-        organization_id=membership.organization_id,
-        action="user.added",
-        resource_type="projects",
-        resource_id=str(new_project_member_id),
-        meta_data={"project_id": project_id, "project_name": project.name},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="project/add_user",
-    )
-
     await invalidate_redis_keys_on_project_mem_change(project_id=project_id)
 
     return new_project_member
@@ -7,6 +7,8 @@ from api.v2.schemas.projects_schema import (
     AddProjectsIn,
 )
 from core.logger import logger
+from core.query_budget import query_budget
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from database.models.projects import Project
 
@@ -18,6 +20,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
 
 
 @router.post("/", response_model=AddProjectsOut, status_code=status.HTTP_201_CREATED)
+@query_budget(db=5, redis=9)
 async def create_project(
     request: Request,
     project_in: AddProjectsIn,
@@ -88,6 +91,19 @@ async def create_project(
 
         new_project_id = new_project.id
 
+        add_outbox_event(
+            db,
+            actor_user_id=user.id,
+            organization_id=membership.organization_id,
+            action="project.created",
+            resource_type="projects",
+            resource_id=str(new_project_id),
+            meta_data={"project_name": project_in.name},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/project/create",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -106,19 +122,6 @@ async def create_project(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=user.id,
-        organization_id=membership.organization_id,
-        action="project.created",
-        resource_type="projects",
-        resource_id=str(new_project_id),
-        meta_data={"project_name": project_in.name},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="/project/create",
-    )
-
     await invalidate_redis_keys_on_project_add_delete_update(
         org_id=membership.organization_id, project_id=new_project_id
     )
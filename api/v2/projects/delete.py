@@ -4,6 +4,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.v2.schemas.projects_schema import DeleteProjectOut
 from core.logger import logger
+from core.query_budget import query_budget
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from core.utils import audit_logs, invalidate_redis_keys_on_project_add_delete_update
 from database.db.session import get_db
@@ -20,6 +22,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
     response_model=DeleteProjectOut,
     status_code=status.HTTP_200_OK,
 )
+@query_budget(db=6, redis=9)
 async def delete_project(
     project_id: int,
     request: Request,
@@ -94,6 +97,22 @@ async def delete_project(
             delete(ProjectMember).where(ProjectMember.project_id == project_id)
         )
 
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            organization_id=membership.organization_id,
+            action="project.deleted",
+            resource_type="projects",
+            status="success",
+            meta_data={
+                "project_id": project_id,
+                "role": membership.role,
+            },
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="project/delete",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -112,22 +131,6 @@ async def delete_project(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=current_user.id,
-        organization_id=membership.organization_id,
-        action="project.deleted",
-        resource_type="projects",
-        status="success",
-        meta_data={
-            "project_id": project_id,
-            "role": membership.role,
-        },
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="project/delete",
-    )
-
     await invalidate_redis_keys_on_project_add_delete_update(
         org_id=membership.organization_id, project_id=project_id
     )
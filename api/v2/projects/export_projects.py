@@ -0,0 +1,62 @@
+from fastapi import Query, Request, Response, status, Depends, APIRouter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.export import (
+    EXPORT_BATCH_SIZE,
+    MEDIA_TYPES,
+    ExportFormat,
+    etag_matches,
+    stream_rows,
+)
+from core.rate_limiter import RateLimiter
+from core.redis.versioned_cache import resolve_versions
+from database.models.projects import Project
+
+from database.db.session import get_db
+from core.oauth2 import get_user_and_membership
+
+router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60))])
+
+EXPORT_FIELDS = ["project_id", "name", "created_by", "created_at"]
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_projects(
+    request: Request,
+    format: ExportFormat = Query("ndjson"),
+    db: AsyncSession = Depends(get_db),
+    current_user_and_membership=Depends(get_user_and_membership),
+):
+
+    current_user, membership = current_user_and_membership
+
+    org_id = membership.organization_id
+
+    # Bumped on every project create/update/delete in this org
+    (version,) = await resolve_versions([f"org_id:{org_id}:project_version"])
+    etag = f'W/"org-{org_id}-projects-v{version}-{format}"'
+
+    if etag_matches(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    result = await db.stream(
+        select(Project.id, Project.name, Project.created_by, Project.created_at)
+        .where(
+            Project.organization_id == org_id,
+            Project.is_deleted.is_(False),
+        )
+        .order_by(Project.id.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    return StreamingResponse(
+        stream_rows(result, EXPORT_FIELDS, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "ETag": etag,
+            "Content-Disposition": f'attachment; filename="org-{org_id}-projects.{format}"',
+        },
+    )
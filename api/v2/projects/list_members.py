@@ -1,5 +1,3 @@
-import orjson
-
 from fastapi import status, HTTPException, Depends, APIRouter
 from fastapi.responses import ORJSONResponse
 from sqlalchemy import select
@@ -7,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.v2.schemas.projects_schema import (
     ListMembers,
 )
+from core.query_budget import query_budget
 from core.rate_limiter import RateLimiter
 from database.models.project_member import ProjectMember
 from database.models.projects import Project
@@ -14,7 +13,7 @@ from database.models.projects import Project
 from database.db.session import get_db
 from core.oauth2 import get_user_and_membership
 from database.models.users import Users
-from core.redis.redis_config import redis_client as redis
+from core.redis.versioned_cache import get_versioned, set_versioned
 
 router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60))])
 
@@ -22,6 +21,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
 @router.get(
     "/{project_id}/members", response_model=ListMembers, status_code=status.HTTP_200_OK
 )
+@query_budget(db=4, redis=11)
 async def list_members(
     project_id: int,
     db: AsyncSession = Depends(get_db),
@@ -36,24 +36,18 @@ async def list_members(
             detail="Not authorized to view project members",
         )
 
-    org_version_key = f"org_id:{membership.organization_id}:version"
-    org_version = await redis.get(org_version_key)
-    if not org_version:
-        org_version = 1
-        await redis.set(org_version_key, org_version)
-
-    project_version_key = f"project_id:{project_id}:version"
-    project_version = await redis.get(project_version_key)
-    if not project_version:
-        project_version = 1
-        await redis.set(project_version_key, project_version)
+    org_id = membership.organization_id
 
-    cache_key = f"org_id:{membership.organization_id}:org_v{org_version}:project_id:{project_id}:project_v{project_version}:/projects/members"
-    cached_users_in_project = await redis.get(cache_key)
+    cache_key, cached_users_in_project = await get_versioned(
+        "list_members",
+        [f"org_id:{org_id}:version", f"project_id:{project_id}:version"],
+        lambda org_version, project_version: (
+            f"org_id:{org_id}:org_v{org_version}:project_id:{project_id}:project_v{project_version}:/projects/members"
+        ),
+    )
 
     if cached_users_in_project:
-        cached_data = orjson.loads(cached_users_in_project)
-        return ORJSONResponse(content=cached_data)
+        return ORJSONResponse(content=cached_users_in_project)
 
     else:
         project = (
@@ -110,8 +104,6 @@ async def list_members(
             member_details=member_details,
         )
 
-        await redis.set(
-            cache_key, orjson.dumps(users_in_project.model_dump()), ex=60 * 5
-        )
+        await set_versioned(cache_key, users_in_project.model_dump())
 
         return users_in_project
@@ -1,5 +1,4 @@
-import orjson
-
+from typing import Optional
 from fastapi import Query, status, HTTPException, Depends, APIRouter
 from fastapi.responses import ORJSONResponse
 from sqlalchemy import select
@@ -7,12 +6,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.v2.schemas.projects_schema import (
     ListProjects,
 )
+from core.pagination import decode_cursor, encode_cursor
+from core.query_budget import query_budget
 from core.rate_limiter import RateLimiter
 from database.models.projects import Project
 
 from database.db.session import get_db
 from core.oauth2 import get_user_and_membership
-from core.redis.redis_config import redis_client as redis
+from core.redis.versioned_cache import get_versioned, set_versioned
 
 router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60))])
 
@@ -21,56 +22,64 @@ MAX_PAGE_SIZE = 100
 
 
 @router.get("/", response_model=ListProjects, status_code=status.HTTP_200_OK)
+@query_budget(db=3, redis=11)
 async def list_projects(
     page: int = Query(1, ge=1),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user_and_membership=Depends(get_user_and_membership),
 ):
 
     current_user, membership = current_user_and_membership
 
-    # get current version for this org from Redis (or default to 1)
-    project_version_key = f"org_id:{membership.organization_id}:project_version"
-    version = await redis.get(project_version_key)
-    if not version:
-        version = 1
-        await redis.set(project_version_key, version)
+    org_id = membership.organization_id
+
+    # `after` (keyset) takes precedence over `page` (offset) when both are given
+    after_id = decode_cursor(after)
+    position = f"after:{after_id}" if after_id is not None else f"page:{page}"
 
-    cache_key = f"org_id:{membership.organization_id}:project_v{version}:page:{page}:page_size:{page_size}/projects/"
-    cached_projects_in_org = await redis.get(cache_key)
+    # current project version for this org (seeded to 1) and the cached page
+    cache_key, cached_projects_in_org = await get_versioned(
+        "list_projects",
+        [f"org_id:{org_id}:project_version"],
+        lambda version: (
+            f"org_id:{org_id}:project_v{version}:{position}:page_size:{page_size}/projects/"
+        ),
+    )
 
     if cached_projects_in_org:
-        cached_data = orjson.loads(cached_projects_in_org)
-        return ORJSONResponse(content=cached_data)
+        return ORJSONResponse(content=cached_projects_in_org)
 
     else:
-        offset = (page - 1) * page_size
-
-        projects = (
-            (
-                await db.execute(
-                    select(Project)
-                    .where(
-                        Project.organization_id == membership.organization_id,
-                        Project.is_deleted.is_(False),
-                    )
-                    .order_by(Project.id.asc())
-                    .offset(offset)
-                    .limit(page_size)
-                )
+        query = (
+            select(Project.id, Project.name)
+            .where(
+                Project.organization_id == membership.organization_id,
+                Project.is_deleted.is_(False),
             )
-            .scalars()
-            .all()
+            .order_by(Project.id.asc())
+            .limit(page_size + 1)
         )
 
+        if after_id is not None:
+            query = query.where(Project.id > after_id)
+        else:
+            query = query.offset((page - 1) * page_size)
+
+        projects = (await db.execute(query)).all()
+
         if not projects:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No projects in Organization",
             )
 
-        # List out the organizations the user is part of for frontend to select
+        # one extra row tells us whether another page exists
+        next_cursor = None
+        if len(projects) > page_size:
+            projects = projects[:page_size]
+            next_cursor = encode_cursor(projects[-1].id)
 
         project_details = [
             {"project_id": project.id, "name": project.name} for project in projects
@@ -81,10 +90,9 @@ async def list_projects(
             page=page,
             page_size=page_size,
             project_details=project_details,
+            next_cursor=next_cursor,
         )
 
-        await redis.set(
-            cache_key, orjson.dumps(projects_in_org.model_dump()), ex=60 * 5
-        )
+        await set_versioned(cache_key, projects_in_org.model_dump())
 
         return projects_in_org
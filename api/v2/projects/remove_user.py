@@ -7,6 +7,8 @@ from api.v2.schemas.projects_schema import (
     RemoveUsersOut,
 )
 from core.logger import logger
+from core.query_budget import query_budget
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from database.models.organization_member import OrganizationMember
 from database.models.project_member import ProjectMember
@@ -25,6 +27,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
     response_model=RemoveUsersOut,
     status_code=status.HTTP_201_CREATED,
 )
+@query_budget(db=8, redis=8)
 async def remove_user(
     project_id: int,
     request: Request,
@@ -196,6 +199,20 @@ async def remove_user(
                 ProjectMember.user_id == user.id,
             )
         )
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            organization_id=membership.organization_id,
+            action="user.removed",
+            resource_type="projects",
+            status="success",
+            resource_id=str(user.id),
+            meta_data={"project_id": project_id, "project_name": project.name},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="project/remove_user",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -214,20 +231,6 @@ async def remove_user(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=current_user.id,
-        organization_id=membership.organization_id,
-        action="user.removed",
-        resource_type="projects",
-        status="success",
-        resource_id=str(user.id),
-        meta_data={"project_id": project_id, "project_name": project.name},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="project/remove_user",
-    )
-
     await invalidate_redis_keys_on_project_mem_change(project_id=project_id)
 
     return {"response": "Member removed from the project"}
@@ -0,0 +1,214 @@
+from fastapi import (
+    BackgroundTasks,
+    Query,
+    Request,
+    status,
+    HTTPException,
+    Depends,
+    APIRouter,
+)
+from sqlalchemy import and_, case, delete, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.v2.schemas.projects_schema import (
+    SyncProjectMembersIn,
+    SyncProjectMembersOut,
+)
+from core.logger import logger
+from core.oauth2 import get_user_and_membership
+from core.outbox import add_outbox_event
+from core.query_budget import query_budget
+from core.rate_limiter import RateLimiter
+from core.utils import (
+    audit_logs,
+    dialect_insert,
+    invalidate_redis_keys_on_project_mem_change,
+)
+from database.db.session import get_db
+from database.models.organization_member import OrganizationMember
+from database.models.project_member import ProjectMember
+from database.models.projects import Project
+from database.models.users import Users
+
+router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=5, time_frame=60))])
+
+
+@router.put(
+    "/{project_id}/members/sync",
+    status_code=status.HTTP_200_OK,
+    response_model=SyncProjectMembersOut,
+)
+@query_budget(db=6, redis=9)
+async def sync_members(
+    project_id: int,
+    request: Request,
+    payload: SyncProjectMembersIn,
+    background_tasks: BackgroundTasks,
+    dry_run: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current_user_and_membership=Depends(get_user_and_membership),
+):
+
+    current_user, membership = current_user_and_membership
+    org_id = membership.organization_id
+
+    if membership.role not in ("owner", "admin"):
+        background_tasks.add_task(
+            audit_logs,
+            actor_user_id=current_user.id,
+            action="members.synced",
+            resource_type="projects",
+            organization_id=org_id,
+            resource_id=str(project_id),
+            status="failed",
+            meta_data={
+                "project_id": project_id,
+                "emails": len(payload.emails),
+                "role": membership.role,
+            },
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="project/sync_members",
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to sync project members",
+        )
+
+    project = (
+        (
+            await db.execute(
+                select(Project).where(
+                    Project.id == project_id,
+                    Project.organization_id == org_id,
+                    Project.is_deleted.is_(False),
+                )
+            )
+        )
+        .scalars()
+        .first()
+    )
+
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project does not exist"
+        )
+
+    desired = set(payload.emails)
+
+    # The diff in one statement: every live user in the desired set plus
+    # every current project member. Only organization members can be added.
+    change = case(
+        (
+            and_(ProjectMember.id.isnot(None), Users.email.notin_(desired)),
+            "remove",
+        ),
+        (ProjectMember.id.isnot(None), "unchanged"),
+        (OrganizationMember.id.is_(None), "not_in_organization"),
+        else_="add",
+    )
+    rows = (
+        await db.execute(
+            select(Users.id, Users.email, change.label("change"))
+            .select_from(Users)
+            .outerjoin(
+                OrganizationMember,
+                and_(
+                    OrganizationMember.user_id == Users.id,
+                    OrganizationMember.organization_id == org_id,
+                ),
+            )
+            .outerjoin(
+                ProjectMember,
+                and_(
+                    ProjectMember.user_id == Users.id,
+                    ProjectMember.project_id == project_id,
+                ),
+            )
+            .where(
+                or_(
+                    and_(Users.email.in_(desired), Users.is_deleted.is_(False)),
+                    ProjectMember.id.isnot(None),
+                )
+            )
+            .order_by(Users.email)
+        )
+    ).all()
+
+    diff = {"add": [], "remove": [], "not_in_organization": []}
+    found = set()
+    for row in rows:
+        found.add(row.email)
+        if row.change in diff:
+            diff[row.change].append(row)
+
+    result = {
+        "dry_run": dry_run,
+        "added": [row.email for row in diff["add"]],
+        "removed": [row.email for row in diff["remove"]],
+        "not_in_organization": [row.email for row in diff["not_in_organization"]],
+        "not_found": sorted(desired - found),
+    }
+
+    if dry_run or not (diff["add"] or diff["remove"]):
+        return result
+
+    try:
+        if diff["add"]:
+            await db.execute(
+                dialect_insert(db, ProjectMember)
+                .values(
+                    [
+                        {"user_id": row.id, "project_id": project_id}
+                        for row in diff["add"]
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["user_id", "project_id"])
+            )
+
+        if diff["remove"]:
+            await db.execute(
+                delete(ProjectMember).where(
+                    ProjectMember.project_id == project_id,
+                    ProjectMember.user_id.in_([row.id for row in diff["remove"]]),
+                )
+            )
+
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            organization_id=org_id,
+            action="members.synced",
+            resource_type="projects",
+            resource_id=str(project_id),
+            meta_data={
+                "project_id": project_id,
+                "added": result["added"],
+                "removed": result["removed"],
+            },
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="project/sync_members",
+        )
+
+        await db.commit()
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        logger.exception(
+            "Database error",
+            extra={
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+            },
+        )
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+    await invalidate_redis_keys_on_project_mem_change(project_id=project_id)
+
+    return result
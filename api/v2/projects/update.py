@@ -7,6 +7,8 @@ from api.v2.schemas.projects_schema import (
     UpdateProjectsOut,
 )
 from core.logger import logger
+from core.query_budget import query_budget
+from core.outbox import add_outbox_event
 from core.rate_limiter import RateLimiter
 from database.models.projects import Project
 
@@ -22,6 +24,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
     response_model=UpdateProjectsOut,
     status_code=status.HTTP_200_OK,
 )
+@query_budget(db=6, redis=9)
 async def update_project(
     project_id: int,
     request: Request,
@@ -125,6 +128,20 @@ async def update_project(
     # Update Project details
     try:
         project.name = payload.new_name
+        add_outbox_event(
+            db,
+            actor_user_id=current_user.id,
+            organization_id=membership.organization_id,
+            action="update.success",
+            status="success",
+            resource_type="projects",
+            resource_id=str(project.id),
+            meta_data={"new_name": payload.new_name, "role": membership.role},
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+            endpoint="/project/update",
+        )
+
         await db.commit()
 
     except SQLAlchemyError as e:
@@ -143,20 +160,6 @@ async def update_project(
             detail="Internal Server Error",
         )
 
-    background_tasks.add_task(
-        audit_logs,
-        actor_user_id=current_user.id,
-        organization_id=membership.organization_id,
-        action="update.success",
-        status="success",
-        resource_type="projects",
-        resource_id=str(project.id),
-        meta_data={"new_name": payload.new_name, "role": membership.role},
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-        endpoint="/project/update",
-    )
-
     await invalidate_redis_keys_on_project_add_delete_update(
         org_id=membership.organization_id, project_id=project.id
     )
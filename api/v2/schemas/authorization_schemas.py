@@ -12,6 +12,7 @@ class TokenData(BaseModel):
     token_type: str
     org_id: Optional[int] = None
     jti: str
+    exp: Optional[int] = None
 
 
 class LoginOut(BaseModel):
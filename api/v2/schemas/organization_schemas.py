@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, ConfigDict, Field
-from typing import Literal, List
+from typing import Any, Dict, Literal, List, Optional
+from uuid import UUID
 from datetime import datetime
 
 
@@ -39,6 +40,7 @@ class ListUsers(BaseModel):
     page: int
     page_size: int
     user_details: List[UserOut]
+    next_cursor: Optional[str] = None
 
 
 class UpdateOrgIn(BaseModel):
@@ -60,3 +62,63 @@ class RemoveMemberOut(BaseModel):
 
 class RemoveMemberIn(BaseModel):
     email: EmailStr
+
+
+class AuditLogOut(BaseModel):
+    id: UUID
+    timestamp: datetime
+    actor_user_id: Optional[int] = None
+    action: str
+    resource_type: str
+    resource_id: Optional[str] = None
+    status: Optional[str] = None
+    meta_data: Optional[Dict[str, Any]] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    endpoint: Optional[str] = None
+
+
+class ListAuditLogs(BaseModel):
+    organization_id: int
+    page_size: int
+    audit_logs: List[AuditLogOut]
+    next_cursor: Optional[str] = None
+
+
+class BulkAddUsers(BaseModel):
+    members: List[AddUsers] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkRemoveMembers(BaseModel):
+    emails: List[EmailStr] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkMemberResult(BaseModel):
+    email: EmailStr
+    # added, removed, already_member, not_member, not_found, duplicate,
+    # forbidden or last_owner
+    status: str
+
+
+class BulkMembersOut(BaseModel):
+    results: List[BulkMemberResult]
+
+
+class SyncMembersIn(BaseModel):
+    # The complete desired membership; anyone else is removed
+    members: List[AddUsers] = Field(..., min_length=1, max_length=5000)
+
+
+class MemberChange(BaseModel):
+    email: EmailStr
+    user_id: int
+    from_role: Optional[str] = None
+    to_role: Optional[str] = None
+
+
+class SyncMembersOut(BaseModel):
+    dry_run: bool
+    added: List[MemberChange]
+    removed: List[MemberChange]
+    role_changed: List[MemberChange]
+    not_found: List[EmailStr]
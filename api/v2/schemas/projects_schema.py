@@ -1,5 +1,5 @@
-from typing import List
-from pydantic import BaseModel, EmailStr
+from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field
 
 
 class AddProjectsOut(BaseModel):
@@ -39,6 +39,7 @@ class ListProjects(BaseModel):
     page: int
     page_size: int
     project_details: List[Project]
+    next_cursor: Optional[str] = None
 
 
 class ProjectMembersOut(BaseModel):
@@ -62,3 +63,16 @@ class RemoveUsersIn(BaseModel):
 
 class DeleteProjectOut(BaseModel):
     response: str
+
+
+class SyncProjectMembersIn(BaseModel):
+    # The complete desired membership; anyone else is removed
+    emails: List[EmailStr] = Field(..., max_length=5000)
+
+
+class SyncProjectMembersOut(BaseModel):
+    dry_run: bool
+    added: List[EmailStr]
+    removed: List[EmailStr]
+    not_in_organization: List[EmailStr]
+    not_found: List[EmailStr]
@@ -1,9 +1,8 @@
-import orjson
-
 from fastapi import Depends, APIRouter
-from core.redis.redis_config import redis_client as redis
+from core.redis.versioned_cache import get_versioned, set_versioned
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.oauth2 import get_current_user
+from core.query_budget import query_budget
 from core.rate_limiter import RateLimiter
 from database.models.organization_member import OrganizationMember
 from api.v2.schemas.organization_schemas import ListOrgs
@@ -15,29 +14,20 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
 
 
 @router.get("/orgs", response_model=ListOrgs)
+@query_budget(db=2, redis=7)
 async def list_orgs(
     db: AsyncSession = Depends(get_db), current_user: int = Depends(get_current_user)
 ):
-    user_version_key = f"user_id:{current_user.id}:version"
-    user_version = await redis.get(user_version_key)
-    if not user_version:
-        user_version = 1
-        await redis.set(user_version_key, user_version)
-
-    global_version_key = "global:version"
-    global_version = await redis.get(global_version_key)
-    if not global_version:
-        global_version = 1
-        await redis.set(global_version_key, global_version)
-
-    cache_key = (
-        f"user_id:{current_user.id}:v{user_version}:gv:{global_version}:/users/orgs"
+    cache_key, cached_user = await get_versioned(
+        "list_orgs",
+        [f"user_id:{current_user.id}:version", "global:version"],
+        lambda user_version, global_version: (
+            f"user_id:{current_user.id}:v{user_version}:gv:{global_version}:/users/orgs"
+        ),
     )
-    cached_user = await redis.get(cache_key)
 
     if cached_user:
-        cached_data = orjson.loads(cached_user)
-        return ORJSONResponse(content=cached_data)
+        return ORJSONResponse(content=cached_user)
 
     else:
         # List out the organizations the user is part of for frontend to select
@@ -55,6 +45,6 @@ async def list_orgs(
 
         user_data = ListOrgs(email=current_user.email, org_ids=org_ids)
 
-        await redis.set(cache_key, orjson.dumps(user_data.model_dump()), ex=60 * 5)
+        await set_versioned(cache_key, user_data.model_dump())
 
         return user_data
@@ -1,5 +1,6 @@
 from fastapi import Depends, APIRouter
 from core.oauth2 import get_user_and_membership
+from core.query_budget import query_budget
 from core.rate_limiter import RateLimiter
 from api.v2.schemas.user_schemas import Me
 
@@ -7,6 +8,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
 
 
 @router.get("/me", response_model=Me)
+@query_budget(db=2, redis=7)
 async def me(
     current_user_and_membership=Depends(get_user_and_membership),
 ):
@@ -3,6 +3,7 @@ from fastapi import BackgroundTasks, Request, status, HTTPException, Depends, AP
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.logger import logger
+from core.query_budget import query_budget
 from core.rate_limiter import RateLimiter
 from database.models.auth_identities import AuthIdentity
 from database.models.users import Users
@@ -23,6 +24,7 @@ router = APIRouter(dependencies=[Depends(RateLimiter(max_calls=10, time_frame=60
     status_code=status.HTTP_201_CREATED,
     response_model=UserRegisterResponse,
 )
+@query_budget(db=3, redis=1)
 async def register_user(
     request: Request,
     user: UserCreate,
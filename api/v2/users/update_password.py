@@ -14,15 +14,14 @@ from core.logger import logger
 from core.oauth2 import get_current_user
 from core.rate_limiter import RateLimiter
 from database.models.auth_identities import AuthIdentity
-from database.models.jti_blocklist import JtiBlocklist
+from core.token_blocklist import cache_revoked_jti, revoke_jti
 from database.models.users import Users
-from core.utils import get_valid_refresh_payload, hash, verify
+from core.utils import audit_logs, get_valid_refresh_payload, hash, verify
 from api.v2.schemas.user_schemas import (
     UpdatePasswordIn,
     UpdatePasswordOut,
 )
 from database.db.session import get_db
-from core.kafka.kafka_producer import kafka_producer
 from fastapi.concurrency import run_in_threadpool
 
 
@@ -73,12 +72,8 @@ async def update_password(
 
     payload = await get_valid_refresh_payload(request, db)
 
-    jti_value = payload.jti
-
     try:
-        blacklisted_jti = JtiBlocklist(jti=jti_value)
-
-        db.add(blacklisted_jti)
+        await revoke_jti(db, payload)
         hashed_password = await run_in_threadpool(hash, input_data.new_password)
         identity.password_hash = hashed_password
         await db.commit()
@@ -99,18 +94,19 @@ async def update_password(
             detail="Internal Server Error",
         )
 
-    audit_log_data = {
-        "actor_user_id": current_user.id,
-        "action": "password.changed",
-        "resource_type": "users",
-        "resource_id": str(current_user.id),
-        "meta_data": {"email": current_user.email},
-        "ip_address": request.client.host,
-        "user_agent": request.headers.get("user-agent"),
-        "endpoint": "/update_password",
-    }
-
-    background_tasks.add_task(kafka_producer.publish, value=audit_log_data)
+    await cache_revoked_jti(payload)
+
+    background_tasks.add_task(
+        audit_logs,
+        actor_user_id=current_user.id,
+        action="password.changed",
+        resource_type="users",
+        resource_id=str(current_user.id),
+        meta_data={"email": current_user.email},
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+        endpoint="/update_password",
+    )
 
     response.delete_cookie(
         key="refresh_token",
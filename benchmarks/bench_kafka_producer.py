@@ -0,0 +1,110 @@
+"""Producer throughput against the in-process Kafka broker, so the event path
+can be measured without SSL files or network access.
+
+"publish" awaits every ack in turn (send_and_wait per message, as the audit
+publish did originally); "submit" buffers the messages and lets the flusher
+await each batch's acks together. --ack-ms stands in for the produce round
+trip to the cluster.
+
+    python -m benchmarks.bench_kafka_producer --messages 20000 --ack-ms 2
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from unittest.mock import patch
+
+import orjson
+
+# Never touch the Aiven SSL files or network from the benchmark
+os.environ["KAFKA_BACKEND"] = "memory"
+
+from core.kafka.kafka_producer import KafkaProducerManager  # noqa: E402
+from core.kafka.memory_broker import MemoryBroker, MemoryProducer  # noqa: E402
+from core.kafka.spool import SegmentSpool  # noqa: E402
+
+EVENT = {
+    "actor_user_id": 42,
+    "organization_id": 7,
+    "action": "user.added",
+    "resource_type": "organizations",
+    "meta_data": {"email": "someone@example.com", "role": "admin"},
+    "endpoint": "/organization/add_user",
+}
+
+
+async def messages_per_second(
+    mode: str, messages: int, ack_latency: float, batch_size: int, spool_dir: str
+) -> float:
+    broker = MemoryBroker()
+    manager = KafkaProducerManager(
+        buffer_size=messages,
+        batch_size=batch_size,
+        overflow_policy="block",
+        enqueue_timeout=1.0,
+        spool=SegmentSpool(spool_dir, segment_bytes=16 * 1024 * 1024),
+        replay_interval=60,
+    )
+
+    def build_producer():
+        return MemoryProducer(
+            broker,
+            value_serializer=orjson.dumps,
+            linger_ms=1,
+            max_batch_size=16384,
+            ack_latency=ack_latency,
+        )
+
+    with patch("core.kafka.kafka_producer.build_producer", build_producer):
+        await manager.start()
+        await manager.connected.wait()
+
+        start = time.perf_counter()
+        for i in range(messages):
+            key = f"org:{i % 16}".encode()
+            if mode == "publish":
+                await manager.publish(EVENT, key=key)
+            else:
+                await manager.submit(EVENT, key=key)
+        await manager.drain(timeout=600)
+        elapsed = time.perf_counter() - start
+
+        await manager.stop()
+
+    assert sum(map(len, broker.topics.popitem()[1])) == messages
+    return messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--ack-ms", type=float, default=2.0)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        # send_and_wait per message is slow; a tenth of the messages is enough
+        publish = asyncio.run(
+            messages_per_second(
+                "publish",
+                max(args.messages // 10, 1),
+                args.ack_ms / 1000,
+                args.batch_size,
+                spool_dir,
+            )
+        )
+        submit = asyncio.run(
+            messages_per_second(
+                "submit", args.messages, args.ack_ms / 1000, args.batch_size, spool_dir
+            )
+        )
+
+    print(f"publish (send_and_wait) : {publish:10.0f} msg/s")
+    print(f"submit (batched)        : {submit:10.0f} msg/s ({submit / publish:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Per-request overhead of the access-log middleware, before and after moving
+to a pure ASGI middleware with queued log handlers.
+
+"before" is the previous setup: a BaseHTTPMiddleware dispatch function and
+handlers that format and write on the event loop. "after" is
+core.logging_middleware.LoggingMiddleware with the handlers behind a
+QueueListener thread. Both write to the same temporary file; Better Stack is
+left out so the numbers do not depend on the network.
+
+    python -m benchmarks.bench_logging_middleware --requests 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import queue
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from logging.handlers import QueueListener
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from core.logger import DeferredQueueHandler, formatter, logger
+from core.logging_middleware import LoggingMiddleware
+
+
+async def base_http_log_middleware(request: Request, call_next):
+    start_time = time.time()
+    response = await call_next(request)
+    duration = time.time() - start_time
+
+    log_dict = {
+        "url": request.url.path,
+        "method": request.method,
+        "processing_time": duration,
+        "status_code": response.status_code,
+        "client_ip": request.client.host if request.client else None,
+        "user_agent": request.headers.get("user-agent"),
+        "referer": request.headers.get("referer"),
+        "request_id": request.headers.get("x-request-id"),
+    }
+    logger.info(log_dict, extra=log_dict)
+    return response
+
+
+def build_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if middleware == "before":
+        app.add_middleware(BaseHTTPMiddleware, dispatch=base_http_log_middleware)
+    elif middleware == "after":
+        app.add_middleware(LoggingMiddleware)
+
+    return app
+
+
+async def per_request_seconds(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for _ in range(200):
+            await c.get("/ping")
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            await c.get("/ping")
+        return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix=".log") as log_file:
+        file_handler = logging.FileHandler(log_file.name)
+        file_handler.setFormatter(formatter)
+        original_handlers = logger.handlers
+
+        try:
+            logger.handlers = []
+            baseline = asyncio.run(
+                per_request_seconds(build_app("none"), args.requests)
+            )
+
+            logger.handlers = [file_handler]
+            before = asyncio.run(
+                per_request_seconds(build_app("before"), args.requests)
+            )
+
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            listener = QueueListener(log_queue, file_handler)
+            listener.start()
+            logger.handlers = [DeferredQueueHandler(log_queue)]
+            after = asyncio.run(per_request_seconds(build_app("after"), args.requests))
+            listener.stop()
+        finally:
+            logger.handlers = original_handlers
+            file_handler.close()
+
+    print(f"no middleware : {baseline * 1e6:8.1f} us / request")
+    print(
+        f"before        : {before * 1e6:8.1f} us / request "
+        f"(+{(before - baseline) * 1e6:.1f} us)"
+    )
+    print(
+        f"after         : {after * 1e6:8.1f} us / request "
+        f"(+{(after - baseline) * 1e6:.1f} us)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""CPU cost of authenticating a request with and without the verified-token cache.
+
+Run from the repository root (settings are read from .env as usual):
+
+    python -m benchmarks.bench_token_cache --requests 20000 --rps 500
+"""
+
+import argparse
+import time
+
+from fastapi import HTTPException
+
+from core.oauth2 import create_access_token, verify_token
+from core.token_cache import token_cache
+
+
+def per_call_seconds(token: str, requests: int, cached: bool) -> float:
+    credentials_exception = HTTPException(status_code=401)
+
+    token_cache.clear()
+    start = time.process_time()
+    for _ in range(requests):
+        if not cached:
+            token_cache.clear()
+        verify_token(token, credentials_exception)
+    return (time.process_time() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rps", type=int, default=500)
+    args = parser.parse_args()
+
+    token = create_access_token({"user_id": 1, "org_id": 1, "token_type": "access"})
+
+    uncached = per_call_seconds(token, args.requests, cached=False)
+    cached = per_call_seconds(token, args.requests, cached=True)
+    saved = uncached - cached
+
+    print(f"decode + verify : {uncached * 1e6:8.1f} us CPU / request")
+    print(f"cache hit       : {cached * 1e6:8.1f} us CPU / request")
+    print(f"saved           : {saved * 1e6:8.1f} us CPU / request")
+    print(
+        f"at {args.rps} rps   : {saved * args.rps * 1e3:8.1f} ms CPU / second "
+        f"({saved * args.rps * 100:.2f}% of one core)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Audit event loader: reads the audit topic and bulk-loads audit_logs.
+
+Runs as its own service next to the API:
+
+    python -m core.audit_consumer
+"""
+
+import asyncio
+import signal
+import time
+import orjson
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import NAMESPACE_URL, uuid5
+from aiokafka.structs import ConsumerRecord
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import InterfaceError, OperationalError, StatementError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.audit_events import AUDIT_FIELDS, audit_row
+from core.config import env
+from core.kafka.backends import build_consumer
+from core.kafka.kafka_producer import TOPIC
+from core.logger import logger
+from core.metrics import (
+    audit_consumer_batch_duration,
+    audit_consumer_events,
+    audit_consumer_lag,
+    metrics,
+)
+from core.redis.redis_config import redis_client
+from database.db.session import AsyncSessionLocal
+from database.models.audit_log import AuditLog
+
+AUDIT_COLUMNS = ("id", "timestamp") + AUDIT_FIELDS
+STAGING_TABLE = "audit_logs_staging"
+RETRY_BACKOFF = 5.0
+
+
+def record_row(record: ConsumerRecord) -> Optional[Dict[str, Any]]:
+    """audit_logs row for a consumed event, or None if it is not one (or its
+    event_id or timestamp cannot be converted).
+
+    Events published before they carried an event_id get one derived from
+    their topic, partition and offset, which is just as stable on redelivery.
+    """
+    event = record.value
+    if not isinstance(event, dict) or not event.get("action"):
+        return None
+
+    event = dict(event)
+    if not event.get("event_id"):
+        event["event_id"] = str(
+            uuid5(
+                NAMESPACE_URL,
+                f"kafka:{record.topic}:{record.partition}:{record.offset}",
+            )
+        )
+    if not event.get("timestamp"):
+        event["timestamp"] = datetime.fromtimestamp(
+            record.timestamp / 1000, tz=timezone.utc
+        ).isoformat()
+    event.setdefault("resource_type", "unknown")
+    try:
+        return audit_row(event)
+    except (TypeError, ValueError):
+        return None
+
+
+async def copy_audit_rows(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    """COPYs rows into a temporary staging table, then moves them into
+    audit_logs, skipping ids that are already there. Returns rows inserted."""
+    columns = ", ".join(AUDIT_COLUMNS)
+
+    await db.execute(
+        text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+            "(LIKE audit_logs INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+    )
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        STAGING_TABLE,
+        columns=AUDIT_COLUMNS,
+        records=[
+            tuple(
+                orjson.dumps(row[column]).decode()
+                if column == "meta_data" and row[column] is not None
+                else row[column]
+                for column in AUDIT_COLUMNS
+            )
+            for row in rows
+        ],
+    )
+
+    result = await db.execute(
+        text(
+            f"INSERT INTO audit_logs ({columns}) SELECT {columns} "
+            f"FROM {STAGING_TABLE} ON CONFLICT (id, timestamp) DO NOTHING"
+        )
+    )
+    return result.rowcount
+
+
+async def insert_audit_rows(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    """Portable fallback for databases without COPY (SQLite in tests)."""
+    existing = set(
+        (
+            await db.execute(
+                select(AuditLog.id).where(AuditLog.id.in_([row["id"] for row in rows]))
+            )
+        )
+        .scalars()
+        .all()
+    )
+    new_rows = [row for row in rows if row["id"] not in existing]
+    if new_rows:
+        await db.execute(insert(AuditLog), new_rows)
+    return len(new_rows)
+
+
+class AuditConsumer:
+    """Loads audit events from Kafka into audit_logs in large batches.
+
+    Each poll takes up to `batch_size` events across all partitions, loads
+    them in one transaction (COPY plus INSERT ... ON CONFLICT DO NOTHING on
+    Postgres) and only then commits the offsets, so a crash replays the batch
+    and the (event_id, timestamp) primary key drops what was already loaded.
+    If the batch load fails, its rows are inserted one at a time and the ones
+    the database rejects are skipped as invalid, so one bad event cannot hold
+    up a partition. If the database itself is unreachable, the consumer
+    rewinds to the start of the batch and retries after a backoff. Lag per
+    partition is exported as audit_consumer_lag.
+    """
+
+    def __init__(self, consumer, batch_size: int, poll_timeout_ms: int):
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.poll_timeout_ms = poll_timeout_ms
+
+        self.loaded = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.batches = 0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        await self.consumer.start()
+        logger.info("Audit consumer started", extra={"topic": TOPIC})
+        try:
+            while not stop.is_set():
+                try:
+                    await self.consume_once()
+                except Exception as e:
+                    logger.error(
+                        "Audit batch failed, retrying",
+                        extra={
+                            "error_type": type(e).__name__,
+                            "error_message": str(e),
+                        },
+                    )
+                    try:
+                        await asyncio.wait_for(stop.wait(), RETRY_BACKOFF)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.consumer.stop()
+            logger.info("Audit consumer stopped")
+
+    async def consume_once(self) -> int:
+        """Loads and commits one batch; returns the number of events read."""
+        batches = await self.consumer.getmany(
+            timeout_ms=self.poll_timeout_ms, max_records=self.batch_size
+        )
+        records = [record for records in batches.values() for record in records]
+
+        if records:
+            start_time = time.perf_counter()
+            try:
+                await self.load(records)
+            except Exception:
+                for tp, partition_records in batches.items():
+                    self.consumer.seek(tp, partition_records[0].offset)
+                raise
+
+            await self.consumer.commit(
+                {
+                    tp: partition_records[-1].offset + 1
+                    for tp, partition_records in batches.items()
+                }
+            )
+            self.batches += 1
+            audit_consumer_batch_duration.observe(time.perf_counter() - start_time)
+
+        await self.update_lag()
+        return len(records)
+
+    async def load(self, records: List[ConsumerRecord]) -> None:
+        rows: Dict[Any, Dict[str, Any]] = {}
+        sources: Dict[Any, ConsumerRecord] = {}
+        invalid = 0
+        for record in records:
+            row = record_row(record)
+            if row is None:
+                invalid += 1
+                logger.error(
+                    "Skipping malformed audit event",
+                    extra={
+                        "partition": record.partition,
+                        "offset": record.offset,
+                    },
+                )
+                continue
+            rows[row["id"]] = row
+            sources[row["id"]] = record
+
+        inserted = 0
+        if rows:
+            try:
+                async with AsyncSessionLocal() as db:
+                    if db.bind.dialect.name == "postgresql":
+                        inserted = await copy_audit_rows(db, list(rows.values()))
+                    else:
+                        inserted = await insert_audit_rows(db, list(rows.values()))
+                    await db.commit()
+            except Exception as e:
+                logger.warning(
+                    "Audit batch load failed, loading row by row",
+                    extra={"error_type": type(e).__name__, "error_message": str(e)},
+                )
+                inserted, rejected = await self.load_rows(rows, sources)
+                invalid += rejected
+
+        duplicates = len(records) - invalid - inserted
+        self.loaded += inserted
+        self.duplicates += duplicates
+        self.invalid += invalid
+        audit_consumer_events.inc("loaded", amount=inserted)
+        audit_consumer_events.inc("duplicate", amount=duplicates)
+        audit_consumer_events.inc("invalid", amount=invalid)
+
+    async def load_rows(
+        self,
+        rows: Dict[Any, Dict[str, Any]],
+        sources: Dict[Any, ConsumerRecord],
+    ) -> Tuple[int, int]:
+        """Inserts rows one transaction each; returns (inserted, rejected).
+        Connection errors are raised so the whole batch is retried."""
+        inserted = rejected = 0
+        async with AsyncSessionLocal() as db:
+            for row_id, row in rows.items():
+                try:
+                    inserted += await insert_audit_rows(db, [row])
+                    await db.commit()
+                except StatementError as e:
+                    await db.rollback()
+                    if isinstance(e, (InterfaceError, OperationalError)) or getattr(
+                        e, "connection_invalidated", False
+                    ):
+                        raise
+                    rejected += 1
+                    logger.error(
+                        "Skipping audit event rejected by the database",
+                        extra={
+                            "partition": sources[row_id].partition,
+                            "offset": sources[row_id].offset,
+                            "error_type": type(e).__name__,
+                            "error_message": str(e),
+                        },
+                    )
+        return inserted, rejected
+
+    async def update_lag(self) -> None:
+        for tp in self.consumer.assignment():
+            highwater = self.consumer.highwater(tp)
+            if highwater is None:
+                continue
+            position = await self.consumer.position(tp)
+            audit_consumer_lag.set(
+                max(highwater - position, 0), tp.topic, str(tp.partition)
+            )
+
+
+async def main() -> None:
+    consumer = AuditConsumer(
+        build_consumer(
+            TOPIC,
+            group_id=env.audit_consumer_group,
+            max_records=env.audit_consumer_batch_size,
+        ),
+        batch_size=env.audit_consumer_batch_size,
+        poll_timeout_ms=env.audit_consumer_poll_timeout_ms,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    metrics.start(redis_client)
+    try:
+        await consumer.run(stop)
+    finally:
+        await metrics.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
+
+# audit_logs columns an event carries, besides id and timestamp
+AUDIT_FIELDS = (
+    "actor_user_id",
+    "organization_id",
+    "action",
+    "resource_type",
+    "resource_id",
+    "status",
+    "meta_data",
+    "ip_address",
+    "user_agent",
+    "endpoint",
+)
+
+
+def audit_event(
+    action: str,
+    resource_type: str,
+    resource_id: Optional[str] = None,
+    status: str = "success",
+    actor_user_id: Optional[int] = None,
+    organization_id: Optional[int] = None,
+    meta_data: Optional[Dict[str, Any]] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    endpoint: Optional[str] = None,
+) -> Dict[str, Any]:
+    """JSON-ready audit event. Its event_id becomes the audit_logs id, so a
+    redelivered event is loaded only once."""
+    return {
+        "event_id": str(uuid4()),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "actor_user_id": actor_user_id,
+        "organization_id": organization_id,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "status": status,
+        "meta_data": meta_data,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "endpoint": endpoint,
+    }
+
+
+def audit_key(organization_id: Optional[int]) -> Optional[bytes]:
+    # Events of one organization share a partition and keep their order
+    return f"org:{organization_id}".encode() if organization_id is not None else None
+
+
+def audit_row(event: Dict[str, Any]) -> Dict[str, Any]:
+    """audit_logs row for an event built by `audit_event`."""
+    row = {field: event.get(field) for field in AUDIT_FIELDS}
+    row["id"] = UUID(event["event_id"])
+    row["timestamp"] = datetime.fromisoformat(event["timestamp"])
+    row["status"] = row["status"] or "success"
+    return row
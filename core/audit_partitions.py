@@ -0,0 +1,294 @@
+import asyncio
+import os
+import re
+import orjson
+import zstandard
+
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, Dict, List, Mapping, Optional
+from sqlalchemy import column, select, table, text
+
+from core.config import env
+from core.logger import logger
+from core.metrics import metrics
+from database.db.session import engine
+from database.models.audit_log import AuditLog
+
+PARTITION_NAME = re.compile(r"^audit_logs_p(\d{4})_(\d{2})$")
+# pg_try_advisory_lock key, so only one worker maintains partitions at a time
+MAINTENANCE_LOCK_KEY = 0x6175_6474  # "audt"
+ARCHIVE_CHUNK_ROWS = 5_000
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"audit_logs_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    match = PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+
+
+async def write_archive(path: str, rows: AsyncIterable[Mapping[str, Any]]) -> int:
+    """Writes rows to `path` as zstd-compressed NDJSON, one object per line.
+
+    The file is written under a temporary name, fsynced and renamed into place,
+    so an archive that exists is always complete. Returns the rows written.
+    """
+    tmp_path = f"{path}.tmp"
+    written = 0
+
+    with open(tmp_path, "wb") as f:
+        with zstandard.ZstdCompressor(level=10).stream_writer(
+            f, closefd=False
+        ) as writer:
+            lines: List[bytes] = []
+            async for row in rows:
+                lines.append(orjson.dumps(dict(row), option=orjson.OPT_APPEND_NEWLINE))
+                if len(lines) >= ARCHIVE_CHUNK_ROWS:
+                    await asyncio.to_thread(writer.write, b"".join(lines))
+                    written += len(lines)
+                    lines = []
+            if lines:
+                await asyncio.to_thread(writer.write, b"".join(lines))
+                written += len(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return written
+
+
+class AuditPartitionManager:
+    """Keeps the monthly audit_logs partitions in shape.
+
+    Every `interval` seconds (and once at startup) it creates the partitions
+    for the current month and the next `months_ahead`, then retires every
+    partition that ended more than `retention_months` months ago: it is
+    detached from audit_logs, archived to `archive_dir` as
+    audit_logs_pYYYY_MM.ndjson.zst and dropped. A detached partition that
+    failed to archive is picked up again on the next run. Rows outside every
+    monthly range go to audit_logs_default, which is never retired; when a
+    month is created late, its rows are moved out of the default. Only one
+    worker does this at a time (advisory lock); on databases other than
+    Postgres it does nothing.
+    """
+
+    def __init__(
+        self,
+        months_ahead: int,
+        retention_months: int,
+        archive_dir: str,
+        interval: float,
+    ):
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.archive_dir = archive_dir
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+        self.created = 0
+        self.archived = 0
+        self.archived_rows = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "created": self.created,
+            "archived": self.archived,
+            "archived_rows": self.archived_rows,
+        }
+
+    async def maintain(self, now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """Runs one round; returns the partitions created and archived."""
+        done: Dict[str, List[str]] = {"created": [], "archived": []}
+        if engine.dialect.name != "postgresql":
+            return done
+
+        current = month_start(now or datetime.now(timezone.utc))
+        cutoff = add_months(current, -self.retention_months)
+
+        async with engine.connect() as conn:
+            locked = (
+                await conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"),
+                    {"key": MAINTENANCE_LOCK_KEY},
+                )
+            ).scalar()
+            await conn.commit()
+            if not locked:
+                return done
+
+            try:
+                for months in range(self.months_ahead + 1):
+                    name = await self._create_partition(
+                        conn, add_months(current, months)
+                    )
+                    if name:
+                        done["created"].append(name)
+                await conn.commit()
+
+                for name, attached in await self._partitions(conn):
+                    month = partition_month(name)
+                    if add_months(month, 1) > cutoff:
+                        continue
+                    if attached:
+                        await conn.execute(
+                            text(f"ALTER TABLE audit_logs DETACH PARTITION {name}")
+                        )
+                        await conn.commit()
+                    await self._archive(conn, name)
+                    done["archived"].append(name)
+            finally:
+                await conn.rollback()
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": MAINTENANCE_LOCK_KEY},
+                )
+                await conn.commit()
+
+        self.created += len(done["created"])
+        self.archived += len(done["archived"])
+        return done
+
+    async def _create_partition(self, conn, month: datetime) -> Optional[str]:
+        name = partition_name(month)
+        exists = (
+            await conn.execute(text("SELECT to_regclass(:name)"), {"name": name})
+        ).scalar()
+        if exists:
+            return None
+
+        bounds = {"start": month, "end": add_months(month, 1)}
+        create = text(
+            f"CREATE TABLE {name} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{add_months(month, 1).isoformat()}')"
+        )
+        stranded = (
+            await conn.execute(
+                text(
+                    "SELECT EXISTS (SELECT 1 FROM audit_logs_default "
+                    'WHERE "timestamp" >= :start AND "timestamp" < :end)'
+                ),
+                bounds,
+            )
+        ).scalar()
+        if not stranded:
+            await conn.execute(create)
+            logger.info("Created audit log partition", extra={"partition": name})
+            return name
+
+        # Postgres refuses to create a partition whose range overlaps rows
+        # already in the default partition, so detach it, create the month and
+        # move its rows across before attaching it back, all in one transaction
+        await conn.execute(
+            text("ALTER TABLE audit_logs DETACH PARTITION audit_logs_default")
+        )
+        await conn.execute(create)
+        moved = (
+            await conn.execute(
+                text(
+                    "WITH moved AS (DELETE FROM audit_logs_default "
+                    'WHERE "timestamp" >= :start AND "timestamp" < :end RETURNING *) '
+                    "INSERT INTO audit_logs SELECT * FROM moved"
+                ),
+                bounds,
+            )
+        ).rowcount
+        await conn.execute(
+            text("ALTER TABLE audit_logs ATTACH PARTITION audit_logs_default DEFAULT")
+        )
+        logger.info(
+            "Created audit log partition",
+            extra={"partition": name, "moved_from_default": moved},
+        )
+        return name
+
+    async def _partitions(self, conn) -> List[tuple]:
+        """(name, attached) of every monthly partition table, oldest first."""
+        rows = (
+            await conn.execute(
+                text(
+                    "SELECT relname, relispartition FROM pg_class "
+                    "WHERE relkind = 'r' AND relname ~ :pattern ORDER BY relname"
+                ),
+                {"pattern": PARTITION_NAME.pattern},
+            )
+        ).all()
+        await conn.commit()
+        return [(name, attached) for name, attached in rows]
+
+    async def _archive(self, conn, name: str) -> None:
+        """Archives a detached partition to disk, then drops it."""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{name}.ndjson.zst")
+
+        partition = table(
+            name, *(column(c.name, c.type) for c in AuditLog.__table__.columns)
+        )
+        result = await conn.stream(
+            select(partition).execution_options(yield_per=ARCHIVE_CHUNK_ROWS)
+        )
+        rows = await write_archive(path, result.mappings())
+        await conn.commit()
+
+        await conn.execute(text(f"DROP TABLE {name}"))
+        await conn.commit()
+
+        self.archived_rows += rows
+        logger.info(
+            "Archived audit log partition",
+            extra={"partition": name, "rows": rows, "path": path},
+        )
+
+    async def _run(self):
+        while True:
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error(
+                    "Audit partition maintenance failed",
+                    extra={"error_type": type(e).__name__, "error_message": str(e)},
+                )
+            await asyncio.sleep(self.interval)
+
+
+audit_partitions = AuditPartitionManager(
+    months_ahead=env.audit_partition_months_ahead,
+    retention_months=env.audit_retention_months,
+    archive_dir=env.audit_archive_dir,
+    interval=env.audit_partition_interval_seconds,
+)
+
+metrics.gauge(
+    "audit_partitions",
+    "Audit log partition maintenance lifetime counters.",
+    ("stat",),
+    collect=lambda: {
+        (stat,): value for stat, value in audit_partitions.stats().items()
+    },
+)
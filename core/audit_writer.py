@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+from typing import Any, Dict, List
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import env
+from core.logger import logger
+from core.metrics import metrics
+from database.db.session import AsyncSessionLocal
+from database.models.audit_log import AuditLog
+
+
+class AuditLogWriter:
+    """Buffers audit rows in a bounded queue and writes them in batches.
+
+    A single background task flushes whenever `batch_size` rows are waiting or
+    `flush_interval` seconds have passed since the first row of the batch, using
+    one multi-row INSERT and one commit per batch. When the queue is full,
+    producers wait up to `enqueue_timeout` seconds before the row is dropped.
+    A batch that fails is retried row by row, so only the bad rows are lost.
+    Use as an app-level singleton started and stopped from the FastAPI lifespan.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+        enqueue_timeout: float,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=queue_size)
+        self._task: asyncio.Task | None = None
+
+        self.enqueued = 0
+        self.blocked = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_seconds = 0.0
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Audit log writer started")
+
+    async def stop(self, timeout: float = 10.0):
+        if not self._task:
+            return
+
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                "Audit log writer stopped before draining",
+                extra={"pending": self.queue.qsize()},
+            )
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Audit log writer stopped")
+
+    async def submit(self, row: Dict[str, Any]) -> None:
+        # Without a running flusher (scripts, tests) fall back to a direct write
+        if not self._task:
+            await self._write([row])
+            return
+
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.blocked += 1
+            try:
+                await asyncio.wait_for(self.queue.put(row), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                logger.error(
+                    "Audit log queue full, event dropped",
+                    extra={"action": row.get("action"), "dropped": self.dropped},
+                )
+                return
+
+        self.enqueued += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "enqueued": self.enqueued,
+            "blocked": self.blocked,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        start_time = time.perf_counter()
+
+        async with AsyncSessionLocal() as db:
+            try:
+                await db.execute(insert(AuditLog), rows)
+                await db.commit()
+
+            except Exception as e:
+                await db.rollback()
+
+                logger.error(
+                    "Audit log batch failed, writing row by row",
+                    extra={
+                        "error": str(e),
+                        "batch_size": len(rows),
+                        "actions": sorted({row.get("action") for row in rows}),
+                    },
+                )
+                await self._write_rows(db, rows)
+                return
+
+        self.written += len(rows)
+        self.flushes += 1
+        self.last_flush_seconds = time.perf_counter() - start_time
+
+    async def _write_rows(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Retries a failed batch one row per transaction, so only the rows
+        that fail on their own are dropped."""
+        for row in rows:
+            try:
+                await db.execute(insert(AuditLog), [row])
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+
+                self.failed += 1
+                logger.error(
+                    "Audit log row dropped",
+                    extra={"error": str(e), "action": row.get("action")},
+                )
+                continue
+            self.written += 1
+
+
+audit_writer = AuditLogWriter(
+    batch_size=env.audit_batch_size,
+    flush_interval=env.audit_flush_interval_seconds,
+    queue_size=env.audit_queue_size,
+    enqueue_timeout=env.audit_enqueue_timeout_seconds,
+)
+
+metrics.gauge(
+    "audit_writer",
+    "Audit log writer queue depth and lifetime counters.",
+    ("stat",),
+    collect=lambda: {(stat,): value for stat, value in audit_writer.stats().items()},
+)
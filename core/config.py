@@ -1,3 +1,5 @@
+from datetime import datetime
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +7,12 @@ class Settings(BaseSettings):
     database_url: str
     secret_key: str
     algorithm: str
+    jwt_private_key_b64: Optional[str] = None
+    jwt_key_id: Optional[str] = None
+    jwt_retired_public_keys_b64: str = ""
+    # With an asymmetric ALGORITHM, HS256 tokens (no kid) are accepted until
+    # then; set it to the switch time plus the refresh token lifetime
+    jwt_legacy_tokens_until: Optional[datetime] = None
     access_token_expire_minutes: int
     refresh_token_expire_days: int
 
@@ -15,6 +23,69 @@ class Settings(BaseSettings):
     better_stack_token: str
     redis_url: str
 
+    local_cache_max_entries: int = 10_000
+    local_cache_ttl_seconds: float = 5.0
+
+    rate_limit_backend: str = "redis"
+    rate_limit_max_keys: int = 10_000
+    rate_limit_sweep_interval_seconds: float = 60.0
+
+    audit_batch_size: int = 500
+    audit_flush_interval_seconds: float = 1.0
+    audit_queue_size: int = 10_000
+    audit_enqueue_timeout_seconds: float = 1.0
+    # "kafka" (loaded by the audit consumer) or "database" (AuditLogWriter)
+    audit_sink: str = "kafka"
+    audit_consumer_group: str = "audit-loader"
+    audit_consumer_batch_size: int = 5_000
+    audit_consumer_poll_timeout_ms: int = 1_000
+    # audit_logs is partitioned by month; older partitions are archived to
+    # audit_archive_dir as zstd NDJSON and dropped
+    audit_partition_months_ahead: int = 3
+    audit_retention_months: int = 12
+    audit_archive_dir: str = "audit_archive"
+    audit_partition_interval_seconds: float = 6 * 60 * 60
+
+    jti_purge_interval_seconds: float = 60 * 60
+    token_cache_max_entries: int = 50_000
+
+    # Comma-separated METHOD:ROUTE:STATUS=RATE rules, first match wins; "*"
+    # matches anything and STATUS may be a class such as 2xx
+    access_log_sample_rules: str = "*:/health:*=0.01,GET:*:2xx=0.01"
+    access_log_slow_request_seconds: float = 1.0
+
+    metrics_flush_interval_seconds: float = 5.0
+    # "off", "totals" or "detailed" (one Server-Timing entry per DB/Redis call)
+    server_timing_mode: str = "totals"
+
+    slow_query_threshold_ms: float = 200.0
+    query_stats_max_fingerprints: int = 1_000
+    query_stats_window: int = 1_024
+    # Enables /v2/admin endpoints when set; sent as the X-Admin-Token header
+    admin_api_token: Optional[str] = None
+
+    # "off", "warn" (log) or "enforce" (also collected for the test suite)
+    query_budget_mode: str = "off"
+    n_plus_one_threshold: int = 5
+
+    # "aiven" or "memory" (in-process broker, no network; tests and benchmarks)
+    kafka_backend: str = "aiven"
+    kafka_memory_partitions: int = 3
+    kafka_buffer_size: int = 10_000
+    kafka_batch_size: int = 500
+    # "block", "drop_oldest" or "spill" (write to the on-disk spool)
+    kafka_overflow_policy: str = "block"
+    kafka_enqueue_timeout_seconds: float = 1.0
+    kafka_spool_dir: str = "kafka_spool"
+    kafka_spool_segment_bytes: int = 16 * 1024 * 1024
+    kafka_spool_replay_interval_seconds: float = 5.0
+    kafka_drain_timeout_seconds: float = 10.0
+
+    outbox_batch_size: int = 500
+    outbox_poll_interval_seconds: float = 0.5
+    outbox_max_attempts: int = 10
+    outbox_retry_backoff_seconds: float = 1.0
+
     aiven_kafka_bootstrap: str
     aiven_kafka_topic: str
 
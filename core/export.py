@@ -0,0 +1,51 @@
+import csv
+import enum
+import io
+import orjson
+
+from typing import AsyncIterator, List, Literal
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncResult
+
+EXPORT_BATCH_SIZE = 1000
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _plain(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+async def stream_rows(
+    result: AsyncResult, fields: List[str], format: ExportFormat
+) -> AsyncIterator[bytes]:
+    """Encodes a streamed result one partition at a time, so memory stays
+    bounded by EXPORT_BATCH_SIZE rows whatever the size of the export."""
+    if format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(fields)
+        yield buffer.getvalue().encode()
+
+    async for partition in result.partitions(EXPORT_BATCH_SIZE):
+        if format == "ndjson":
+            yield b"".join(
+                orjson.dumps(dict(zip(fields, map(_plain, row)))) + b"\n"
+                for row in partition
+            )
+        else:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(
+                [_plain(value) for value in row] for row in partition
+            )
+            yield buffer.getvalue().encode()
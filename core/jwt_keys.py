@@ -0,0 +1,145 @@
+import base64
+import hashlib
+import orjson
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from jose import jwk, jwt
+from jose.backends.base import Key
+from jose.exceptions import JWTError
+
+from core.config import env
+
+ASYMMETRIC_PREFIXES = ("ES", "RS")
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _thumbprint(public_jwk: Dict[str, Any]) -> str:
+    """RFC 7638 JWK thumbprint, used as the default key ID."""
+    required = {"EC": ("crv", "kty", "x", "y"), "RSA": ("e", "kty", "n")}
+    members = {name: public_jwk[name] for name in required[public_jwk["kty"]]}
+    return _b64url(hashlib.sha256(orjson.dumps(members)).digest())
+
+
+class KeyRing:
+    """Signing key plus every key still accepted for verification.
+
+    Keys are parsed once into python-jose Key objects, so the hot verification
+    path only reads the token header and looks the verifier up by `kid`.
+    With an asymmetric `algorithm` (ES256, RS256, ...) tokens are signed with
+    the current private key and carry its `kid`; rotated-out public keys stay
+    verifiable until their tokens expire. Tokens without a `kid` are checked
+    against the legacy shared secret so sessions survive the switch from
+    HS256, but only until `legacy_until`; after that (or without it) they are
+    rejected, so the shared secret stops being a way in.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str,
+        legacy_until: Optional[datetime] = None,
+    ):
+        self.algorithm = algorithm
+        if legacy_until is not None and legacy_until.tzinfo is None:
+            legacy_until = legacy_until.replace(tzinfo=timezone.utc)
+        self.legacy_until = legacy_until
+        self.legacy_algorithm = algorithm if algorithm.startswith("HS") else "HS256"
+        self.legacy_verifier = jwk.construct(secret_key, self.legacy_algorithm)
+
+        self.signing_key: Key = self.legacy_verifier
+        self.signing_kid: Optional[str] = None
+        self.verifiers: Dict[str, Key] = {}
+        self._jwks: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+    @property
+    def asymmetric(self) -> bool:
+        return self.algorithm.startswith(ASYMMETRIC_PREFIXES)
+
+    def rotate(self, private_key_pem: str, kid: Optional[str] = None) -> str:
+        """Makes `private_key_pem` the signing key; the previous public key
+        stays in the verification set."""
+        signing_key = jwk.construct(private_key_pem, self.algorithm)
+        public_key = signing_key.public_key()
+        kid = kid or _thumbprint(public_key.to_dict())
+
+        self.signing_key = signing_key
+        self.signing_kid = kid
+        self.verifiers[kid] = public_key
+        self._jwks = None
+        return kid
+
+    def add_public_key(self, public_key_pem: str, kid: Optional[str] = None) -> str:
+        public_key = jwk.construct(public_key_pem, self.algorithm)
+        kid = kid or _thumbprint(public_key.to_dict())
+
+        self.verifiers[kid] = public_key
+        self._jwks = None
+        return kid
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        if self.signing_kid is None:
+            return jwt.encode(claims, self.signing_key, algorithm=self.legacy_algorithm)
+
+        return jwt.encode(
+            claims,
+            self.signing_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.signing_kid},
+        )
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        kid = jwt.get_unverified_header(token).get("kid")
+
+        if kid is None:
+            if self.asymmetric and (
+                self.legacy_until is None
+                or datetime.now(timezone.utc) >= self.legacy_until
+            ):
+                raise JWTError("Token has no key id")
+            return jwt.decode(
+                token, self.legacy_verifier, algorithms=[self.legacy_algorithm]
+            )
+
+        verifier = self.verifiers.get(kid)
+        if verifier is None:
+            raise JWTError("Unknown key id")
+
+        return jwt.decode(token, verifier, algorithms=[self.algorithm])
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._jwks is None:
+            self._jwks = {
+                "keys": [
+                    {**key.to_dict(), "kid": kid, "use": "sig"}
+                    for kid, key in self.verifiers.items()
+                ]
+            }
+        return self._jwks
+
+
+def build_key_ring() -> KeyRing:
+    key_ring = KeyRing(
+        algorithm=env.algorithm,
+        secret_key=env.secret_key,
+        legacy_until=env.jwt_legacy_tokens_until,
+    )
+
+    if key_ring.asymmetric:
+        if not env.jwt_private_key_b64:
+            raise RuntimeError(f"JWT_PRIVATE_KEY_B64 is required for {env.algorithm}")
+
+        for public_key_b64 in filter(None, env.jwt_retired_public_keys_b64.split(",")):
+            key_ring.add_public_key(base64.b64decode(public_key_b64).decode())
+
+        key_ring.rotate(
+            base64.b64decode(env.jwt_private_key_b64).decode(), env.jwt_key_id
+        )
+
+    return key_ring
+
+
+key_ring = build_key_ring()
@@ -1,71 +1,448 @@
-import ssl
+import asyncio
+import base64
+import time
 import orjson
 
-from aiokafka import AIOKafkaProducer
-from aiokafka.errors import KafkaError
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from aiokafka.errors import KafkaConnectionError, KafkaError
 
 from core.config import env
+from core.kafka.backends import KAFKA_BACKEND, ProducerBackend, build_producer
 from core.kafka.kafka_ssl_files_generator import generate_kafka_connection_files
+from core.kafka.spool import SegmentSpool, read_segment
 from core.logger import logger
+from core.metrics import kafka_messages, kafka_send_duration, metrics
 
-KAFKA_BOOTSTRAP = env.aiven_kafka_bootstrap
 TOPIC = env.aiven_kafka_topic
 
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+MAX_CONNECT_BACKOFF = 30.0
 
-def create_ssl_context() -> ssl.SSLContext:
-    ssl_context = ssl.create_default_context(cafile="ca.pem")
-    ssl_context.load_cert_chain(certfile="service.cert", keyfile="service.key")
-    return ssl_context
-
-
-def build_producer() -> AIOKafkaProducer:
-    return AIOKafkaProducer(
-        bootstrap_servers=KAFKA_BOOTSTRAP,
-        value_serializer=orjson.dumps,
-        security_protocol="SSL",
-        ssl_context=create_ssl_context(),
-        # Reliability
-        acks="all",  # wait for all ISR replicas to acknowledge
-        enable_idempotence=True,  # exactly-once delivery semantics
-        # Throughput / batching
-        compression_type="lz4",
-        linger_ms=10,  # wait up to 10ms to batch messages
-        max_batch_size=16384,
-        # Retries
-        request_timeout_ms=30_000,
-        retry_backoff_ms=300,
+# (topic, value, key)
+Message = Tuple[str, dict, Optional[bytes]]
+# Called once per buffered message with the delivery error, or None on success
+DeliveryCallback = Callable[[str, dict, Optional[bytes], Optional[BaseException]], Any]
+
+
+class KafkaBufferFull(Exception):
+    """A buffered message was dropped because the buffer was full."""
+
+
+def encode_message(message: Message) -> bytes:
+    topic, value, key = message
+    return orjson.dumps(
+        {
+            "topic": topic,
+            "key": base64.b64encode(key).decode() if key else None,
+            "value": value,
+        }
     )
 
 
+def decode_message(payload: bytes) -> Message:
+    record = orjson.loads(payload)
+    key = base64.b64decode(record["key"]) if record["key"] else None
+    return record["topic"], record["value"], key
+
+
 class KafkaProducerManager:
-    """Manages producer lifecycle. Use as an app-level singleton (e.g. FastAPI lifespan)."""
+    """Manages producer lifecycle. Use as an app-level singleton (e.g. FastAPI lifespan).
+
+    `start` never waits for the broker: the connection is made by a
+    background task that retries with backoff, so the API serves traffic
+    whatever state Kafka is in. Until it is connected, and whenever a send
+    fails, messages go to an on-disk `spool` instead of being lost; a
+    replayer drains it in batches every `replay_interval` seconds while the
+    broker is reachable.
+
+    `send`/`publish` wait for the broker's ack. `submit` is fire-and-forget:
+    the message goes into a bounded buffer and a background task hands it to
+    the producer in batches of `batch_size`, awaiting the whole batch's
+    delivery futures at once. Outcomes are reported to `delivery_callbacks`
+    and the kafka_messages_total metric.
 
-    def __init__(self):
-        self._producer: AIOKafkaProducer | None = None
+    When the buffer is full, `overflow_policy` decides: "block" waits up to
+    `enqueue_timeout` seconds for room and then drops the message,
+    "drop_oldest" evicts the oldest buffered message, and "spill" writes the
+    message to the spool.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int,
+        batch_size: int,
+        overflow_policy: str,
+        enqueue_timeout: float,
+        spool: SegmentSpool,
+        replay_interval: float,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported Kafka overflow policy: {overflow_policy}")
+
+        self._producer: ProducerBackend | None = None
+        self._connector: asyncio.Task | None = None
+        self._flusher: asyncio.Task | None = None
+        self._replayer: asyncio.Task | None = None
+        self.connected = asyncio.Event()
+
+        self.buffer: Deque[Message] = deque()
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self.enqueue_timeout = enqueue_timeout
+        self.spool = spool
+        self.replay_interval = replay_interval
+        self.delivery_callbacks: List[DeliveryCallback] = []
+
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._inflight = 0
+
+        self.enqueued = 0
+        self.blocked = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.spooled = 0
+        self.replayed = 0
 
     async def start(self):
-        generate_kafka_connection_files(env)  # side-effect deferred to explicit startup
-        self._producer = build_producer()
-        await self._producer.start()
-        logger.info("Kafka producer started (bootstrap=%s)", KAFKA_BOOTSTRAP)
+        if KAFKA_BACKEND == "aiven":
+            # side-effect deferred to explicit startup
+            generate_kafka_connection_files(env)
+        await asyncio.to_thread(self.spool.open)
+
+        self._connector = asyncio.create_task(self._connect())
+        self._flusher = asyncio.create_task(self._run())
+        self._replayer = asyncio.create_task(self._replay_loop())
+
+    async def drain(self, timeout: float = 10.0) -> bool:
+        """Waits until every buffered message has been acked or spooled.
+        Returns False if the buffer was not empty after `timeout` seconds."""
+        deadline = time.monotonic() + timeout
+        while self.buffer or self._inflight:
+            if not self._flusher or time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
 
     async def stop(self):
+        for task in (self._connector, self._flusher, self._replayer):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._connector = self._flusher = self._replayer = None
+
+        if self.buffer:
+            leftover = list(self.buffer)
+            self.buffer.clear()
+            await self._spool(leftover)
+            logger.warning(
+                "Kafka producer stopped with undelivered messages, spooled",
+                extra={"spooled": len(leftover)},
+            )
+
+        await asyncio.to_thread(self.spool.close)
+
+        self.connected.clear()
         if self._producer:
             await self._producer.stop()
+            self._producer = None
             logger.info("Kafka producer stopped")
 
     async def send(self, topic: str, value: dict, key: bytes | None = None) -> None:
-        if not self._producer:
-            raise RuntimeError("Producer is not running — call start() first")
+        """Sends and waits for the ack; spools the message instead of raising
+        when the broker is unreachable."""
+        if not self.connected.is_set():
+            await self._spool([(topic, value, key)])
+            return
+
+        start_time = time.perf_counter()
         try:
             await self._producer.send_and_wait(topic, value=value, key=key)
         except KafkaError:
-            logger.exception("Failed to send message to topic %s", topic)
-            raise
+            kafka_send_duration.observe(
+                time.perf_counter() - start_time, topic, "error"
+            )
+            logger.exception("Failed to send message to topic %s, spooled", topic)
+            await self._spool([(topic, value, key)])
+            return
+        kafka_send_duration.observe(time.perf_counter() - start_time, topic, "ok")
 
     # Convenience shortcut for the default topic
     async def publish(self, value: dict, key: bytes | None = None) -> None:
         await self.send(TOPIC, value, key)
 
+    async def submit(
+        self, value: dict, key: bytes | None = None, topic: str = TOPIC
+    ) -> None:
+        """Buffers the message for background delivery without waiting for
+        the broker."""
+        if not self._flusher:
+            raise RuntimeError("Producer is not running — call start() first")
+
+        message = (topic, value, key)
+
+        if len(self.buffer) >= self.buffer_size:
+            if self.overflow_policy == "spill":
+                await self._spool([message])
+                return
+
+            if self.overflow_policy == "drop_oldest":
+                self._drop(self.buffer.popleft())
+
+            elif not await self._wait_for_room():
+                self._drop(message)
+                return
+
+        self.buffer.append(message)
+        self.enqueued += 1
+        self._not_empty.set()
+
+    async def send_batch(
+        self, messages: List[Message]
+    ) -> List[Optional[BaseException]]:
+        """Sends every message, then awaits all their acks at once. Returns
+        the delivery error, or None, for each message in order."""
+        if not self.connected.is_set():
+            return [KafkaConnectionError("Kafka broker is not connected")] * len(
+                messages
+            )
+
+        loop = asyncio.get_running_loop()
+
+        # send() only appends to the producer's accumulator; the acks are
+        # awaited together below
+        futures = []
+        for topic, value, key in messages:
+            try:
+                futures.append(await self._producer.send(topic, value=value, key=key))
+            except Exception as e:
+                failed = loop.create_future()
+                failed.set_exception(e)
+                futures.append(failed)
+
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        return [
+            result if isinstance(result, BaseException) else None for result in results
+        ]
+
+    def add_delivery_callback(self, callback: DeliveryCallback) -> None:
+        self.delivery_callbacks.append(callback)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connected": int(self.connected.is_set()),
+            "buffer_depth": len(self.buffer),
+            "buffer_size": self.buffer_size,
+            "inflight": self._inflight,
+            "enqueued": self.enqueued,
+            "blocked": self.blocked,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "spool_bytes": self.spool.pending_bytes,
+        }
+
+    async def _connect(self):
+        delay = 1.0
+        while True:
+            producer = None
+            try:
+                producer = build_producer()
+                await producer.start()
+            except Exception as e:
+                if producer is not None:
+                    await producer.stop()
+                logger.warning(
+                    "Kafka broker unreachable, retrying",
+                    extra={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "retry_in_seconds": delay,
+                    },
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_CONNECT_BACKOFF)
+                continue
+
+            self._producer = producer
+            self.connected.set()
+            logger.info("Kafka producer started (backend=%s)", KAFKA_BACKEND)
+            return
+
+    async def _wait_for_room(self) -> bool:
+        self.blocked += 1
+        deadline = time.monotonic() + self.enqueue_timeout
+
+        while len(self.buffer) >= self.buffer_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return False
+            self._not_full.clear()
+            try:
+                await asyncio.wait_for(self._not_full.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def _drop(self, message: Message) -> None:
+        self.dropped += 1
+        kafka_messages.inc("dropped")
+        logger.error(
+            "Kafka buffer full, message dropped",
+            extra={"topic": message[0], "dropped": self.dropped},
+        )
+        self._notify(message, KafkaBufferFull())
+
+    def _notify(self, message: Message, error: Optional[BaseException]) -> None:
+        for callback in self.delivery_callbacks:
+            try:
+                callback(*message, error)
+            except Exception:
+                logger.exception("Kafka delivery callback failed")
+
+    async def _run(self):
+        while True:
+            if not self.buffer:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+
+            batch = [
+                self.buffer.popleft()
+                for _ in range(min(self.batch_size, len(self.buffer)))
+            ]
+            self._not_full.set()
+            try:
+                await self._deliver(batch)
+            except Exception:
+                self.dropped += len(batch)
+                kafka_messages.inc("dropped", amount=len(batch))
+                logger.exception(
+                    "Kafka batch could not be delivered or spooled",
+                    extra={"dropped": len(batch)},
+                )
+
+    async def _deliver(self, batch: List[Message]) -> None:
+        self._inflight += len(batch)
+        start_time = time.perf_counter()
+
+        try:
+            if not self.connected.is_set():
+                await self._spool(batch)
+                return
+            try:
+                errors = await self.send_batch(batch)
+            except asyncio.CancelledError:
+                # stop() cancelled us mid-send: keep the batch instead of
+                # losing it; anything already acked is deduped downstream
+                await self._spool(batch)
+                raise
+        finally:
+            self._inflight -= len(batch)
+
+        duration = time.perf_counter() - start_time
+        retry = []
+        for message, error in zip(batch, errors):
+            kafka_send_duration.observe(
+                duration, message[0], "error" if error else "ok"
+            )
+
+            if error is None:
+                self.delivered += 1
+                kafka_messages.inc("delivered")
+            else:
+                self.failed += 1
+                kafka_messages.inc("failed")
+                retry.append(message)
+            self._notify(message, error)
+
+        if retry:
+            logger.error(
+                "Kafka batch delivery failed, spooled",
+                extra={"failed": len(retry), "batch_size": len(batch)},
+            )
+            await self._spool(retry)
+
+    async def _spool(self, messages: List[Message]) -> None:
+        payloads = [encode_message(message) for message in messages]
+        await asyncio.to_thread(self.spool.append, payloads)
+
+        self.spooled += len(messages)
+        kafka_messages.inc("spooled", amount=len(messages))
+
+    async def _replay_loop(self):
+        while True:
+            await asyncio.sleep(self.replay_interval)
+            if not self.connected.is_set() or not self.spool.pending_bytes:
+                continue
+            try:
+                await self.replay_spool()
+            except Exception:
+                logger.exception("Kafka spool replay failed")
+
+    async def replay_spool(self) -> None:
+        """Delivers spooled messages oldest segment first. A segment is
+        deleted once handled; if messages fail again, the segment is
+        rewritten with the undelivered ones, so they stay first in line, and
+        the replay stops until the next round."""
+        await asyncio.to_thread(self.spool.seal)
+
+        for path in await asyncio.to_thread(self.spool.segments):
+            payloads = await asyncio.to_thread(lambda: list(read_segment(path)))
+            messages = [decode_message(payload) for payload in payloads]
+
+            remaining: List[Message] = []
+            for i in range(0, len(messages), self.batch_size):
+                batch = messages[i : i + self.batch_size]
+                errors = await self.send_batch(batch)
+                failed = [m for m, error in zip(batch, errors) if error is not None]
+
+                delivered = len(batch) - len(failed)
+                self.replayed += delivered
+                kafka_messages.inc("replayed", amount=delivered)
+
+                if failed:
+                    remaining = failed + messages[i + self.batch_size :]
+                    break
+
+            if remaining:
+                # Kept at the head of the spool, ahead of anything newer
+                await asyncio.to_thread(
+                    self.spool.replace, path, [encode_message(m) for m in remaining]
+                )
+                logger.warning(
+                    "Kafka spool replay interrupted",
+                    extra={"respooled": len(remaining)},
+                )
+                return
+
+            await asyncio.to_thread(self.spool.remove, path)
+            logger.info(
+                "Replayed Kafka spool segment",
+                extra={"segment": path, "count": len(messages)},
+            )
+
+
+kafka_producer = KafkaProducerManager(
+    buffer_size=env.kafka_buffer_size,
+    batch_size=env.kafka_batch_size,
+    overflow_policy=env.kafka_overflow_policy,
+    enqueue_timeout=env.kafka_enqueue_timeout_seconds,
+    spool=SegmentSpool(env.kafka_spool_dir, env.kafka_spool_segment_bytes),
+    replay_interval=env.kafka_spool_replay_interval_seconds,
+)
 
-kafka_producer = KafkaProducerManager()
+metrics.gauge(
+    "kafka_producer",
+    "Kafka publish buffer depth, spool size and lifetime counters.",
+    ("stat",),
+    collect=lambda: {(stat,): value for stat, value in kafka_producer.stats().items()},
+)
@@ -0,0 +1,316 @@
+import asyncio
+import itertools
+import time
+import zlib
+
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from aiokafka.structs import (
+    ConsumerRecord,
+    OffsetAndMetadata,
+    RecordMetadata,
+    TopicPartition,
+)
+
+# Timestamp type of records stamped by the producer
+CREATE_TIME = 0
+
+
+class MemoryBroker:
+    """In-process stand-in for a Kafka cluster, for offline tests and benchmarks.
+
+    Topics are created on first use with `default_partitions` partitions.
+    Keyed records always land on the same partition (crc32 of the key rather
+    than Kafka's murmur2, so the mapping differs but is just as stable);
+    unkeyed records go round-robin. Committed offsets are kept per consumer
+    group and partition.
+    """
+
+    def __init__(self, default_partitions: int = 3):
+        self.default_partitions = default_partitions
+        self.topics: Dict[str, List[List[ConsumerRecord]]] = {}
+        self.committed: Dict[Tuple[str, TopicPartition], int] = {}
+        self._round_robin = itertools.count()
+
+    def create_topic(self, topic: str, partitions: Optional[int] = None) -> None:
+        if topic not in self.topics:
+            self.topics[topic] = [
+                [] for _ in range(partitions or self.default_partitions)
+            ]
+
+    def partitions_for(self, topic: str) -> Set[int]:
+        self.create_topic(topic)
+        return set(range(len(self.topics[topic])))
+
+    def partition_for(self, topic: str, key: Optional[bytes]) -> int:
+        partitions = len(self.topics[topic])
+        if key is None:
+            return next(self._round_robin) % partitions
+        return zlib.crc32(key) % partitions
+
+    def append(
+        self,
+        topic: str,
+        value: Optional[bytes],
+        key: Optional[bytes] = None,
+        partition: Optional[int] = None,
+        timestamp_ms: Optional[int] = None,
+    ) -> RecordMetadata:
+        self.create_topic(topic)
+        if partition is None:
+            partition = self.partition_for(topic, key)
+        log = self.topics[topic][partition]
+        timestamp_ms = timestamp_ms or int(time.time() * 1000)
+
+        log.append(
+            ConsumerRecord(
+                topic=topic,
+                partition=partition,
+                offset=len(log),
+                timestamp=timestamp_ms,
+                timestamp_type=CREATE_TIME,
+                key=key,
+                value=value,
+                checksum=None,
+                serialized_key_size=len(key) if key is not None else -1,
+                serialized_value_size=len(value) if value is not None else -1,
+                headers=[],
+            )
+        )
+        return RecordMetadata(
+            topic=topic,
+            partition=partition,
+            topic_partition=TopicPartition(topic, partition),
+            offset=len(log) - 1,
+            timestamp=timestamp_ms,
+            timestamp_type=CREATE_TIME,
+            log_start_offset=0,
+        )
+
+    def fetch(
+        self, tp: TopicPartition, offset: int, max_records: int
+    ) -> List[ConsumerRecord]:
+        return self.topics[tp.topic][tp.partition][offset : offset + max_records]
+
+    def end_offset(self, tp: TopicPartition) -> int:
+        self.create_topic(tp.topic)
+        return len(self.topics[tp.topic][tp.partition])
+
+    def reset(self) -> None:
+        self.topics.clear()
+        self.committed.clear()
+
+
+class MemoryProducer:
+    """Implements the part of AIOKafkaProducer that KafkaProducerManager uses,
+    on top of a MemoryBroker.
+
+    `send` adds the message to the open batch and returns a future for its
+    RecordMetadata. A batch is appended to the broker once it holds
+    `max_batch_size` bytes or `linger_ms` after its first message, and its
+    futures resolve `ack_latency` seconds later, standing in for the produce
+    request's round trip. Batches are acknowledged in order.
+    """
+
+    def __init__(
+        self,
+        broker: MemoryBroker,
+        value_serializer: Optional[Callable] = None,
+        key_serializer: Optional[Callable] = None,
+        linger_ms: int = 0,
+        max_batch_size: int = 16384,
+        ack_latency: float = 0.0,
+    ):
+        self.broker = broker
+        self.value_serializer = value_serializer
+        self.key_serializer = key_serializer
+        self.linger = linger_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.ack_latency = ack_latency
+
+        # (topic, value, key, partition, future) per message
+        self._batch: List[tuple] = []
+        self._batch_bytes = 0
+        self._linger_timer: Optional[asyncio.TimerHandle] = None
+        self._pending: Set[asyncio.Task] = set()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def start(self):
+        self._lock = asyncio.Lock()
+
+    async def stop(self):
+        await self.flush()
+
+    async def send(
+        self,
+        topic: str,
+        value=None,
+        key=None,
+        partition: Optional[int] = None,
+    ) -> asyncio.Future:
+        if self._lock is None:
+            raise RuntimeError("Producer is not running — call start() first")
+
+        if self.value_serializer and value is not None:
+            value = self.value_serializer(value)
+        if self.key_serializer and key is not None:
+            key = self.key_serializer(key)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((topic, value, key, partition, future))
+        self._batch_bytes += len(value or b"") + len(key or b"")
+
+        if self._batch_bytes >= self.max_batch_size or not self.linger:
+            self._close_batch()
+        elif self._linger_timer is None:
+            self._linger_timer = loop.call_later(self.linger, self._close_batch)
+        return future
+
+    async def send_and_wait(self, topic: str, value=None, key=None, partition=None):
+        future = await self.send(topic, value=value, key=key, partition=partition)
+        return await future
+
+    async def flush(self):
+        self._close_batch()
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+    def _close_batch(self) -> None:
+        if self._linger_timer is not None:
+            self._linger_timer.cancel()
+            self._linger_timer = None
+        if not self._batch:
+            return
+
+        batch, self._batch, self._batch_bytes = self._batch, [], 0
+        task = asyncio.get_running_loop().create_task(self._acknowledge(batch))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _acknowledge(self, batch) -> None:
+        async with self._lock:
+            if self.ack_latency:
+                await asyncio.sleep(self.ack_latency)
+            for topic, value, key, partition, future in batch:
+                metadata = self.broker.append(topic, value, key, partition)
+                if not future.done():
+                    future.set_result(metadata)
+
+
+class MemoryConsumer:
+    """Implements the part of AIOKafkaConsumer used by the app's consumers,
+    on top of a MemoryBroker.
+
+    Every partition of the given topics is assigned to this consumer. Its
+    position starts at the group's committed offset, or per
+    `auto_offset_reset` ("earliest" or "latest") when there is none. Offsets
+    are only committed explicitly.
+    """
+
+    def __init__(
+        self,
+        *topics: str,
+        broker: MemoryBroker,
+        group_id: Optional[str] = None,
+        value_deserializer: Optional[Callable] = None,
+        key_deserializer: Optional[Callable] = None,
+        auto_offset_reset: str = "earliest",
+    ):
+        self.topics = topics
+        self.broker = broker
+        self.group_id = group_id
+        self.value_deserializer = value_deserializer
+        self.key_deserializer = key_deserializer
+        self.auto_offset_reset = auto_offset_reset
+        self._positions: Dict[TopicPartition, int] = {}
+
+    async def start(self):
+        for topic in self.topics:
+            for partition in self.broker.partitions_for(topic):
+                tp = TopicPartition(topic, partition)
+                committed = await self.committed(tp)
+                if committed is not None:
+                    self._positions[tp] = committed
+                elif self.auto_offset_reset == "latest":
+                    self._positions[tp] = self.broker.end_offset(tp)
+                else:
+                    self._positions[tp] = 0
+
+    async def stop(self):
+        self._positions = {}
+
+    def assignment(self) -> Set[TopicPartition]:
+        return set(self._positions)
+
+    async def getmany(
+        self,
+        *partitions: TopicPartition,
+        timeout_ms: int = 0,
+        max_records: Optional[int] = None,
+    ) -> Dict[TopicPartition, List[ConsumerRecord]]:
+        deadline = time.monotonic() + timeout_ms / 1000
+        while True:
+            records = self._fetch(partitions or tuple(self._positions), max_records)
+            if records or time.monotonic() >= deadline:
+                return records
+            await asyncio.sleep(0.005)
+
+    async def commit(self, offsets: Optional[Dict[TopicPartition, int]] = None):
+        if self.group_id is None:
+            raise RuntimeError("Committing offsets requires a group_id")
+        for tp, offset in (offsets or self._positions).items():
+            if isinstance(offset, OffsetAndMetadata):
+                offset = offset.offset
+            self.broker.committed[(self.group_id, tp)] = offset
+
+    async def committed(self, tp: TopicPartition) -> Optional[int]:
+        return self.broker.committed.get((self.group_id, tp))
+
+    async def position(self, tp: TopicPartition) -> int:
+        return self._positions[tp]
+
+    def seek(self, tp: TopicPartition, offset: int) -> None:
+        self._positions[tp] = offset
+
+    def highwater(self, tp: TopicPartition) -> int:
+        return self.broker.end_offset(tp)
+
+    def _fetch(
+        self, partitions, max_records: Optional[int]
+    ) -> Dict[TopicPartition, List[ConsumerRecord]]:
+        budget = max_records or float("inf")
+        result: Dict[TopicPartition, List[ConsumerRecord]] = {}
+
+        for tp in sorted(partitions):
+            if budget <= 0:
+                break
+            records = self.broker.fetch(
+                tp, self._positions[tp], int(min(budget, 1 << 30))
+            )
+            if not records:
+                continue
+
+            self._positions[tp] = records[-1].offset + 1
+            budget -= len(records)
+            result[tp] = [self._deserialize(record) for record in records]
+        return result
+
+    def _deserialize(self, record: ConsumerRecord) -> ConsumerRecord:
+        key, value = record.key, record.value
+        if self.key_deserializer and key is not None:
+            key = self.key_deserializer(key)
+        if self.value_deserializer and value is not None:
+            value = self.value_deserializer(value)
+        return ConsumerRecord(
+            topic=record.topic,
+            partition=record.partition,
+            offset=record.offset,
+            timestamp=record.timestamp,
+            timestamp_type=record.timestamp_type,
+            key=key,
+            value=value,
+            checksum=record.checksum,
+            serialized_key_size=record.serialized_key_size,
+            serialized_value_size=record.serialized_value_size,
+            headers=record.headers,
+        )
@@ -0,0 +1,169 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+from typing import Iterator, List, Optional
+
+from core.logger import logger
+
+# Every record is framed as <length: u32><crc32: u32><payload>, little-endian
+FRAME_HEADER = struct.Struct("<II")
+SEGMENT_SUFFIX = ".seg"
+LOCK_FILE = ".lock"
+
+
+def frame(payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_segment(path: str) -> Iterator[bytes]:
+    """Yields the payloads of a segment in write order.
+
+    Reading stops at the first truncated or corrupt frame, which is what a
+    crash in the middle of an append leaves behind.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = 0
+            while offset + FRAME_HEADER.size <= size:
+                length, crc = FRAME_HEADER.unpack_from(data, offset)
+                start = offset + FRAME_HEADER.size
+                payload = data[start : start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                yield payload
+                offset = start + length
+
+            if offset < size:
+                logger.error(
+                    "Kafka spool segment has a corrupt tail",
+                    extra={"segment": path, "offset": offset, "size": size},
+                )
+
+
+class SegmentSpool:
+    """Append-only on-disk log of CRC-framed records, split into segments.
+
+    Records go to the active segment, which is rotated once it reaches
+    `segment_bytes`. Readers only see sealed segments (oldest first) and
+    delete each one once every record in it has been handled, or swap it for
+    the records still left, so the spool never rewrites data in place.
+    Writes are fsynced. Methods block and are meant to run in a worker
+    thread.
+
+    Each process gets its own spool under `directory`: open() claims the
+    first worker-N subdirectory whose lock file no other process holds
+    (flock, released when the process exits), so workers never read or
+    delete each other's segments, and a restarted worker picks up the
+    segments a dead one left behind.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int):
+        self.root = directory
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._lock_fd: Optional[int] = None
+        self._lock = threading.Lock()
+        self._active: Optional[str] = None
+        self._active_size = 0
+        self._next_sequence = 0
+        self.pending_bytes = 0
+
+    def open(self) -> None:
+        if self._lock_fd is None:
+            self._claim()
+        segments = self.segments()
+        self.pending_bytes = sum(os.path.getsize(path) for path in segments)
+        if segments:
+            last = os.path.basename(segments[-1])[: -len(SEGMENT_SUFFIX)]
+            self._next_sequence = int(last) + 1
+
+    def _claim(self) -> None:
+        slot = 0
+        while True:
+            directory = os.path.join(self.root, f"worker-{slot}")
+            os.makedirs(directory, exist_ok=True)
+            fd = os.open(os.path.join(directory, LOCK_FILE), os.O_CREAT | os.O_RDWR)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                slot += 1
+                continue
+            self.directory = directory
+            self._lock_fd = fd
+            return
+
+    def close(self) -> None:
+        """Releases this process's spool directory to the next one."""
+        with self._lock:
+            self._active = None
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    def append(self, payloads: List[bytes]) -> None:
+        data = b"".join(frame(payload) for payload in payloads)
+
+        with self._lock:
+            if self._active is None:
+                self._active = os.path.join(
+                    self.directory, f"{self._next_sequence:020d}{SEGMENT_SUFFIX}"
+                )
+                self._next_sequence += 1
+                self._active_size = 0
+
+            with open(self._active, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._active_size += len(data)
+            self.pending_bytes += len(data)
+            if self._active_size >= self.segment_bytes:
+                self._active = None
+
+    def seal(self) -> None:
+        """Closes the active segment so the next read picks it up."""
+        with self._lock:
+            self._active = None
+
+    def segments(self) -> List[str]:
+        """Sealed segments, oldest first."""
+        with self._lock:
+            active = self._active
+        try:
+            names = sorted(
+                name
+                for name in os.listdir(self.directory)
+                if name.endswith(SEGMENT_SUFFIX)
+            )
+        except FileNotFoundError:
+            return []
+        paths = [os.path.join(self.directory, name) for name in names]
+        return [path for path in paths if path != active]
+
+    def remove(self, path: str) -> None:
+        size = os.path.getsize(path)
+        os.remove(path)
+        with self._lock:
+            self.pending_bytes -= size
+
+    def replace(self, path: str, payloads: List[bytes]) -> None:
+        """Swaps a sealed segment for `payloads`, keeping its place as the
+        oldest. The new segment is written aside and renamed over the old."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(frame(payload) for payload in payloads))
+            f.flush()
+            os.fsync(f.fileno())
+        size = os.path.getsize(path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.pending_bytes += os.path.getsize(path) - size
@@ -1,5 +1,10 @@
+import atexit
 import logging
+import orjson
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from logtail import LogtailHandler
 from core.config import env
 
@@ -7,7 +12,36 @@ token = env.better_stack_token
 
 logger = logging.getLogger()
 
-formatter = logging.Formatter("%(asctime)s -  %(levelname)s - %(message)s")
+# Attributes every LogRecord has; anything else on a record came from `extra`
+RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()
+    | {"message", "asctime", "taskName"}
+)
+
+
+class JSONFormatter(logging.Formatter):
+    """Renders a record as one orjson-encoded line with its `extra` fields at
+    the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        return orjson.dumps(entry, default=str).decode()
+
+
+formatter = JSONFormatter()
 
 stream_handler = logging.StreamHandler(sys.stdout)
 file_handler = logging.FileHandler("app.log")
@@ -16,6 +50,32 @@ better_stack_handler = LogtailHandler(source_token=token)
 stream_handler.setFormatter(formatter)
 file_handler.setFormatter(formatter)
 
-logger.handlers = [stream_handler, file_handler, better_stack_handler]
+
+class DeferredQueueHandler(QueueHandler):
+    """Enqueues the record untouched.
+
+    The stock QueueHandler formats the message in `prepare`, i.e. on the event
+    loop; here formatting is left to the listener thread like all other I/O.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+# Formatting, stdout/file writes and Better Stack shipping all run on the
+# listener's thread; the event loop only pays for a queue put
+log_listener = QueueListener(
+    log_queue,
+    stream_handler,
+    file_handler,
+    better_stack_handler,
+    respect_handler_level=True,
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger.handlers = [DeferredQueueHandler(log_queue)]
 
 logger.setLevel(logging.INFO)
@@ -1,27 +1,142 @@
+import random
 import time
-from fastapi import Request
+from typing import List, Optional, Tuple
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from core.config import env
 from core.logger import logger
+from core.request_timing import request_timer, route_template
 
+SampleRule = Tuple[str, str, str, float]
 
-async def log_middleware(request: Request, call_next):
-    start_time = time.time()
 
-    response = await call_next(request)
+def parse_sample_rules(rules: str) -> List[SampleRule]:
+    """Parses "METHOD:ROUTE:STATUS=RATE,..." into rule tuples.
 
-    end_time = time.time()
-    duration = end_time - start_time
+    Each part may be "*"; STATUS is an exact code ("404") or a class ("2xx").
+    """
+    parsed = []
+    for rule in filter(None, (part.strip() for part in rules.split(","))):
+        match, _, rate = rule.rpartition("=")
+        method, route, status_code = match.split(":")
+        parsed.append((method.upper(), route, status_code.lower(), float(rate)))
+    return parsed
 
-    log_dict = {
-        "url": request.url.path,
-        "method": request.method,
-        "processing_time": duration,
-        "status_code": response.status_code,
-        "client_ip": request.client.host,
-        "user_agent": request.headers.get("user-agent"),
-        "referer": request.headers.get("referer"),
-        "request_id": request.headers.get("x-request-id"),
-    }
-    logger.info(log_dict, extra=log_dict)
 
-    return response
+class AccessLogSampler:
+    """Decides which access log lines are written.
+
+    Errors (status >= 400) and requests slower than `slow_seconds` are always
+    kept. Anything else is kept with the rate of the first matching rule, or
+    always when no rule matches. A rule's ROUTE may be the route template or
+    the concrete path.
+    """
+
+    def __init__(self, rules: List[SampleRule], slow_seconds: float):
+        self.rules = rules
+        self.slow_seconds = slow_seconds
+
+    def sample_rate(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        duration: float,
+        path: Optional[str] = None,
+    ) -> float:
+        if status_code >= 400 or duration >= self.slow_seconds:
+            return 1.0
+
+        status_text = str(status_code)
+        for rule_method, rule_route, rule_status, rate in self.rules:
+            if rule_method not in ("*", method):
+                continue
+            if rule_route not in ("*", route, path):
+                continue
+            if rule_status != "*" and rule_status not in (
+                status_text,
+                f"{status_text[0]}xx",
+            ):
+                continue
+            return rate
+
+        return 1.0
+
+    def keep(self, rate: float) -> bool:
+        return rate >= 1.0 or random.random() < rate
+
+
+access_log_sampler = AccessLogSampler(
+    rules=parse_sample_rules(env.access_log_sample_rules),
+    slow_seconds=env.access_log_slow_request_seconds,
+)
+
+
+class LoggingMiddleware:
+    """Access log as a pure ASGI middleware.
+
+    Unlike BaseHTTPMiddleware it does not wrap the response body in extra
+    tasks and memory streams; it only watches `http.response.start` for the
+    status code and logs once the response has been sent, timed up to the
+    last body message.
+    """
+
+    def __init__(self, app: ASGIApp, sampler: AccessLogSampler = access_log_sampler):
+        self.app = app
+        self.sampler = sampler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        sent_at: Optional[float] = None
+
+        async def send_with_status(message: Message):
+            nonlocal status_code, sent_at
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                sent_at = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Background tasks run after the body is sent; they are not
+            # part of the request's processing time
+            duration = (sent_at or time.perf_counter()) - start_time
+            path = scope["path"]
+            route = route_template(scope) or path
+
+            rate = self.sampler.sample_rate(
+                scope["method"], route, status_code, duration, path
+            )
+
+            if self.sampler.keep(rate):
+                headers = Headers(scope=scope)
+                client = scope.get("client")
+
+                log_dict = {
+                    "url": path,
+                    "route": route,
+                    "method": scope["method"],
+                    "processing_time": duration,
+                    "status_code": status_code,
+                    "client_ip": client[0] if client else None,
+                    "user_agent": headers.get("user-agent"),
+                    "referer": headers.get("referer"),
+                    "request_id": headers.get("x-request-id"),
+                    "sample_rate": rate,
+                }
+
+                timer = request_timer.get()
+                if timer is not None:
+                    log_dict.update(timer.log_fields())
+
+                logger.info("HTTP request", extra=log_dict)
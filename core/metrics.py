@@ -0,0 +1,461 @@
+import os
+import asyncio
+import socket
+import time
+import orjson
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import env
+from core.logger import logger
+from core.request_timing import route_template
+
+Labels = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+SAMPLES_KEY = "metrics:samples"
+GAUGES_KEY_PREFIX = "metrics:gauges:"
+
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter keyed by label values.
+
+    All updates happen on the event loop thread, so `inc` is a plain dict
+    update with no lock.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def samples(self) -> Dict[Tuple[Labels, str], float]:
+        return {(labels, ""): value for labels, value in self.values.items()}
+
+    def render(self, samples: Dict[Tuple[Labels, str], float]) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for (labels, _), value in sorted(samples.items())
+        ]
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by label values.
+
+    Each series holds one count per bucket (not cumulative) plus the +Inf
+    bucket and the running sum, so `observe` is a bisect and two additions.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.values: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0.0] * (len(self.buckets) + 2)
+
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Dict[Tuple[Labels, str], float]:
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf", "sum"]
+        return {
+            (labels, bound): value
+            for labels, series in self.values.items()
+            for bound, value in zip(bounds, series)
+        }
+
+    def render(self, samples: Dict[Tuple[Labels, str], float]) -> List[str]:
+        series: Dict[Labels, Dict[str, float]] = {}
+        for (labels, bound), value in samples.items():
+            series.setdefault(labels, {})[bound] = value
+
+        lines = []
+        for labels, values in sorted(series.items()):
+            cumulative = 0.0
+            for bound in [str(bound) for bound in self.buckets] + ["+Inf"]:
+                cumulative += values.get(bound, 0.0)
+                bucket_labels = _format_labels(
+                    self.labelnames + ("le",), labels + (bound,)
+                )
+                lines.append(
+                    f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}"
+                )
+
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(
+                f"{self.name}_sum{label_text} {_format_value(values.get('sum', 0.0))}"
+            )
+            lines.append(f"{self.name}_count{label_text} {_format_value(cumulative)}")
+        return lines
+
+
+class Gauge:
+    """Point-in-time value, reported per worker.
+
+    Either set directly (`set`, `inc`, `dec`) or read from `collect` whenever
+    metrics are flushed or scraped.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Dict[Labels, float]]] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.values: Dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) - amount
+
+    def samples(self) -> Dict[Tuple[Labels, str], float]:
+        values = dict(self.values)
+        if self.collect:
+            try:
+                values.update(self.collect())
+            except Exception as e:
+                logger.warning(
+                    "Gauge collection failed",
+                    extra={"metric": self.name, "error_message": str(e)},
+                )
+        return {(labels, ""): value for labels, value in values.items()}
+
+    def render(self, samples: Dict[Tuple[Labels, str], float]) -> List[str]:
+        names = self.labelnames + ("worker",)
+        return [
+            f"{self.name}{_format_labels(names, labels)} {_format_value(value)}"
+            for (labels, _), value in sorted(samples.items())
+        ]
+
+
+class MetricsRegistry:
+    """Process-local metrics, aggregated across workers through Redis.
+
+    Every `flush_interval` seconds each worker adds the counter and histogram
+    increments since its previous flush to one shared Redis hash with
+    HINCRBYFLOAT, and replaces its own gauge hash (which expires if the worker
+    dies). A scrape of any worker therefore sees the totals of all of them.
+    If Redis is unavailable the scrape falls back to this worker's own values.
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self.metrics: Dict[str, Any] = {}
+        self.flushed: Dict[str, Dict[Tuple[Labels, str], float]] = {}
+        self._task: asyncio.Task | None = None
+        self._redis: Optional[Redis] = None
+        self._flush_lock = asyncio.Lock()
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames=(), collect=None
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, collect))
+
+    @staticmethod
+    def _field(name: str, labels: Labels, suffix: str) -> bytes:
+        return orjson.dumps([name, labels, suffix])
+
+    async def flush(self, redis: Redis) -> None:
+        # A scrape and the periodic flush must not both send the same deltas
+        async with self._flush_lock:
+            await self._flush(redis)
+
+    async def _flush(self, redis: Redis) -> None:
+        # Snapshot first; updates made while the pipeline is in flight land in
+        # the next flush
+        deltas: Dict[bytes, float] = {}
+        snapshots = {}
+        gauges: Dict[bytes, float] = {}
+
+        for name, metric in self.metrics.items():
+            samples = metric.samples()
+            if metric.kind == "gauge":
+                for (labels, suffix), value in samples.items():
+                    gauges[self._field(name, labels + (WORKER_ID,), suffix)] = value
+                continue
+
+            flushed = self.flushed.get(name, {})
+            for key, value in samples.items():
+                delta = value - flushed.get(key, 0.0)
+                if delta:
+                    deltas[self._field(name, *key)] = delta
+            snapshots[name] = samples
+
+        gauges_key = f"{GAUGES_KEY_PREFIX}{WORKER_ID}"
+        pipe = redis.pipeline(transaction=True)
+        for field, delta in deltas.items():
+            pipe.hincrbyfloat(SAMPLES_KEY, field, delta)
+        pipe.delete(gauges_key)
+        if gauges:
+            pipe.hset(gauges_key, mapping=gauges)
+            pipe.expire(gauges_key, max(int(self.flush_interval * 3), 1))
+        await pipe.execute()
+
+        self.flushed.update(snapshots)
+
+    async def aggregate(self, redis: Redis) -> Dict[str, Dict]:
+        fields = dict(await redis.hgetall(SAMPLES_KEY))
+        async for key in redis.scan_iter(match=f"{GAUGES_KEY_PREFIX}*", count=100):
+            fields.update(await redis.hgetall(key))
+
+        aggregated: Dict[str, Dict[Tuple[Labels, str], float]] = {}
+        for field, value in fields.items():
+            name, labels, suffix = orjson.loads(field)
+            aggregated.setdefault(name, {})[(tuple(labels), suffix)] = float(value)
+        return aggregated
+
+    def local(self) -> Dict[str, Dict]:
+        aggregated = {}
+        for name, metric in self.metrics.items():
+            samples = metric.samples()
+            if metric.kind == "gauge":
+                samples = {
+                    (labels + (WORKER_ID,), suffix): value
+                    for (labels, suffix), value in samples.items()
+                }
+            aggregated[name] = samples
+        return aggregated
+
+    def render(self, aggregated: Dict[str, Dict]) -> str:
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render(aggregated.get(name, {})))
+        return "\n".join(lines) + "\n"
+
+    async def expose(self) -> str:
+        """Prometheus text exposition of every worker's metrics."""
+        if self._redis is not None:
+            try:
+                await self.flush(self._redis)
+                return self.render(await self.aggregate(self._redis))
+            except RedisError as e:
+                logger.warning(
+                    "Metrics served from this worker only",
+                    extra={"error_type": type(e).__name__, "error_message": str(e)},
+                )
+
+        return self.render(self.local())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush(self._redis)
+            except RedisError as e:
+                logger.warning(
+                    "Metrics flush failed",
+                    extra={"error_type": type(e).__name__, "error_message": str(e)},
+                )
+
+    def start(self, redis: Redis):
+        self._redis = redis
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._redis is not None:
+            try:
+                await self.flush(self._redis)
+            except RedisError:
+                logger.warning("Final metrics flush failed")
+
+
+metrics = MetricsRegistry(flush_interval=env.metrics_flush_interval_seconds)
+
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time to send the full response, by route template.",
+    ("method", "route", "status"),
+)
+background_tasks_pending = metrics.gauge(
+    "background_tasks_pending",
+    "Requests whose response is sent but whose BackgroundTasks are still running.",
+)
+background_tasks_pending.set(0)
+background_tasks_duration = metrics.histogram(
+    "background_tasks_duration_seconds",
+    "Time spent running a request's BackgroundTasks after the response.",
+    ("route",),
+)
+cache_requests = metrics.counter(
+    "cache_requests_total",
+    "Cache lookups by cache and tier that answered (local, redis or miss).",
+    ("cache", "result"),
+)
+db_pool_wait = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection.",
+)
+redis_command_duration = metrics.histogram(
+    "redis_command_duration_seconds",
+    "Round trip of a Redis command or pipeline.",
+    ("command",),
+)
+kafka_send_duration = metrics.histogram(
+    "kafka_send_duration_seconds",
+    "Time until Kafka acknowledged a message.",
+    ("topic", "outcome"),
+)
+
+kafka_messages = metrics.counter(
+    "kafka_messages_total",
+    "Kafka messages by outcome (delivered, failed, dropped, spooled, replayed).",
+    ("outcome",),
+)
+
+audit_consumer_lag = metrics.gauge(
+    "audit_consumer_lag",
+    "Audit events on the topic not yet loaded into audit_logs, per partition.",
+    ("topic", "partition"),
+)
+audit_consumer_events = metrics.counter(
+    "audit_consumer_events_total",
+    "Audit events consumed, by outcome (loaded, duplicate, invalid).",
+    ("outcome",),
+)
+audit_consumer_batch_duration = metrics.histogram(
+    "audit_consumer_batch_seconds",
+    "Time to load and commit one batch of audit events.",
+)
+
+
+class MetricsMiddleware:
+    """Records request latency per route template and BackgroundTasks backlog.
+
+    The response is complete once the final body chunk is sent; anything the
+    app does after that is its BackgroundTasks.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        sent_at: Optional[float] = None
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code, sent_at
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                sent_at = time.perf_counter()
+                http_request_duration.observe(
+                    sent_at - start_time,
+                    scope["method"],
+                    route_template(scope) or "unmatched",
+                    str(status_code),
+                )
+                background_tasks_pending.inc()
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if sent_at is None:
+                http_request_duration.observe(
+                    time.perf_counter() - start_time,
+                    scope["method"],
+                    route_template(scope) or "unmatched",
+                    str(status_code),
+                )
+            else:
+                background_tasks_pending.dec()
+                background_tasks_duration.observe(
+                    time.perf_counter() - sent_at, route_template(scope) or "unmatched"
+                )
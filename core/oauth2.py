@@ -1,11 +1,13 @@
 import orjson
 import uuid
-from jose import JWTError, jwt
+from jose import JWTError
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, status, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.config import env
+from core.jwt_keys import key_ring
+from core.token_cache import token_cache
 from database.models.users import Users
 from database.models.organization_member import OrganizationMember
 from api.v2.schemas.authorization_schemas import TokenData
@@ -14,13 +16,15 @@ from typing import Tuple
 from sqlalchemy import select
 from authlib.integrations.starlette_client import OAuth
 from core.redis.redis_config import redis_client as redis
+from core.redis.local_cache import local_cache
+from core.metrics import cache_requests
+from core.request_timing import timed
+from core.redis.versioned_cache import resolve_versions
 from core.redis.schemas import UserSchema, OrganizationMemberSchema
 
 
 bearer_scheme = HTTPBearer()
 
-SECRET_KEY = env.secret_key
-ALGORITHM = env.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = env.access_token_expire_minutes
 REFRESH_TOKEN_EXPIRE_DAYS = env.refresh_token_expire_days
 
@@ -47,7 +51,7 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     to_encode["jti"] = str(uuid.uuid4())
 
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = key_ring.encode(to_encode)
 
     return encoded_jwt
 
@@ -59,27 +63,36 @@ def create_refresh_token(data: dict):
     to_encode.update({"exp": expire})
     to_encode["jti"] = str(uuid.uuid4())
 
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = key_ring.encode(to_encode)
 
     return encoded_jwt
 
 
+@timed("jwt")
 def verify_token(token: str, credentials_exception):
 
+    digest = token_cache.digest(token)
+    cached_token_data = token_cache.get(digest)
+    if cached_token_data:
+        return cached_token_data
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = key_ring.decode(token)
         user_id: str = payload.get("user_id")
         org_id = payload.get("org_id")
         token_type = payload.get("token_type")
         jti = payload.get("jti")
+        exp = payload.get("exp")
         if user_id is None:
             raise credentials_exception
         token_data = TokenData(
-            user_id=user_id, org_id=org_id, token_type=token_type, jti=jti
+            user_id=user_id, org_id=org_id, token_type=token_type, jti=jti, exp=exp
         )
     except JWTError:
         raise credentials_exception
 
+    token_cache.put(digest, token_data)
+
     return token_data
 
 
@@ -95,17 +108,28 @@ def get_token_payload(
     return verify_token(token, credentials_exception)
 
 
+@timed("auth")
 async def get_current_user(
     payload=Depends(get_token_payload), db: AsyncSession = Depends(get_db)
 ):
     cache_key = f"user_id:{payload.user_id}"
+
+    local_user = local_cache.get(cache_key)
+    if local_user:
+        cache_requests.inc("get_current_user", "local")
+        return local_user
+
     cached_user = await redis.get(cache_key)
 
     if cached_user:
         cached_data = orjson.loads(cached_user)
-        return UserSchema.model_validate(cached_data)
+        user_data = UserSchema.model_validate(cached_data)
+        local_cache.set(cache_key, user_data)
+        cache_requests.inc("get_current_user", "redis")
+        return user_data
 
     else:
+        cache_requests.inc("get_current_user", "miss")
         user = (
             (
                 await db.execute(
@@ -127,28 +151,36 @@ async def get_current_user(
         user_data = UserSchema.model_validate(user)
 
         await redis.set(cache_key, orjson.dumps(user_data.model_dump()), ex=60 * 5)
+        local_cache.set(cache_key, user_data)
 
         return user_data
 
 
+@timed("auth")
 async def get_membership(
     payload=Depends(get_token_payload), db: AsyncSession = Depends(get_db)
 ):
 
-    version_key = f"org_id:{payload.org_id}:version"
-    version = await redis.get(version_key)
-    if not version:
-        version = 1
-        await redis.set(version_key, version)
+    (version,) = await resolve_versions([f"org_id:{payload.org_id}:version"])
 
     cache_key = f"org_id:{payload.org_id}:v{version}:user_id:{payload.user_id}"
+
+    local_member = local_cache.get(cache_key)
+    if local_member:
+        cache_requests.inc("get_membership", "local")
+        return local_member
+
     cached_member = await redis.get(cache_key)
 
     if cached_member:
         cached_data = orjson.loads(cached_member)
-        return OrganizationMemberSchema.model_validate(cached_data)
+        membership_data = OrganizationMemberSchema.model_validate(cached_data)
+        local_cache.set(cache_key, membership_data, ttl=60 * 5)
+        cache_requests.inc("get_membership", "redis")
+        return membership_data
 
     else:
+        cache_requests.inc("get_membership", "miss")
         org_id = payload.org_id
 
         if not org_id:
@@ -182,6 +214,7 @@ async def get_membership(
         await redis.set(
             cache_key, orjson.dumps(membership_data.model_dump()), ex=60 * 5
         )
+        local_cache.set(cache_key, membership_data, ttl=60 * 5)
 
         return membership_data
 
@@ -0,0 +1,294 @@
+import asyncio
+import time
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple, Union
+from uuid import UUID
+from aiokafka.errors import KafkaConnectionError
+from sqlalchemy import delete, exists, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from core.audit_events import audit_event, audit_key, audit_row
+from core.config import env
+from core.kafka.kafka_producer import TOPIC, kafka_producer
+from core.logger import logger
+from core.metrics import metrics
+from database.db.session import AsyncSessionLocal
+from database.models.audit_log import AuditLog
+from database.models.outbox_event import OutboxEvent
+
+AUDIT_SINK = env.audit_sink
+# pg_try_advisory_lock key, so only one worker relays the outbox at a time
+RELAY_LOCK_KEY = 0x6F75_7462  # "outb"
+
+
+def add_outbox_event(db: AsyncSession, **fields: Any) -> Union[OutboxEvent, AuditLog]:
+    """Stages an audit event in the caller's session, so it is committed (or
+    rolled back) together with the change it describes. Takes the same
+    arguments as `audit_logs`. With AUDIT_SINK=database the audit row itself
+    is staged, so it never waits on Kafka; otherwise an outbox event is, for
+    the relay to publish."""
+    payload = audit_event(**fields)
+    if AUDIT_SINK == "database":
+        row = AuditLog(**audit_row(payload))
+        db.add(row)
+        return row
+
+    key = audit_key(payload["organization_id"])
+    event = OutboxEvent(
+        event_id=UUID(payload["event_id"]),
+        topic=TOPIC,
+        key=key.decode() if key else None,
+        payload=payload,
+        attempts=0,
+    )
+    db.add(event)
+    return event
+
+
+class OutboxRelay:
+    """Publishes committed outbox events to Kafka.
+
+    Only one worker relays at a time (advisory lock on Postgres). Each round
+    reads up to `batch_size` of the oldest due events and ends that
+    transaction before sending, so no row lock or transaction stays open while
+    the acks are awaited; the outcome is written in a second transaction.
+    Acknowledged events are deleted from the outbox, and the audit consumer
+    loads them into audit_logs.
+
+    Events that share a key are published in order: a batch is sent in waves
+    of at most one event per key, a key stops at its first failure, and later
+    events of a key wait while an earlier one is backing off. A failed event
+    is retried `retry_backoff` seconds later, doubling with every attempt;
+    after `max_attempts` it is dead-lettered, which leaves it in the outbox
+    for inspection without holding up its key. Only errors of individual
+    messages count as attempts: while the broker is unreachable the relay
+    skips its rounds, and a round that loses the connection stops there and
+    leaves the unsent events as they were. Delivery is at-least-once, so
+    consumers dedupe on event_id. The relay polls every `poll_interval`
+    seconds while the outbox is empty.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        retry_backoff: float,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._task: asyncio.Task | None = None
+
+        self.published = 0
+        self.failed = 0
+        self.dead_lettered = 0
+        self.batches = 0
+        self.last_batch_seconds = 0.0
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Outbox relay started")
+
+    async def stop(self):
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Outbox relay stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "failed": self.failed,
+            "dead_lettered": self.dead_lettered,
+            "batches": self.batches,
+            "last_batch_seconds": self.last_batch_seconds,
+        }
+
+    async def relay_once(self) -> int:
+        """Relays one batch; returns how many events were due."""
+        if not kafka_producer.connected.is_set():
+            return 0
+
+        async with AsyncSessionLocal() as db:
+            if db.bind.dialect.name != "postgresql":
+                return await self._relay(db)
+
+            async with db.bind.connect() as conn:
+                locked = (
+                    await conn.execute(
+                        text("SELECT pg_try_advisory_lock(:key)"),
+                        {"key": RELAY_LOCK_KEY},
+                    )
+                ).scalar()
+                await conn.commit()
+                if not locked:
+                    return 0
+
+                try:
+                    return await self._relay(db)
+                finally:
+                    await conn.execute(
+                        text("SELECT pg_advisory_unlock(:key)"),
+                        {"key": RELAY_LOCK_KEY},
+                    )
+                    await conn.commit()
+
+    async def _relay(self, db: AsyncSession) -> int:
+        start_time = time.perf_counter()
+        now = datetime.now(timezone.utc)
+
+        earlier = aliased(OutboxEvent)
+        backing_off = exists().where(
+            earlier.key == OutboxEvent.key,
+            earlier.id < OutboxEvent.id,
+            earlier.attempts < self.max_attempts,
+            earlier.next_attempt_at > now,
+        )
+        events: List[OutboxEvent] = (
+            (
+                await db.execute(
+                    select(OutboxEvent)
+                    .where(
+                        OutboxEvent.attempts < self.max_attempts,
+                        or_(
+                            OutboxEvent.next_attempt_at.is_(None),
+                            OutboxEvent.next_attempt_at <= now,
+                        ),
+                        ~backing_off,
+                    )
+                    .order_by(OutboxEvent.id)
+                    .limit(self.batch_size)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        await db.commit()
+        if not events:
+            return 0
+
+        # Events without a key have no order to keep, so each is its own queue
+        queues: Dict[Any, List[OutboxEvent]] = {}
+        for event in events:
+            queues.setdefault(event.key or event.id, []).append(event)
+
+        published: List[OutboxEvent] = []
+        failed: List[Tuple[OutboxEvent, BaseException]] = []
+        while queues:
+            wave = {key: queue.pop(0) for key, queue in queues.items()}
+            errors = await kafka_producer.send_batch(
+                [
+                    (
+                        event.topic,
+                        event.payload,
+                        event.key.encode() if event.key else None,
+                    )
+                    for event in wave.values()
+                ]
+            )
+            disconnected = False
+            for (key, event), error in zip(wave.items(), errors):
+                if error is None:
+                    published.append(event)
+                elif isinstance(error, KafkaConnectionError):
+                    disconnected = True
+                else:
+                    failed.append((event, error))
+                    del queues[key]
+            if disconnected:
+                logger.warning(
+                    "Outbox relay lost the Kafka connection, round stopped",
+                    extra={"published": len(published), "batch_size": len(events)},
+                )
+                break
+            queues = {key: queue for key, queue in queues.items() if queue}
+
+        failed_at = datetime.now(timezone.utc)
+        dead = [
+            str(event.event_id)
+            for event, _ in failed
+            if event.attempts + 1 >= self.max_attempts
+        ]
+        if published:
+            await db.execute(
+                delete(OutboxEvent).where(
+                    OutboxEvent.id.in_([event.id for event in published])
+                )
+            )
+        if failed:
+            await db.execute(
+                update(OutboxEvent),
+                [
+                    {
+                        "id": event.id,
+                        "attempts": event.attempts + 1,
+                        "last_error": repr(error),
+                        "next_attempt_at": failed_at
+                        + timedelta(seconds=self.retry_backoff * 2**event.attempts),
+                    }
+                    for event, error in failed
+                ],
+            )
+        await db.commit()
+
+        if failed:
+            logger.error(
+                "Outbox events failed to publish",
+                extra={
+                    "failed": len(failed),
+                    "held_back": len(events) - len(published) - len(failed),
+                    "batch_size": len(events),
+                },
+            )
+            if dead:
+                logger.error(
+                    "Outbox events dead-lettered",
+                    extra={"event_ids": dead, "max_attempts": self.max_attempts},
+                )
+            self.dead_lettered += len(dead)
+
+        self.published += len(published)
+        self.failed += len(failed)
+        self.batches += 1
+        self.last_batch_seconds = time.perf_counter() - start_time
+        return len(events)
+
+    async def _run(self):
+        while True:
+            try:
+                relayed = await self.relay_once()
+            except Exception as e:
+                logger.error(
+                    "Outbox relay round failed",
+                    extra={"error_type": type(e).__name__, "error_message": str(e)},
+                )
+                relayed = 0
+
+            if relayed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+
+outbox_relay = OutboxRelay(
+    batch_size=env.outbox_batch_size,
+    poll_interval=env.outbox_poll_interval_seconds,
+    max_attempts=env.outbox_max_attempts,
+    retry_backoff=env.outbox_retry_backoff_seconds,
+)
+
+metrics.gauge(
+    "outbox_relay",
+    "Outbox relay lifetime counters.",
+    ("stat",),
+    collect=lambda: {(stat,): value for stat, value in outbox_relay.stats().items()},
+)
@@ -0,0 +1,64 @@
+import base64
+import orjson
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+
+
+def _encode(position: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(position)).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Optional[Dict[str, Any]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = orjson.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        # Covers bad base64 (binascii.Error), non-ASCII input and bad JSON
+        return None
+    return position if isinstance(position, dict) else None
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+    )
+
+
+def encode_cursor(last_id: int) -> str:
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Returns the id the next page starts after, or None for the first page."""
+    if cursor is None:
+        return None
+
+    last_id = (_decode(cursor) or {}).get("id")
+    # bool is an int subclass, but never a valid id
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise _invalid_cursor()
+
+    return last_id
+
+
+def encode_time_cursor(timestamp: datetime, last_id: UUID) -> str:
+    return _encode({"ts": timestamp, "id": last_id})
+
+
+def decode_time_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+    """Returns the (timestamp, id) the next page starts after, for lists
+    ordered newest first, or None for the first page."""
+    if cursor is None:
+        return None
+
+    position = _decode(cursor) or {}
+    try:
+        timestamp = datetime.fromisoformat(position["ts"])
+        last_id = UUID(position["id"])
+    except (KeyError, TypeError, ValueError):
+        raise _invalid_cursor()
+
+    return timestamp, last_id
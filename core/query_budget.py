@@ -0,0 +1,137 @@
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import env
+from core.logger import logger
+from core.query_stats import fingerprint
+from core.request_timing import RequestTimer, request_timer, route_template
+
+QUERY_BUDGET_MODE = env.query_budget_mode
+N_PLUS_ONE_THRESHOLD = env.n_plus_one_threshold
+
+# Filled in "enforce" mode; the test suite fails any test that leaves entries.
+# Bounded, so a long-running process in enforce mode keeps only the latest
+MAX_BUDGET_VIOLATIONS = 1000
+budget_violations: Deque[Dict[str, Any]] = deque(maxlen=MAX_BUDGET_VIOLATIONS)
+
+
+class QueryBudget:
+    __slots__ = ("db", "redis")
+
+    def __init__(self, db: int, redis: int):
+        self.db = db
+        self.redis = redis
+
+
+def query_budget(db: int, redis: int):
+    """Declares the most DB and Redis round trips an endpoint may make before
+    its response is sent, i.e. with cold local and Redis caches and counting
+    the rate limiter's Redis call. Place it below the route decorator:
+
+        @router.get("/")
+        @query_budget(db=2, redis=3)
+        async def list_things(...): ...
+    """
+
+    def decorator(endpoint):
+        endpoint.__query_budget__ = QueryBudget(db=db, redis=redis)
+        return endpoint
+
+    return decorator
+
+
+def count_statement(statement: str) -> None:
+    """Counts executions per fingerprint for N+1 detection; a no-op unless
+    QueryBudgetMiddleware is tracking the current request."""
+    timer = request_timer.get()
+    if timer is not None and timer.statements is not None:
+        key = fingerprint(statement)
+        timer.statements[key] = timer.statements.get(key, 0) + 1
+
+
+class QueryBudgetMiddleware:
+    """Checks each request against its endpoint's `query_budget` and flags
+    statements repeated `n_plus_one_threshold` times or more (N+1 patterns).
+
+    Only work done before the response is complete counts; BackgroundTasks
+    are excluded. With `mode="warn"` violations are logged; with
+    `mode="enforce"` they are also collected in `budget_violations` (the
+    latest `MAX_BUDGET_VIOLATIONS`).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        mode: str = QUERY_BUDGET_MODE,
+        n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+    ):
+        self.app = app
+        self.mode = mode
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.mode == "off":
+            await self.app(scope, receive, send)
+            return
+
+        timer = request_timer.get()
+        token = None
+        if timer is None:
+            timer = RequestTimer()
+            token = request_timer.set(timer)
+        timer.statements = {}
+
+        checked = False
+
+        async def send_and_check(message: Message):
+            nonlocal checked
+            await send(message)
+            if (
+                not checked
+                and message["type"] == "http.response.body"
+                and not message.get("more_body", False)
+            ):
+                checked = True
+                self.check(scope, timer)
+
+        try:
+            await self.app(scope, receive, send_and_check)
+        finally:
+            if not checked:
+                self.check(scope, timer)
+            if token is not None:
+                request_timer.reset(token)
+
+    def check(self, scope: Scope, timer: RequestTimer) -> None:
+        route = route_template(scope) or scope["path"]
+        request = f"{scope['method']} {route}"
+        db_calls = timer.counts.get("db", 0)
+        redis_calls = timer.counts.get("redis", 0)
+
+        budget: Optional[QueryBudget] = getattr(
+            scope.get("endpoint"), "__query_budget__", None
+        )
+        if budget and (db_calls > budget.db or redis_calls > budget.redis):
+            self.report(
+                "Query budget exceeded",
+                {
+                    "request": request,
+                    "db_calls": db_calls,
+                    "db_budget": budget.db,
+                    "redis_calls": redis_calls,
+                    "redis_budget": budget.redis,
+                },
+            )
+
+        for statement, count in timer.statements.items():
+            if count >= self.n_plus_one_threshold:
+                self.report(
+                    "Possible N+1 query",
+                    {"request": request, "fingerprint": statement, "count": count},
+                )
+
+    def report(self, message: str, details: Dict[str, Any]) -> None:
+        logger.warning(message, extra=details)
+        if self.mode == "enforce":
+            budget_violations.append({"message": message, **details})
@@ -0,0 +1,131 @@
+import re
+
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+
+from core.config import env
+from core.logger import logger
+from core.request_timing import current_route
+
+SLOW_QUERY_THRESHOLD = env.slow_query_threshold_ms / 1000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(
+    r"\bVALUES\s*\(([^()]*)\)(?:\s*,\s*\([^()]*\))+", re.IGNORECASE
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Normalizes SQL so statements differing only in literals, bind styles,
+    IN-list length or multi-row VALUES share one fingerprint."""
+    normalized = _STRING.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?+)", normalized)
+    normalized = _VALUES_LIST.sub(r"VALUES (\1)+", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class FingerprintStats:
+    __slots__ = ("count", "total_time", "max_time", "rows", "recent")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+
+class QueryStats:
+    """Rolling per-fingerprint statement statistics.
+
+    Count, total time, max and rows are lifetime totals; p50/p99 come from the
+    last `window` executions. At most `max_fingerprints` are tracked, least
+    recently seen first out. Statements slower than `slow_threshold` seconds
+    are logged with the route that issued them.
+    """
+
+    def __init__(self, max_fingerprints: int, window: int, slow_threshold: float):
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self.slow_threshold = slow_threshold
+        self.stats: OrderedDict[str, FingerprintStats] = OrderedDict()
+
+    def observe(self, statement: str, duration: float, rows: Optional[int]) -> None:
+        key = fingerprint(statement)
+
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = FingerprintStats(self.window)
+            if len(self.stats) > self.max_fingerprints:
+                self.stats.popitem(last=False)
+        else:
+            self.stats.move_to_end(key)
+
+        stats.count += 1
+        stats.total_time += duration
+        stats.max_time = max(stats.max_time, duration)
+        stats.recent.append(duration)
+        if rows is not None and rows >= 0:
+            stats.rows += rows
+
+        if duration >= self.slow_threshold:
+            logger.warning(
+                "Slow query",
+                extra={
+                    "fingerprint": key,
+                    "duration_ms": round(duration * 1000, 3),
+                    "rows": rows,
+                    "route": current_route(),
+                },
+            )
+
+    def top(
+        self, limit: int = 20, order_by: str = "total_time"
+    ) -> List[Dict[str, Any]]:
+        entries = []
+        for key, stats in self.stats.items():
+            recent = sorted(stats.recent)
+            entries.append(
+                {
+                    "fingerprint": key,
+                    "count": stats.count,
+                    "total_time_ms": round(stats.total_time * 1000, 3),
+                    "mean_ms": round(stats.total_time / stats.count * 1000, 3),
+                    "p50_ms": round(_percentile(recent, 0.50) * 1000, 3),
+                    "p99_ms": round(_percentile(recent, 0.99) * 1000, 3),
+                    "max_ms": round(stats.max_time * 1000, 3),
+                    "rows": stats.rows,
+                    "rows_per_call": round(stats.rows / stats.count, 2),
+                }
+            )
+
+        sort_key = {
+            "total_time": "total_time_ms",
+            "count": "count",
+            "p99": "p99_ms",
+            "rows": "rows",
+        }[order_by]
+        entries.sort(key=lambda entry: entry[sort_key], reverse=True)
+        return entries[:limit]
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+
+query_stats = QueryStats(
+    max_fingerprints=env.query_stats_max_fingerprints,
+    window=env.query_stats_window,
+    slow_threshold=SLOW_QUERY_THRESHOLD,
+)
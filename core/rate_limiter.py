@@ -1,23 +1,194 @@
+import asyncio
+import math
 import time
-from collections import defaultdict
+from collections import OrderedDict
 from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from core.config import env
+from core.logger import logger
+from core.oauth2 import verify_token
+from core.redis.redis_config import redis_client as redis
+
+RATE_LIMIT_BACKEND = env.rate_limit_backend
+RATE_LIMIT_MAX_KEYS = env.rate_limit_max_keys
+RATE_LIMIT_SWEEP_INTERVAL = env.rate_limit_sweep_interval_seconds
+
+# GCRA: a key holds its "theoretical arrival time" (TAT) in milliseconds. Each
+# allowed call pushes the TAT forward by one emission interval; a call is
+# rejected while the TAT sits more than a whole period in the future.
+# Returns 0 when allowed, otherwise the milliseconds until the next slot.
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if allow_at > now then
+    return math.ceil(allow_at - now)
+end
+
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return 0
+"""
+
+gcra = redis.register_script(GCRA_SCRIPT)
+
+
+class MemoryRateLimitStore:
+    """Process-wide GCRA state for the in-memory backend.
+
+    Each key holds a single float (its TAT), which is a token bucket expressed
+    as one timestamp, so a check is O(1). The key table is shared by every
+    RateLimiter, capped at `max_keys` with LRU eviction, and swept in the
+    background: once a key's TAT is in the past it behaves exactly like an
+    unseen key, so dropping it never changes a decision.
+    """
+
+    def __init__(self, max_keys: int, sweep_interval: float):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self.tats: OrderedDict[str, float] = OrderedDict()
+        self.evicted = 0
+        self.swept = 0
+        self._sweeper: asyncio.Task | None = None
+
+    def acquire(self, key: str, emission_interval: float, period: float) -> float:
+        """Returns seconds until the next allowed call, 0 when allowed."""
+        now = time.monotonic()
+        tat = max(self.tats.get(key, now), now)
+
+        new_tat = tat + emission_interval
+        allow_at = new_tat - period
+        if allow_at > now:
+            return allow_at - now
+
+        self.tats[key] = new_tat
+        self.tats.move_to_end(key)
+        if len(self.tats) > self.max_keys:
+            self.tats.popitem(last=False)
+            self.evicted += 1
+
+        return 0
+
+    def sweep(self) -> int:
+        now = time.monotonic()
+        idle = [key for key, tat in self.tats.items() if tat <= now]
+        for key in idle:
+            del self.tats[key]
+
+        self.swept += len(idle)
+        return len(idle)
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+
+    def start(self):
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+
+memory_store = MemoryRateLimitStore(
+    max_keys=RATE_LIMIT_MAX_KEYS, sweep_interval=RATE_LIMIT_SWEEP_INTERVAL
+)
 
 
 class RateLimiter:
-    def __init__(self, max_calls: int, time_frame: int):
+    """Allow `max_calls` per `time_frame` seconds for each client.
+
+    `key` selects who is limited: "ip" (default), "user" or "org". The user and
+    org scopes read the bearer token and fall back to the client IP when the
+    request is unauthenticated. Limits are shared across workers through Redis;
+    if Redis is unavailable the limiter degrades to the per-process
+    `memory_store`.
+    """
+
+    def __init__(self, max_calls: int, time_frame: int, key: str = "ip"):
+        if key not in ("ip", "user", "org"):
+            raise ValueError(f"Unsupported rate limit key: {key}")
+
         self.max_calls = max_calls
         self.time_frame = time_frame
-        self.calls: dict[str, list] = defaultdict(list)
+        self.key = key
+        self.emission_interval = time_frame / max_calls
 
     async def __call__(self, request: Request):
-        client_ip = request.client.host
-        now = time.time()
-        self.calls[client_ip] = [
-            t for t in self.calls[client_ip] if t > now - self.time_frame
-        ]
-        if len(self.calls[client_ip]) >= self.max_calls:
+        key = self.build_key(request)
+
+        if RATE_LIMIT_BACKEND == "redis":
+            try:
+                retry_after = await self.check_redis(key)
+            except RedisError as e:
+                logger.warning(
+                    "Rate limiter falling back to in-memory store",
+                    extra={"error_type": type(e).__name__, "error_message": str(e)},
+                )
+                retry_after = self.check_local(key)
+        else:
+            retry_after = self.check_local(key)
+
+        if retry_after > 0:
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail="Rate limit exceeded",
+                headers={"Retry-After": str(math.ceil(retry_after))},
             )
-        self.calls[client_ip].append(now)
+
+    def build_key(self, request: Request) -> str:
+        # The endpoint is stable across workers and, unlike route.path, unique
+        # even when sub-routers declare the same relative path
+        endpoint = request.scope.get("endpoint")
+        name = (
+            f"{endpoint.__module__}.{endpoint.__name__}"
+            if endpoint
+            else request.url.path
+        )
+        return f"rate_limit:{name}:{self.identity(request)}"
+
+    def identity(self, request: Request) -> str:
+        if self.key != "ip":
+            scheme, _, token = request.headers.get("authorization", "").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    payload = verify_token(token, HTTPException(status_code=401))
+                except HTTPException:
+                    payload = None
+
+                if payload and self.key == "org" and payload.org_id:
+                    return f"org:{payload.org_id}"
+                if payload:
+                    return f"user:{payload.user_id}"
+
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    async def check_redis(self, key: str) -> float:
+        """Returns seconds until the next allowed call, 0 when allowed."""
+        retry_after_ms = await gcra(
+            keys=[key],
+            args=[
+                int(time.time() * 1000),
+                self.emission_interval * 1000,
+                self.time_frame * 1000,
+            ],
+        )
+        return int(retry_after_ms) / 1000
+
+    def check_local(self, key: str) -> float:
+        return memory_store.acquire(key, self.emission_interval, self.time_frame)
@@ -0,0 +1,56 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from core.config import env
+
+
+class LocalTTLCache:
+    """Bounded in-process LRU with per-entry TTL, sitting in front of Redis.
+
+    Entries are keyed exactly like their Redis counterparts. Version keys are
+    kept for a short TTL so that bumps made by other workers are picked up
+    quickly, while bumps made by this worker are applied immediately by the
+    `invalidate_redis_keys_on_*` helpers.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._store: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._store[key]
+            return None
+
+        self._store.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._store[key] = (expires_at, value)
+        self._store.move_to_end(key)
+
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._store.pop(key, None)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+local_cache = LocalTTLCache(
+    max_entries=env.local_cache_max_entries,
+    ttl=env.local_cache_ttl_seconds,
+)
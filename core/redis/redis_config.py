@@ -1,10 +1,46 @@
+import time
 import redis.asyncio as redis
 
+from redis.asyncio.client import Pipeline
+
 from core.config import env
+from core.metrics import redis_command_duration
+from core.request_timing import record
 
 REDIS_URL = env.redis_url
 
-redis_client = redis.from_url(
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        start_time = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            duration = time.perf_counter() - start_time
+            redis_command_duration.observe(duration, "PIPELINE")
+            record("redis", duration, "PIPELINE")
+
+
+class InstrumentedRedis(redis.Redis):
+    """Records the round trip of every command and pipeline."""
+
+    async def execute_command(self, *args, **options):
+        start_time = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            duration = time.perf_counter() - start_time
+            command = str(args[0]).upper()
+            redis_command_duration.observe(duration, command)
+            record("redis", duration, command)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+redis_client = InstrumentedRedis.from_url(
     REDIS_URL,
     encoding="utf-8",
     decode_responses=False,
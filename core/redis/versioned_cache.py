@@ -0,0 +1,67 @@
+import orjson
+
+from typing import Any, Callable, List, Optional, Tuple
+
+from core.metrics import cache_requests
+from core.redis.local_cache import local_cache
+from core.redis.redis_config import redis_client as redis
+
+CACHE_TTL_SECONDS = 60 * 5
+
+
+async def resolve_versions(version_keys: List[str]) -> List[int]:
+    """Return the current value of every version key, seeding missing ones to 1.
+
+    Keys still held by the in-process tier cost nothing; the rest are read with
+    a single MGET. Keys that do not exist yet are seeded with `SET NX` and read
+    back in one pipeline, so a concurrent INCR is never overwritten.
+    """
+    versions = [local_cache.get(key) for key in version_keys]
+    missing = [key for key, version in zip(version_keys, versions) if version is None]
+
+    if missing:
+        resolved = dict(zip(missing, await redis.mget(missing)))
+
+        unseeded = [key for key, version in resolved.items() if version is None]
+        if unseeded:
+            pipe = redis.pipeline(transaction=False)
+            for key in unseeded:
+                pipe.set(key, 1, nx=True)
+                pipe.get(key)
+            results = await pipe.execute()
+            resolved.update(zip(unseeded, results[1::2]))
+
+        for key, version in resolved.items():
+            local_cache.set(key, int(version))
+
+        versions = [
+            local_version if local_version is not None else int(resolved[key])
+            for key, local_version in zip(version_keys, versions)
+        ]
+
+    return versions
+
+
+async def get_versioned(
+    cache: str, version_keys: List[str], build_key: Callable[..., str]
+) -> Tuple[str, Optional[Any]]:
+    """Resolve the version keys, build the payload key from them and fetch it.
+
+    Returns the payload key (to be passed to `set_versioned` on a miss) and the
+    decoded payload, or None when nothing is cached for the current versions.
+    `cache` names the cache in the hit/miss metrics.
+    """
+    versions = await resolve_versions(version_keys)
+    cache_key = build_key(*versions)
+
+    cached = await redis.get(cache_key)
+    if cached:
+        cache_requests.inc(cache, "redis")
+        return cache_key, orjson.loads(cached)
+
+    cache_requests.inc(cache, "miss")
+    return cache_key, None
+
+
+async def set_versioned(cache_key: str, data: Any, ex: int = CACHE_TTL_SECONDS):
+    await redis.set(cache_key, orjson.dumps(data), ex=ex)
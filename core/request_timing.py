@@ -0,0 +1,182 @@
+import functools
+import inspect
+import time
+
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import env
+
+SERVER_TIMING_MODE = env.server_timing_mode
+
+
+class RequestTimer:
+    """Time spent per component (db, redis, jwt, auth) during one request.
+
+    Recording is two dict updates; in detailed mode every call is also kept
+    as a span of (name, detail, offset, duration).
+    """
+
+    __slots__ = ("start", "totals", "counts", "spans", "statements")
+
+    def __init__(self, detailed: bool = False):
+        self.start = time.perf_counter()
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.spans: Optional[List[Tuple[str, Optional[str], float, float]]] = (
+            [] if detailed else None
+        )
+        # Executions per SQL fingerprint, only while a query budget is checked
+        self.statements: Optional[Dict[str, int]] = None
+
+    def add(self, name: str, duration: float, detail: Optional[str] = None) -> None:
+        self.totals[name] = self.totals.get(name, 0.0) + duration
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+        if self.spans is not None:
+            offset = time.perf_counter() - self.start - duration
+            self.spans.append((name, detail, offset, duration))
+
+    def header(self) -> str:
+        entries = [
+            f'{name};dur={total * 1000:.3f};desc="{self.counts[name]} calls"'
+            for name, total in self.totals.items()
+        ]
+        if self.spans is not None:
+            entries.extend(
+                f'{name}.{i};dur={duration * 1000:.3f};desc="{detail or name} @{offset * 1000:.1f}ms"'
+                for i, (name, detail, offset, duration) in enumerate(self.spans)
+            )
+        entries.append(f"app;dur={(time.perf_counter() - self.start) * 1000:.3f}")
+        return ", ".join(entries)
+
+    def log_fields(self) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {
+            "timing_ms": {
+                name: round(total * 1000, 3) for name, total in self.totals.items()
+            },
+            "timing_calls": dict(self.counts),
+        }
+        if self.spans is not None:
+            fields["timing_spans"] = [
+                {
+                    "name": name,
+                    "detail": detail,
+                    "offset_ms": round(offset * 1000, 3),
+                    "duration_ms": round(duration * 1000, 3),
+                }
+                for name, detail, offset, duration in self.spans
+            ]
+        return fields
+
+
+request_timer: ContextVar[Optional[RequestTimer]] = ContextVar(
+    "request_timer", default=None
+)
+request_scope: ContextVar[Optional[Scope]] = ContextVar("request_scope", default=None)
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """Full template of the matched route, e.g. "/v2/projects/{project_id}".
+
+    scope["route"] only carries the path relative to the innermost included
+    router ("/{project_id}"), so the effective route FastAPI records for the
+    match is preferred when present.
+    """
+    fastapi_scope = scope.get("fastapi")
+    if isinstance(fastapi_scope, dict):
+        context = fastapi_scope.get("effective_route_context")
+        path = getattr(context, "path_format", None)
+        if path:
+            return path
+
+    return getattr(scope.get("route"), "path", None)
+
+
+def current_route() -> Optional[str]:
+    """Route template of the request being served."""
+    scope = request_scope.get()
+    if scope is None:
+        return None
+    return route_template(scope) or scope["path"]
+
+
+def record(name: str, duration: float, detail: Optional[str] = None) -> None:
+    timer = request_timer.get()
+    if timer is not None:
+        timer.add(name, duration, detail)
+
+
+def timed(name: str):
+    """Adds the run time of the decorated function (sync or async) to the
+    current request's `name` total."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_time = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record(name, time.perf_counter() - start_time)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start_time)
+
+        return wrapper
+
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """Starts a RequestTimer per request and sends its totals as a
+    `Server-Timing` header.
+
+    SERVER_TIMING_MODE is "off", "totals" (default) or "detailed", which also
+    emits every span. The timer stays readable by inner middlewares, so the
+    access log picks the same numbers up. The request scope is published in
+    every mode so deeper layers (e.g. the slow-query log) can name the route.
+    """
+
+    def __init__(self, app: ASGIApp, mode: str = SERVER_TIMING_MODE):
+        self.app = app
+        self.mode = mode
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope_token = request_scope.set(scope)
+        if self.mode == "off":
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                request_scope.reset(scope_token)
+            return
+
+        timer = RequestTimer(detailed=self.mode == "detailed")
+        token = request_timer.set(timer)
+
+        async def send_with_header(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timer.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            request_timer.reset(token)
+            request_scope.reset(scope_token)
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+from datetime import datetime, timezone
+from redis.exceptions import RedisError
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.v2.schemas.authorization_schemas import TokenData
+from core.config import env
+from core.logger import logger
+from core.redis.redis_config import redis_client as redis
+from core.token_cache import token_cache
+from database.db.session import AsyncSessionLocal
+from database.models.jti_blocklist import JtiBlocklist
+
+
+def _blocklist_key(jti: str) -> str:
+    return f"jti_blocklist:{jti}"
+
+
+async def is_jti_blocklisted(jti: str, db: AsyncSession) -> bool:
+    """Redis answers for every revocation it still holds; Postgres stays the
+    source of truth for anything Redis may have lost (eviction, restart)."""
+    try:
+        if await redis.exists(_blocklist_key(jti)):
+            return True
+    except RedisError as e:
+        logger.warning(
+            "JTI blocklist lookup skipped Redis",
+            extra={"error_type": type(e).__name__, "error_message": str(e)},
+        )
+
+    result = await db.execute(select(JtiBlocklist.id).where(JtiBlocklist.jti == jti))
+    return result.first() is not None
+
+
+async def revoke_jti(db: AsyncSession, payload: TokenData) -> None:
+    """Adds the token's JTI to the blocklist. The caller commits `db`, then
+    calls `cache_revoked_jti`."""
+    expires_at = (
+        datetime.fromtimestamp(payload.exp, tz=timezone.utc) if payload.exp else None
+    )
+
+    db.add(JtiBlocklist(jti=payload.jti, expires_at=expires_at))
+
+
+async def cache_revoked_jti(payload: TokenData) -> None:
+    """Publishes a committed revocation to the token cache and Redis, so a
+    failed commit never leaves a token revoked in the caches only."""
+    token_cache.revoke(payload.jti, payload.exp)
+
+    # Kept in Redis only for as long as the token itself could still be used;
+    # without an exp that is at most the refresh token lifetime
+    ttl = (
+        int(payload.exp - time.time())
+        if payload.exp
+        else env.refresh_token_expire_days * 24 * 60 * 60
+    )
+    if ttl <= 0:
+        return
+
+    try:
+        await redis.set(_blocklist_key(payload.jti), 1, ex=ttl)
+    except RedisError as e:
+        logger.warning(
+            "JTI blocklist write skipped Redis",
+            extra={"error_type": type(e).__name__, "error_message": str(e)},
+        )
+
+
+async def purge_expired_jtis() -> int:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(JtiBlocklist).where(
+                JtiBlocklist.expires_at < datetime.now(timezone.utc)
+            )
+        )
+        await db.commit()
+
+    return result.rowcount
+
+
+class JtiBlocklistPurger:
+    """Periodically deletes blocklist rows whose token has expired."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                purged = await purge_expired_jtis()
+                if purged:
+                    logger.info("Purged expired JTIs", extra={"purged": purged})
+            except Exception as e:
+                logger.error(
+                    "JTI blocklist purge failed",
+                    extra={"error_type": type(e).__name__, "error_message": str(e)},
+                )
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+jti_blocklist_purger = JtiBlocklistPurger(interval=env.jti_purge_interval_seconds)
@@ -0,0 +1,57 @@
+import hashlib
+import time
+
+from typing import Optional
+
+from api.v2.schemas.authorization_schemas import TokenData
+from core.config import env
+from core.redis.local_cache import LocalTTLCache
+
+
+class VerifiedTokenCache:
+    """Maps a token's SHA-256 digest to its already verified TokenData.
+
+    Entries expire at the token's own `exp`, so a cached token is never
+    accepted past its lifetime. JTIs revoked in this process are remembered
+    until their token would have expired and are never served from the cache.
+    """
+
+    def __init__(self, max_entries: int):
+        self.tokens = LocalTTLCache(max_entries=max_entries, ttl=0)
+        self.revoked = LocalTTLCache(max_entries=max_entries, ttl=0)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, digest: bytes) -> Optional[TokenData]:
+        token_data = self.tokens.get(digest)
+
+        if token_data is None or self.revoked.get(token_data.jti) is not None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return token_data
+
+    def put(self, digest: bytes, token_data: TokenData) -> None:
+        if not token_data.exp or self.revoked.get(token_data.jti) is not None:
+            return
+
+        ttl = token_data.exp - time.time()
+        if ttl > 0:
+            self.tokens.set(digest, token_data, ttl=ttl)
+
+    def revoke(self, jti: str, exp: Optional[int]) -> None:
+        ttl = exp - time.time() if exp else env.access_token_expire_minutes * 60
+        if ttl > 0:
+            self.revoked.set(jti, True, ttl=ttl)
+
+    def clear(self) -> None:
+        self.tokens.clear()
+        self.revoked.clear()
+
+
+token_cache = VerifiedTokenCache(max_entries=env.token_cache_max_entries)
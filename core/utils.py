@@ -2,16 +2,20 @@ import re
 
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, Request, status
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from passlib.context import CryptContext
-from sqlalchemy import select
 
-from core.logger import logger
+from core.audit_events import audit_event, audit_key, audit_row
+from core.audit_writer import audit_writer
+from core.config import env
+from core.kafka.kafka_producer import kafka_producer
 from core.oauth2 import verify_token
-from database.db.session import AsyncSessionLocal
-from database.models.audit_log import AuditLog
-from database.models.jti_blocklist import JtiBlocklist
+from core.token_blocklist import is_jti_blocklisted
 from core.redis.redis_config import redis_client as redis
+from core.redis.local_cache import local_cache
+
+AUDIT_SINK = env.audit_sink
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -24,6 +28,15 @@ def verify(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def dialect_insert(db: AsyncSession, table):
+    """INSERT for the session's dialect, so callers can use
+    `on_conflict_do_nothing` / `on_conflict_do_update` (Postgres, or SQLite
+    in tests)."""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
 def slugify(name: str):
     name = name.lower().strip()
     name = re.sub(r"[^a-z0-9]+", "-", name)
@@ -43,43 +56,24 @@ async def audit_logs(
     user_agent: Optional[str] = None,
     endpoint: Optional[str] = None,
 ):
-    async with AsyncSessionLocal() as db:
-        try:
-            entry = AuditLog(
-                actor_user_id=actor_user_id,
-                organization_id=organization_id,
-                action=action,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                status=status,
-                meta_data=meta_data,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                endpoint=endpoint,
-            )
-
-            db.add(entry)
-            await db.commit()
-
-        except Exception as e:
-            await db.rollback()
-
-            log_context = {
-                "action": action,
-                "resource_type": resource_type,
-                "resource_id": resource_id,
-                "status": status,
-                "actor_user_id": actor_user_id,
-                "organization_id": organization_id,
-                "ip_address": ip_address,
-                "endpoint": endpoint,
-            }
-            logger.error(
-                "Audit log failed",
-                extra={"error": str(e), **log_context},
-            )
-
-            raise
+    event = audit_event(
+        action=action,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        status=status,
+        actor_user_id=actor_user_id,
+        organization_id=organization_id,
+        meta_data=meta_data,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        endpoint=endpoint,
+    )
+
+    # Kafka: loaded into audit_logs by the audit consumer, off the request path
+    if AUDIT_SINK == "kafka":
+        await kafka_producer.submit(value=event, key=audit_key(organization_id))
+    else:
+        await audit_writer.submit(audit_row(event))
 
 
 async def get_valid_refresh_payload(request: Request, db: AsyncSession):
@@ -102,11 +96,7 @@ async def get_valid_refresh_payload(request: Request, db: AsyncSession):
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type"
         )
 
-    result = await db.execute(
-        select(JtiBlocklist).where(JtiBlocklist.jti == payload.jti)
-    )
-
-    if result.scalars().first():
+    if await is_jti_blocklisted(payload.jti, db):
         raise HTTPException(status_code=401, detail="Token expired or blocklisted")
 
     return payload
@@ -114,28 +104,56 @@ async def get_valid_refresh_payload(request: Request, db: AsyncSession):
 
 async def invalidate_redis_keys_on_mem_change(org_id, user_id):
     org_version_key = f"org_id:{org_id}:version"
-    await redis.incr(org_version_key)
+    version = await redis.incr(org_version_key)
+    local_cache.set(org_version_key, version)
+
+    user_version_key = f"user_id:{user_id}:version"
+    version = await redis.incr(user_version_key)
+    local_cache.set(user_version_key, version)
+
+
+async def invalidate_redis_keys_on_bulk_mem_change(org_id, user_ids):
+    """Bumps the org version once and each user's version, in one round trip."""
+    version_keys = [f"org_id:{org_id}:version"] + [
+        f"user_id:{user_id}:version" for user_id in user_ids
+    ]
+    pipe = redis.pipeline(transaction=False)
+    for key in version_keys:
+        pipe.incr(key)
+    versions = await pipe.execute()
+
+    for key, version in zip(version_keys, versions):
+        local_cache.set(key, version)
+
 
+async def invalidate_redis_keys_on_profile_change(user_id):
+    """Bumps the user's version, so member exports that list them go stale."""
     user_version_key = f"user_id:{user_id}:version"
-    await redis.incr(user_version_key)
+    version = await redis.incr(user_version_key)
+    local_cache.set(user_version_key, version)
 
 
 async def invalidate_redis_keys_on_org_delete(org_id):
     global_version_key = "global:version"
-    await redis.incr(global_version_key)
+    version = await redis.incr(global_version_key)
+    local_cache.set(global_version_key, version)
 
     org_version_key = f"org_id:{org_id}:version"
-    await redis.incr(org_version_key)
+    version = await redis.incr(org_version_key)
+    local_cache.set(org_version_key, version)
 
 
 async def invalidate_redis_keys_on_project_add_delete_update(org_id, project_id):
     project_version_key = f"org_id:{org_id}:project_version"
-    await redis.incr(project_version_key)
+    version = await redis.incr(project_version_key)
+    local_cache.set(project_version_key, version)
 
     project_version_key = f"project_id:{project_id}:version"
-    await redis.incr(project_version_key)
+    version = await redis.incr(project_version_key)
+    local_cache.set(project_version_key, version)
 
 
 async def invalidate_redis_keys_on_project_mem_change(project_id):
     project_version_key = f"project_id:{project_id}:version"
-    await redis.incr(project_version_key)
+    version = await redis.incr(project_version_key)
+    local_cache.set(project_version_key, version)
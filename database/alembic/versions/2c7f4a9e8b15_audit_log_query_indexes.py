@@ -0,0 +1,90 @@
+"""audit log query indexes
+
+Revision ID: 2c7f4a9e8b15
+Revises: 4e8b2d6c1f90
+Create Date: 2026-10-18 18:05:51.093127
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2c7f4a9e8b15"
+down_revision: Union[str, Sequence[str], None] = "4e8b2d6c1f90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "audit_logs",
+        "meta_data",
+        existing_type=sa.JSON(),
+        type_=postgresql.JSONB(),
+        postgresql_using="meta_data::jsonb",
+        existing_nullable=True,
+    )
+
+    op.drop_index("ix_audit_logs_org_timestamp", table_name="audit_logs")
+    op.create_index(
+        "ix_audit_logs_org_timestamp_id",
+        "audit_logs",
+        ["organization_id", "timestamp", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_logs_org_action_timestamp_id",
+        "audit_logs",
+        ["organization_id", "action", "timestamp", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_logs_org_actor_timestamp_id",
+        "audit_logs",
+        ["organization_id", "actor_user_id", "timestamp", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_logs_org_resource_timestamp_id",
+        "audit_logs",
+        ["organization_id", "resource_type", "resource_id", "timestamp", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_logs_meta_data",
+        "audit_logs",
+        ["meta_data"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"meta_data": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_audit_logs_meta_data", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_org_resource_timestamp_id", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_org_actor_timestamp_id", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_org_action_timestamp_id", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_org_timestamp_id", table_name="audit_logs")
+    op.create_index(
+        "ix_audit_logs_org_timestamp",
+        "audit_logs",
+        ["organization_id", "timestamp"],
+        unique=False,
+    )
+
+    op.alter_column(
+        "audit_logs",
+        "meta_data",
+        existing_type=postgresql.JSONB(),
+        type_=sa.JSON(),
+        postgresql_using="meta_data::json",
+        existing_nullable=True,
+    )
@@ -0,0 +1,58 @@
+"""jti blocklist unique index and expiry column
+
+Revision ID: 3f9d2c7a1b64
+Revises: 098e90f0e870
+Create Date: 2026-10-18 10:12:04.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.config import env
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9d2c7a1b64"
+down_revision: Union[str, Sequence[str], None] = "098e90f0e870"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "jti_blocklist",
+        sa.Column("expires_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+
+    # Existing rows carry no expiry; every token they refer to is dead once a
+    # full refresh lifetime has passed, so that is a safe upper bound.
+    op.execute(
+        sa.text(
+            "UPDATE jti_blocklist SET expires_at = now() + make_interval(days => :days) "
+            "WHERE expires_at IS NULL"
+        ).bindparams(days=env.refresh_token_expire_days)
+    )
+
+    op.execute(
+        "DELETE FROM jti_blocklist a USING jti_blocklist b "
+        "WHERE a.jti = b.jti AND a.id > b.id"
+    )
+
+    op.create_index(op.f("ix_jti_blocklist_jti"), "jti_blocklist", ["jti"], unique=True)
+    op.create_index(
+        op.f("ix_jti_blocklist_expires_at"),
+        "jti_blocklist",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_jti_blocklist_expires_at"), table_name="jti_blocklist")
+    op.drop_index(op.f("ix_jti_blocklist_jti"), table_name="jti_blocklist")
+    op.drop_column("jti_blocklist", "expires_at")
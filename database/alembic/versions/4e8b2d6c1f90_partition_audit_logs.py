@@ -0,0 +1,128 @@
+"""partition audit_logs by month
+
+Revision ID: 4e8b2d6c1f90
+Revises: 9d4e1f2a6b37
+Create Date: 2026-10-18 16:48:02.771534
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4e8b2d6c1f90"
+down_revision: Union[str, Sequence[str], None] = "9d4e1f2a6b37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created ahead of the current month; the app's partition manager
+# keeps this many ahead from then on
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, timestamp, actor_user_id, organization_id, action, resource_type, "
+    "resource_id, status, meta_data, ip_address, user_agent, endpoint"
+)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _audit_columns():
+    return [
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "timestamp",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("actor_user_id", sa.Integer(), nullable=True),
+        sa.Column("organization_id", sa.Integer(), nullable=True),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("resource_type", sa.String(), nullable=False),
+        sa.Column("resource_id", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("meta_data", sa.JSON(), nullable=True),
+        sa.Column("ip_address", sa.String(), nullable=True),
+        sa.Column("user_agent", sa.String(), nullable=True),
+        sa.Column("endpoint", sa.String(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table("audit_logs", "audit_logs_unpartitioned")
+    op.execute(
+        "ALTER TABLE audit_logs_unpartitioned "
+        "RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey"
+    )
+
+    op.create_table(
+        "audit_logs",
+        *_audit_columns(),
+        sa.PrimaryKeyConstraint("id", "timestamp"),
+        postgresql_partition_by="RANGE (timestamp)",
+    )
+    op.create_index(
+        "ix_audit_logs_org_timestamp",
+        "audit_logs",
+        ["organization_id", "timestamp"],
+        unique=False,
+    )
+
+    # One partition per month from the oldest existing row to MONTHS_AHEAD
+    # months from now; anything outside that range lands in the default one
+    now = datetime.now(timezone.utc)
+    current = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+    oldest = (
+        op.get_bind()
+        .execute(sa.text("SELECT min(timestamp) FROM audit_logs_unpartitioned"))
+        .scalar()
+    )
+    month = (
+        datetime(oldest.year, oldest.month, 1, tzinfo=timezone.utc)
+        if oldest
+        else current
+    )
+    while month <= _add_months(current, MONTHS_AHEAD):
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_p{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF audit_logs FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM audit_logs_unpartitioned"
+    )
+    op.drop_table("audit_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table("audit_logs", "audit_logs_partitioned")
+    op.create_table(
+        "audit_logs",
+        *_audit_columns(),
+        sa.PrimaryKeyConstraint("id", name="audit_logs_unpartitioned_pkey"),
+    )
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM audit_logs_partitioned"
+    )
+    # Dropping the parent drops every partition with it
+    op.drop_table("audit_logs_partitioned")
+    op.execute(
+        "ALTER TABLE audit_logs "
+        "RENAME CONSTRAINT audit_logs_unpartitioned_pkey TO audit_logs_pkey"
+    )
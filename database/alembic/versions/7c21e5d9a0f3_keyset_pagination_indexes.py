@@ -0,0 +1,42 @@
+"""keyset pagination indexes
+
+Revision ID: 7c21e5d9a0f3
+Revises: 3f9d2c7a1b64
+Create Date: 2026-10-18 11:02:37.604219
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c21e5d9a0f3"
+down_revision: Union[str, Sequence[str], None] = "3f9d2c7a1b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_organization_members_org_user",
+        "organization_members",
+        ["organization_id", "user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_projects_org_id_live",
+        "projects",
+        ["organization_id", "id"],
+        unique=False,
+        postgresql_where=sa.text("is_deleted IS false"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_projects_org_id_live", table_name="projects")
+    op.drop_index("ix_organization_members_org_user", table_name="organization_members")
@@ -0,0 +1,36 @@
+"""outbox retry backoff
+
+Revision ID: 8a3e5c1d7b42
+Revises: 2c7f4a9e8b15
+Create Date: 2026-10-18 21:12:07.482913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a3e5c1d7b42"
+down_revision: Union[str, Sequence[str], None] = "2c7f4a9e8b15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "outbox_events",
+        sa.Column("next_attempt_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_outbox_events_key_id", "outbox_events", ["key", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_outbox_events_key_id", table_name="outbox_events")
+    op.drop_column("outbox_events", "next_attempt_at")
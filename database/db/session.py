@@ -1,7 +1,14 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from core.config import env
+from core.metrics import db_pool_wait, metrics
+from core.query_budget import count_statement
+from core.query_stats import query_stats
+from core.request_timing import record
 import ssl
+import time
 
 connect_args = {}
 
@@ -11,8 +18,23 @@ if "neon.tech" in env.database_url:
     ssl_context.verify_mode = ssl.CERT_NONE
     connect_args["ssl"] = ssl_context
 
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Records how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            duration = time.perf_counter() - start_time
+            db_pool_wait.observe(duration)
+            record("db_pool", duration)
+
+
 engine = create_async_engine(
     env.database_url,
+    poolclass=TimedQueuePool,
     pool_size=50,
     max_overflow=50,
     pool_pre_ping=True,
@@ -20,6 +42,51 @@ engine = create_async_engine(
     connect_args=connect_args,
 )
 
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    record("db", duration, statement.split(None, 1)[0].upper())
+    count_statement(statement)
+    query_stats.observe(statement, duration, cursor.rowcount)
+
+
+def _drop_query_timer(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start
+    # time so it does not pile up on the pooled connection
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None:
+        started = conn.info.get("query_start_time")
+        if started:
+            started.pop()
+
+
+def instrument_engine(async_engine):
+    """Times every statement for Server-Timing, query budgets and the
+    slow-query log. Also used by the test suite on its SQLite engine."""
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", _stop_query_timer)
+    event.listen(async_engine.sync_engine, "handle_error", _drop_query_timer)
+
+
+instrument_engine(engine)
+
+
+metrics.gauge(
+    "db_pool_connections",
+    "SQLAlchemy pool size and connections by state.",
+    ("state",),
+    collect=lambda: {
+        ("size",): engine.pool.size(),
+        ("checked_out",): engine.pool.checkedout(),
+        ("checked_in",): engine.pool.checkedin(),
+        ("overflow",): engine.pool.overflow(),
+    },
+)
+
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -6,6 +6,7 @@ from database.models.audit_log import AuditLog
 from database.models.jti_blocklist import JtiBlocklist
 from database.models.project_member import ProjectMember
 from database.models.auth_identities import AuthIdentity
+from database.models.outbox_event import OutboxEvent
 
 __all__ = [
     "Users",
@@ -16,4 +17,5 @@ __all__ = [
     "JtiBlocklist",
     "ProjectMember",
     "AuthIdentity",
+    "OutboxEvent",
 ]
@@ -4,9 +4,11 @@ from sqlalchemy import (
     JSON,
     UUID,
     Column,
+    Index,
     Integer,
     String,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.sql.expression import text
 
@@ -14,11 +16,18 @@ from database.db.base import Base
 
 
 class AuditLog(Base):
+    """Range-partitioned by month on `timestamp` in Postgres (one
+    audit_logs_pYYYY_MM partition per month, see core.audit_partitions), so
+    the primary key has to include the partition key."""
+
     __tablename__ = "audit_logs"
 
     id = Column(UUID, primary_key=True, default=uuid4)
     timestamp = Column(
-        TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
+        TIMESTAMP(timezone=True),
+        primary_key=True,
+        nullable=False,
+        server_default=text("now()"),
     )
     actor_user_id = Column(Integer, nullable=True)
     organization_id = Column(Integer, nullable=True)
@@ -31,8 +40,43 @@ class AuditLog(Base):
     resource_id = Column(String, nullable=True)
     status = Column(String, default="success")  # success, failed, denied
 
-    meta_data = Column(JSON)
+    meta_data = Column(JSON().with_variant(JSONB(), "postgresql"))
 
     ip_address = Column(String)
     user_agent = Column(String)
     endpoint = Column(String)
+
+    # Each tenant filter has an index ending in (timestamp, id), the keyset
+    # the audit log API pages on
+    __table_args__ = (
+        Index("ix_audit_logs_org_timestamp_id", "organization_id", "timestamp", "id"),
+        Index(
+            "ix_audit_logs_org_action_timestamp_id",
+            "organization_id",
+            "action",
+            "timestamp",
+            "id",
+        ),
+        Index(
+            "ix_audit_logs_org_actor_timestamp_id",
+            "organization_id",
+            "actor_user_id",
+            "timestamp",
+            "id",
+        ),
+        Index(
+            "ix_audit_logs_org_resource_timestamp_id",
+            "organization_id",
+            "resource_type",
+            "resource_id",
+            "timestamp",
+            "id",
+        ),
+        Index(
+            "ix_audit_logs_meta_data",
+            "meta_data",
+            postgresql_using="gin",
+            postgresql_ops={"meta_data": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
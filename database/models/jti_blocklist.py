@@ -1,4 +1,5 @@
 from sqlalchemy import Column, String, Integer
+from sqlalchemy.sql.sqltypes import TIMESTAMP
 from database.db.base import Base
 
 
@@ -6,4 +7,5 @@ class JtiBlocklist(Base):
     __tablename__ = "jti_blocklist"
 
     id = Column(Integer, primary_key=True)
-    jti = Column(String, nullable=False)
+    jti = Column(String, nullable=False, unique=True, index=True)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=True, index=True)
@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Column, Integer, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.sql.expression import text
@@ -40,6 +40,7 @@ class OrganizationMember(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "organization_id", name="uq_user_org"),
+        Index("ix_organization_members_org_user", "organization_id", "user_id"),
     )
 
     users = relationship("Users", back_populates="organizations")
@@ -0,0 +1,30 @@
+from uuid import uuid4
+
+from sqlalchemy import JSON, UUID, Column, Index, Integer, String
+from sqlalchemy.sql.sqltypes import TIMESTAMP
+from sqlalchemy.sql.expression import text
+
+from database.db.base import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    # Carried in the payload so consumers can drop redelivered events
+    event_id = Column(UUID, nullable=False, unique=True, default=uuid4)
+    topic = Column(String, nullable=False)
+    key = Column(String, nullable=True)  # partition key, e.g. "org:42"
+    payload = Column(JSON, nullable=False)
+    created_at = Column(
+        TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    # Failed events are not retried before this; NULL means ready now
+    next_attempt_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_events_created_at", "created_at"),
+        Index("ix_outbox_events_key_id", "key", "id"),
+    )
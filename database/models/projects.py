@@ -1,4 +1,12 @@
-from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Integer,
+    String,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.sql.expression import text
@@ -31,6 +39,12 @@ class Project(Base):
 
     __table_args__ = (
         UniqueConstraint("organization_id", "name", name="uq_org_project_name"),
+        Index(
+            "ix_projects_org_id_live",
+            "organization_id",
+            "id",
+            postgresql_where=text("is_deleted IS false"),
+        ),
     )
 
     organization = relationship("Organization", back_populates="projects")
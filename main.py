@@ -3,18 +3,39 @@ from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from api.v2 import users, organizations, auth, health, projects
+from api.v2 import admin, users, organizations, auth, health, metrics, projects
 from core.config import env
 
+from core.audit_partitions import audit_partitions
+from core.audit_writer import audit_writer
 from core.kafka.kafka_producer import kafka_producer
-from core.logging_middleware import log_middleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from core.rate_limiter import memory_store
+from core.token_blocklist import jti_blocklist_purger
+from core.outbox import outbox_relay
+from core.logging_middleware import LoggingMiddleware
+from core.metrics import MetricsMiddleware, metrics as metrics_registry
+from core.query_budget import QUERY_BUDGET_MODE, QueryBudgetMiddleware
+from core.request_timing import ServerTimingMiddleware
+from core.redis.redis_config import redis_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await kafka_producer.start()
+    memory_store.start()
+    await audit_writer.start()
+    jti_blocklist_purger.start()
+    audit_partitions.start()
+    metrics_registry.start(redis_client)
+    await outbox_relay.start()
     yield
+    await outbox_relay.stop()
+    await metrics_registry.stop()
+    await audit_partitions.stop()
+    await jti_blocklist_purger.stop()
+    await audit_writer.stop()
+    await memory_store.stop()
+    await kafka_producer.drain(env.kafka_drain_timeout_seconds)
     await kafka_producer.stop()
 
 
@@ -78,13 +99,19 @@ app.add_middleware(
 
 app.add_middleware(SessionMiddleware, secret_key=env.secret_key)
 
-app.add_middleware(BaseHTTPMiddleware, dispatch=log_middleware)
+if QUERY_BUDGET_MODE != "off":
+    app.add_middleware(QueryBudgetMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(LoggingMiddleware)
+app.add_middleware(ServerTimingMiddleware)
 
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(organizations.router)
 app.include_router(projects.router)
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 
 @app.get("/")
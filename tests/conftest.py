@@ -1,3 +1,4 @@
+import os
 from datetime import datetime, timezone
 
 import pytest_asyncio
@@ -9,9 +10,20 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
 )
 
-from database.db.base import Base
-from database.db.session import get_db
-from main import app
+# Keep rate limiting per-process so tests never depend on a live Redis
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+# Publish to the in-process Kafka broker instead of Aiven
+os.environ["KAFKA_BACKEND"] = "memory"
+# Fail any test whose requests exceed their endpoint's query budget
+os.environ["QUERY_BUDGET_MODE"] = "enforce"
+
+from core.query_budget import budget_violations  # noqa: E402
+from core.rate_limiter import memory_store  # noqa: E402
+from core.redis.local_cache import local_cache  # noqa: E402
+from core.token_cache import token_cache  # noqa: E402
+from database.db.base import Base  # noqa: E402
+from database.db.session import get_db, instrument_engine  # noqa: E402
+from main import app  # noqa: E402
 
 # ------------------------------------------------------------------
 # Shared-cache in-memory SQLite
@@ -32,6 +44,8 @@ def register_sqlite_functions(dbapi_connection, connection_record):
     )
 
 
+instrument_engine(engine)
+
 TestingSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -76,6 +90,32 @@ async def override_db(db_session: AsyncSession):
     app.dependency_overrides.pop(get_db, None)
 
 
+# ------------------------------------------------------------------
+# Reset in-process cache and rate limit state between tests
+# ------------------------------------------------------------------
+@pytest_asyncio.fixture(autouse=True)
+async def clear_local_state():
+    local_cache.clear()
+    memory_store.tats.clear()
+    token_cache.clear()
+    yield
+    local_cache.clear()
+    memory_store.tats.clear()
+    token_cache.clear()
+
+
+# ------------------------------------------------------------------
+# Query budgets: DB and Redis round trips per request, see core.query_budget
+# ------------------------------------------------------------------
+@pytest_asyncio.fixture(autouse=True)
+async def enforce_query_budgets():
+    budget_violations.clear()
+    yield
+    violations = list(budget_violations)
+    budget_violations.clear()
+    assert not violations, f"Query budget violations: {violations}"
+
+
 # ------------------------------------------------------------------
 # HTTP client
 # ------------------------------------------------------------------
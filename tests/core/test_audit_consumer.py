@@ -0,0 +1,120 @@
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+import orjson
+from sqlalchemy import delete, select
+from sqlalchemy.exc import DataError
+
+from core.audit_consumer import AuditConsumer, insert_audit_rows
+from core.audit_events import audit_event
+from core.kafka.memory_broker import MemoryBroker, MemoryConsumer
+from core.metrics import audit_consumer_lag
+from database.models.audit_log import AuditLog
+from tests.conftest import TestingSessionLocal
+
+
+async def test_consumer_loads_each_event_once_and_commits_offsets():
+    broker = MemoryBroker(default_partitions=2)
+    events = [
+        audit_event(action="test.consumer", resource_type="test", organization_id=i)
+        for i in range(4)
+    ]
+    for event in events + [events[0]]:
+        broker.append(
+            "audit", orjson.dumps(event), key=b"org:%d" % event["organization_id"]
+        )
+    broker.append("audit", orjson.dumps("not an event"))
+
+    consumer = AuditConsumer(
+        MemoryConsumer(
+            "audit", broker=broker, group_id="loader", value_deserializer=orjson.loads
+        ),
+        batch_size=100,
+        poll_timeout_ms=10,
+    )
+    await consumer.consumer.start()
+
+    with patch("core.audit_consumer.AsyncSessionLocal", TestingSessionLocal):
+        assert await consumer.consume_once() == 6
+        # A redelivered batch is dropped by the event_id primary key
+        for tp in consumer.consumer.assignment():
+            consumer.consumer.seek(tp, 0)
+        assert await consumer.consume_once() == 6
+
+    assert consumer.loaded == 4 and consumer.invalid == 2
+    assert consumer.duplicates == 1 + 5
+    committed = {tp: offset for (_, tp), offset in broker.committed.items()}
+    assert committed and all(
+        offset == broker.end_offset(tp) for tp, offset in committed.items()
+    )
+
+    broker.append("audit", orjson.dumps(events[1]), partition=1)
+    await consumer.update_lag()
+    assert audit_consumer_lag.values[("audit", "1")] == 1
+    assert audit_consumer_lag.values[("audit", "0")] == 0
+
+    async with TestingSessionLocal() as db:
+        rows = (
+            (
+                await db.execute(
+                    select(AuditLog).where(AuditLog.action == "test.consumer")
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert sorted(row.organization_id for row in rows) == [0, 1, 2, 3]
+        assert {str(row.id) for row in rows} == {event["event_id"] for event in events}
+
+        await db.execute(delete(AuditLog).where(AuditLog.action == "test.consumer"))
+        await db.commit()
+
+
+async def test_consumer_skips_bad_events_instead_of_retrying_the_batch():
+    broker = MemoryBroker(default_partitions=1)
+    good, rejected = [
+        audit_event(action="test.poison", resource_type="test", organization_id=1)
+        for _ in range(2)
+    ]
+    bad_id = dict(good, event_id="not-a-uuid")
+    bad_timestamp = dict(good, event_id=str(uuid4()), timestamp="yesterday")
+    for event in (good, bad_id, bad_timestamp, rejected):
+        broker.append("audit", orjson.dumps(event))
+
+    async def load(db, rows):
+        # The batch load fails, and the database rejects one row on its own
+        if len(rows) > 1:
+            raise ValueError("COPY failed")
+        if rows[0]["id"] == UUID(rejected["event_id"]):
+            raise DataError("INSERT", {}, ValueError("bad column"))
+        return await insert_audit_rows(db, rows)
+
+    consumer = AuditConsumer(
+        MemoryConsumer(
+            "audit", broker=broker, group_id="loader", value_deserializer=orjson.loads
+        ),
+        batch_size=100,
+        poll_timeout_ms=10,
+    )
+    await consumer.consumer.start()
+
+    with (
+        patch("core.audit_consumer.AsyncSessionLocal", TestingSessionLocal),
+        patch("core.audit_consumer.insert_audit_rows", load),
+    ):
+        assert await consumer.consume_once() == 4
+
+    assert consumer.loaded == 1 and consumer.invalid == 3
+    committed = {tp: offset for (_, tp), offset in broker.committed.items()}
+    assert list(committed.values()) == [4]
+
+    async with TestingSessionLocal() as db:
+        rows = (
+            (await db.execute(select(AuditLog).where(AuditLog.action == "test.poison")))
+            .scalars()
+            .all()
+        )
+        assert [str(row.id) for row in rows] == [good["event_id"]]
+
+        await db.execute(delete(AuditLog).where(AuditLog.action == "test.poison"))
+        await db.commit()
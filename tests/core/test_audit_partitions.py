@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import orjson
+import zstandard
+
+from core.audit_partitions import (
+    add_months,
+    month_start,
+    partition_month,
+    partition_name,
+    write_archive,
+)
+
+
+def test_monthly_partition_names_round_trip_across_years():
+    month = month_start(datetime(2026, 11, 17, 9, 30, tzinfo=timezone.utc))
+
+    assert add_months(month, 2) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -11) == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert partition_name(month) == "audit_logs_p2026_11"
+    assert partition_month("audit_logs_p2026_11") == month
+    assert partition_month("audit_logs_default") is None
+
+
+async def test_archive_is_zstd_ndjson_written_atomically(tmp_path):
+    rows = [
+        {
+            "id": uuid4(),
+            "timestamp": datetime(2025, 1, 1, i, tzinfo=timezone.utc),
+            "action": "login.success",
+            "meta_data": {"attempt": i},
+        }
+        for i in range(3)
+    ]
+
+    async def stream():
+        for row in rows:
+            yield row
+
+    path = tmp_path / "audit_logs_p2025_01.ndjson.zst"
+    assert await write_archive(str(path), stream()) == 3
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+    with zstandard.ZstdDecompressor().stream_reader(path.open("rb")) as reader:
+        lines = reader.read().splitlines()
+    archived = [orjson.loads(line) for line in lines]
+    assert [row["id"] for row in archived] == [str(row["id"]) for row in rows]
+    assert archived[2]["meta_data"] == {"attempt": 2}
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+from sqlalchemy import func, select
+
+from core.audit_writer import AuditLogWriter
+from database.models.audit_log import AuditLog
+from tests.conftest import TestingSessionLocal
+
+
+async def test_audit_writer_flushes_in_batches():
+    writer = AuditLogWriter(
+        batch_size=3, flush_interval=0.05, queue_size=100, enqueue_timeout=0.1
+    )
+
+    with patch("core.audit_writer.AsyncSessionLocal", TestingSessionLocal):
+        await writer.start()
+        for i in range(7):
+            await writer.submit(
+                {
+                    "action": "test.batched",
+                    "resource_type": "test",
+                    "resource_id": str(i),
+                }
+            )
+        await writer.stop()
+
+    assert writer.written == 7
+    assert writer.flushes == 3
+    assert writer.stats()["queue_depth"] == 0
+
+    async with TestingSessionLocal() as db:
+        count = await db.scalar(
+            select(func.count())
+            .select_from(AuditLog)
+            .where(AuditLog.action == "test.batched")
+        )
+    assert count == 7
+
+
+async def test_audit_writer_drops_when_queue_is_full():
+    writer = AuditLogWriter(
+        batch_size=10, flush_interval=0.05, queue_size=1, enqueue_timeout=0.01
+    )
+    writer._task = object()  # pretend the flusher is running but stalled
+
+    await writer.submit({"action": "test.first", "resource_type": "test"})
+    await writer.submit({"action": "test.second", "resource_type": "test"})
+
+    assert writer.enqueued == 1
+    assert writer.blocked == 1
+    assert writer.dropped == 1
+
+
+async def test_audit_writer_drops_only_the_bad_row_of_a_failed_batch():
+    writer = AuditLogWriter(
+        batch_size=3, flush_interval=0.05, queue_size=100, enqueue_timeout=0.1
+    )
+
+    with patch("core.audit_writer.AsyncSessionLocal", TestingSessionLocal):
+        await writer.start()
+        await writer.submit({"action": "test.partial", "resource_type": "test"})
+        await writer.submit({"action": "test.partial"})  # resource_type is required
+        await writer.submit({"action": "test.partial", "resource_type": "test"})
+        await writer.stop()
+
+    assert writer.written == 2 and writer.failed == 1
+
+    async with TestingSessionLocal() as db:
+        count = await db.scalar(
+            select(func.count())
+            .select_from(AuditLog)
+            .where(AuditLog.action == "test.partial")
+        )
+    assert count == 2
@@ -0,0 +1,59 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose.exceptions import JWTError
+
+from core.jwt_keys import KeyRing
+
+
+def generate_es256_pem() -> str:
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def test_key_ring_rotation_keeps_old_tokens_valid():
+    key_ring = KeyRing(algorithm="ES256", secret_key="legacy-secret")
+    first_kid = key_ring.rotate(generate_es256_pem())
+    old_token = key_ring.encode({"user_id": 1})
+
+    second_kid = key_ring.rotate(generate_es256_pem())
+    new_token = key_ring.encode({"user_id": 2})
+
+    assert first_kid != second_kid
+    assert key_ring.decode(old_token)["user_id"] == 1
+    assert key_ring.decode(new_token)["user_id"] == 2
+    assert {key["kid"] for key in key_ring.jwks()["keys"]} == {first_kid, second_kid}
+    assert all("d" not in key for key in key_ring.jwks()["keys"])
+
+
+def test_key_ring_accepts_legacy_tokens_and_rejects_unknown_kid():
+    legacy_ring = KeyRing(algorithm="HS256", secret_key="legacy-secret")
+    legacy_token = legacy_ring.encode({"user_id": 1})
+
+    key_ring = KeyRing(
+        algorithm="ES256",
+        secret_key="legacy-secret",
+        legacy_until=datetime.now(timezone.utc) + timedelta(days=7),
+    )
+    key_ring.rotate(generate_es256_pem())
+    assert key_ring.decode(legacy_token)["user_id"] == 1
+
+    # Past the migration window, or without one, the shared secret is no
+    # longer accepted
+    for legacy_until in (datetime.now(timezone.utc) - timedelta(seconds=1), None):
+        closed_ring = KeyRing(
+            algorithm="ES256", secret_key="legacy-secret", legacy_until=legacy_until
+        )
+        closed_ring.rotate(generate_es256_pem())
+        with pytest.raises(JWTError):
+            closed_ring.decode(legacy_token)
+
+    other_ring = KeyRing(algorithm="ES256", secret_key="legacy-secret")
+    other_ring.rotate(generate_es256_pem())
+    with pytest.raises(JWTError):
+        key_ring.decode(other_ring.encode({"user_id": 3}))
@@ -0,0 +1,228 @@
+import asyncio
+
+from unittest.mock import patch
+
+from aiokafka.errors import KafkaConnectionError, KafkaError
+
+from core.kafka.kafka_producer import (
+    KafkaBufferFull,
+    KafkaProducerManager,
+    encode_message,
+)
+from core.kafka.spool import SegmentSpool, frame, read_segment
+
+
+class FakeProducer:
+    def __init__(self, fail_topics=(), unreachable=False, hang=False):
+        self.fail_topics = fail_topics
+        self.unreachable = unreachable
+        self.hang = hang
+        self.sent = []
+
+    async def start(self):
+        if self.unreachable:
+            raise KafkaConnectionError("broker unreachable")
+
+    async def stop(self):
+        pass
+
+    async def send(self, topic, value=None, key=None):
+        future = asyncio.get_running_loop().create_future()
+        if self.hang:
+            pass  # the ack never arrives
+        elif topic in self.fail_topics:
+            future.set_exception(KafkaError("not enough replicas"))
+        else:
+            self.sent.append((topic, value, key))
+            future.set_result(None)
+        return future
+
+
+_sleep = asyncio.sleep
+
+
+async def fast_sleep(delay):
+    await _sleep(min(delay, 0.01))
+
+
+def make_manager(tmp_path, producer, **overrides):
+    options = {
+        "buffer_size": 100,
+        "batch_size": 3,
+        "overflow_policy": "block",
+        "enqueue_timeout": 0.01,
+        "spool": SegmentSpool(str(tmp_path / "spool"), segment_bytes=64),
+        "replay_interval": 0.01,
+    }
+    options.update(overrides)
+    manager = KafkaProducerManager(**options)
+    return manager, patch.multiple(
+        "core.kafka.kafka_producer",
+        build_producer=lambda: producer,
+        generate_kafka_connection_files=lambda env: None,
+    )
+
+
+async def test_submit_delivers_in_batches_and_reports_outcomes(tmp_path):
+    producer = FakeProducer(fail_topics=("broken",))
+    manager, patches = make_manager(tmp_path, producer, replay_interval=60)
+    outcomes = []
+    manager.add_delivery_callback(
+        lambda topic, value, key, error: outcomes.append((value["i"], error))
+    )
+
+    with patches:
+        await manager.start()
+        await asyncio.wait_for(manager.connected.wait(), 1)
+        for i in range(5):
+            await manager.submit({"i": i}, topic="events")
+        await manager.submit({"i": 5}, topic="broken")
+        assert await manager.drain(timeout=1)
+        await manager.stop()
+
+    assert [value["i"] for _, value, _ in producer.sent] == [0, 1, 2, 3, 4]
+    assert manager.delivered == 5
+    assert manager.failed == 1
+    assert manager.spooled == 1  # the failed message is kept for replay
+    assert isinstance(dict(outcomes)[5], KafkaError)
+    assert manager.stats()["buffer_depth"] == 0
+
+
+async def test_drop_oldest_evicts_the_head_of_the_buffer(tmp_path):
+    manager, _ = make_manager(
+        tmp_path, FakeProducer(), buffer_size=2, overflow_policy="drop_oldest"
+    )
+    manager._flusher = object()  # pretend the flusher is running but stalled
+    dropped = []
+    manager.add_delivery_callback(
+        lambda topic, value, key, error: dropped.append((value["i"], error))
+    )
+
+    for i in range(3):
+        await manager.submit({"i": i}, topic="events")
+
+    assert [value["i"] for _, value, _ in manager.buffer] == [1, 2]
+    assert manager.dropped == 1
+    assert dropped[0][0] == 0 and isinstance(dropped[0][1], KafkaBufferFull)
+
+
+async def test_unreachable_broker_spools_and_replays_after_reconnect(tmp_path):
+    producer = FakeProducer(unreachable=True)
+    manager, patches = make_manager(tmp_path, producer)
+
+    # Shorten the reconnect backoff and replay interval
+    with patches, patch("core.kafka.kafka_producer.asyncio.sleep", fast_sleep):
+        # start() returns even though the broker cannot be reached
+        await asyncio.wait_for(manager.start(), 1)
+        await manager.publish({"i": 0}, key=b"k0")
+        for i in range(1, 6):
+            await manager.submit({"i": i}, key=f"k{i}".encode())
+        assert await manager.drain(timeout=1)
+
+        assert not manager.connected.is_set()
+        assert manager.spooled == 6 and not producer.sent
+
+        producer.unreachable = False
+        await asyncio.wait_for(manager.connected.wait(), 1)
+        for _ in range(200):
+            # Replayed segments are removed after their last batch is sent
+            if manager.replayed == 6 and not manager.spool.pending_bytes:
+                break
+            await asyncio.sleep(0.01)
+        await manager.stop()
+
+    assert sorted(value["i"] for _, value, _ in producer.sent) == list(range(6))
+    assert {value["i"]: key for _, value, key in producer.sent}[3] == b"k3"
+    assert manager.spool.segments() == []
+    assert manager.stats()["spool_bytes"] == 0
+
+
+async def test_stop_spools_the_batch_still_waiting_for_acks(tmp_path):
+    producer = FakeProducer(hang=True)
+    manager, patches = make_manager(tmp_path, producer)
+
+    with patches:
+        await manager.start()
+        await asyncio.wait_for(manager.connected.wait(), 1)
+        await manager.submit({"i": 0}, topic="events")
+        assert not await manager.drain(timeout=0.1)
+        await manager.stop()
+
+    assert manager.spooled == 1
+    manager.spool.seal()
+    [segment] = manager.spool.segments()
+    assert len(list(read_segment(segment))) == 1
+
+
+async def test_interrupted_replay_keeps_the_rest_at_the_head_of_the_spool(tmp_path):
+    spool = SegmentSpool(str(tmp_path / "spool"), segment_bytes=1 << 20)
+    manager, _ = make_manager(tmp_path, FakeProducer(), spool=spool, batch_size=2)
+    spool.open()
+    spool.append([encode_message(("events", {"i": i}, None)) for i in range(4)])
+    spool.seal()
+    spool.append([encode_message(("events", {"i": i}, None)) for i in (4, 5)])
+
+    sent, down = [], {3}
+
+    async def send_batch(batch):
+        errors = []
+        for _, value, _ in batch:
+            if value["i"] in down:
+                errors.append(KafkaError("broker down"))
+            else:
+                sent.append(value["i"])
+                errors.append(None)
+        return errors
+
+    manager.send_batch = send_batch
+    await manager.replay_spool()
+    assert sent == [0, 1, 2]
+
+    down.clear()
+    await manager.replay_spool()
+    assert sent == [0, 1, 2, 3, 4, 5]
+    assert spool.segments() == [] and spool.pending_bytes == 0
+
+
+def test_segment_spool_rotates_and_stops_at_a_corrupt_tail(tmp_path):
+    spool = SegmentSpool(str(tmp_path), segment_bytes=32)
+    spool.open()
+    spool.append([b"first", b"second"])  # 2 * 8 header bytes + 11 = 27
+    spool.append([b"third"])  # crosses 32 bytes, segment rotates
+    spool.append([b"fourth"])
+    spool.seal()
+
+    first, second = spool.segments()
+    assert list(read_segment(first)) == [b"first", b"second", b"third"]
+
+    with open(second, "ab") as f:
+        f.write(frame(b"torn write")[:-3])
+    assert list(read_segment(second)) == [b"fourth"]
+
+    spool.close()
+    reopened = SegmentSpool(str(tmp_path), segment_bytes=32)
+    reopened.open()
+    assert reopened.directory == spool.directory
+    assert reopened.pending_bytes == spool.pending_bytes + len(frame(b"torn write")) - 3
+    reopened.append([b"fifth"])
+    reopened.seal()
+    assert len(reopened.segments()) == 3
+
+
+def test_each_process_claims_its_own_spool_directory(tmp_path):
+    first = SegmentSpool(str(tmp_path), segment_bytes=32)
+    second = SegmentSpool(str(tmp_path), segment_bytes=32)
+    first.open()
+    second.open()
+    assert first.directory != second.directory
+
+    first.append([b"left behind"])
+    first.close()
+
+    # The next process to start takes over the released directory
+    third = SegmentSpool(str(tmp_path), segment_bytes=32)
+    third.open()
+    assert third.directory == first.directory
+    assert [list(read_segment(path)) for path in third.segments()] == [[b"left behind"]]
+    second.close()
+    third.close()
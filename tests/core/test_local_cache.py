@@ -0,0 +1,23 @@
+from core.redis.local_cache import LocalTTLCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalTTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_local_cache_expires_entries():
+    cache = LocalTTLCache(max_entries=10, ttl=60)
+    cache.set("version", 1, ttl=0)
+
+    assert cache.get("version") is None
+    assert len(cache) == 0
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+
+import httpx
+import orjson
+import pytest
+from fastapi import BackgroundTasks, FastAPI, HTTPException
+
+from core.logger import JSONFormatter
+from core.logging_middleware import (
+    AccessLogSampler,
+    LoggingMiddleware,
+    parse_sample_rules,
+)
+
+
+def test_sampler_keeps_errors_and_slow_requests():
+    sampler = AccessLogSampler(
+        rules=parse_sample_rules("*:/health:*=0,GET:*:2xx=0.01"), slow_seconds=1.0
+    )
+
+    assert sampler.sample_rate("GET", "/health", 200, 0.01) == 0
+    assert sampler.sample_rate("GET", "/v2/projects/{project_id}", 200, 0.01) == 0.01
+    assert sampler.sample_rate("POST", "/v2/projects/", 201, 0.01) == 1.0
+    assert sampler.sample_rate("GET", "/health", 503, 0.01) == 1.0
+    assert sampler.sample_rate("GET", "/v2/projects/", 200, 2.0) == 1.0
+
+
+@pytest.mark.asyncio
+async def test_logging_middleware_samples_by_route(caplog):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    sampler = AccessLogSampler(
+        rules=parse_sample_rules("GET:/items/{item_id}:2xx=0"), slow_seconds=60
+    )
+    app.add_middleware(LoggingMiddleware, sampler=sampler)
+
+    transport = httpx.ASGITransport(app=app)
+    with caplog.at_level(logging.INFO):
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            await c.get("/items/1")
+            await c.get("/items/0")
+
+    records = [r for r in caplog.records if r.getMessage() == "HTTP request"]
+    assert [(r.url, r.route, r.status_code) for r in records] == [
+        ("/items/0", "/items/{item_id}", 404)
+    ]
+
+    line = orjson.loads(JSONFormatter().format(records[0]))
+    assert line["message"] == "HTTP request"
+    assert line["status_code"] == 404
+    assert line["sample_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_logging_middleware_excludes_background_tasks_from_timing(caplog):
+    app = FastAPI()
+
+    @app.get("/slow-task")
+    async def slow_task(background_tasks: BackgroundTasks):
+        background_tasks.add_task(asyncio.sleep, 0.3)
+        return {}
+
+    app.add_middleware(
+        LoggingMiddleware, sampler=AccessLogSampler(rules=[], slow_seconds=60)
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    with caplog.at_level(logging.INFO):
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            await c.get("/slow-task")
+
+    [record] = [r for r in caplog.records if r.getMessage() == "HTTP request"]
+    assert record.processing_time < 0.3
@@ -0,0 +1,81 @@
+import asyncio
+
+import orjson
+
+from core.kafka.backends import memory_broker
+from core.kafka.kafka_producer import KafkaProducerManager
+from core.kafka.memory_broker import MemoryBroker, MemoryConsumer, MemoryProducer
+from core.kafka.spool import SegmentSpool
+
+
+async def test_producer_batches_until_linger_and_keeps_keys_on_one_partition():
+    broker = MemoryBroker(default_partitions=4)
+    producer = MemoryProducer(broker, value_serializer=orjson.dumps, linger_ms=20)
+    await producer.start()
+
+    futures = [
+        await producer.send("events", {"i": i}, key=b"org:1" if i % 2 else b"org:2")
+        for i in range(6)
+    ]
+    # Nothing is appended until the batch closes
+    assert not any(future.done() for future in futures)
+    assert "events" not in broker.topics
+
+    metadata = await asyncio.gather(*futures)
+    await producer.stop()
+
+    partitions = {meta.partition for i, meta in enumerate(metadata) if i % 2}
+    assert len(partitions) == 1
+    org_1 = broker.topics["events"][partitions.pop()]
+    assert [orjson.loads(r.value)["i"] for r in org_1 if r.key == b"org:1"] == [1, 3, 5]
+
+
+async def test_consumer_resumes_from_committed_offsets():
+    broker = MemoryBroker(default_partitions=2)
+    for i in range(5):
+        broker.append("events", orjson.dumps({"i": i}), key=b"k")
+
+    consumer = MemoryConsumer(
+        "events", broker=broker, group_id="audit", value_deserializer=orjson.loads
+    )
+    await consumer.start()
+    first = await consumer.getmany(max_records=3)
+    ((tp, records),) = first.items()
+    assert [r.value["i"] for r in records] == [0, 1, 2]
+    await consumer.commit({tp: records[-1].offset + 1})
+    await consumer.stop()
+
+    restarted = MemoryConsumer(
+        "events", broker=broker, group_id="audit", value_deserializer=orjson.loads
+    )
+    await restarted.start()
+    rest = await restarted.getmany(timeout_ms=10)
+    assert [r.value["i"] for r in rest[tp]] == [3, 4]
+    assert restarted.highwater(tp) == 5 and await restarted.committed(tp) == 3
+
+
+async def test_producer_manager_publishes_through_the_memory_backend(tmp_path):
+    memory_broker.reset()
+    manager = KafkaProducerManager(
+        buffer_size=100,
+        batch_size=10,
+        overflow_policy="block",
+        enqueue_timeout=0.1,
+        spool=SegmentSpool(str(tmp_path), segment_bytes=1024),
+        replay_interval=60,
+    )
+
+    await manager.start()
+    await asyncio.wait_for(manager.connected.wait(), 1)
+    for i in range(25):
+        await manager.submit({"i": i}, key=b"org:7", topic="audit")
+    assert await manager.drain(timeout=1)
+    await manager.stop()
+
+    consumer = MemoryConsumer(
+        "audit", broker=memory_broker, value_deserializer=orjson.loads
+    )
+    await consumer.start()
+    records = [r for batch in (await consumer.getmany()).values() for r in batch]
+    assert [r.value["i"] for r in records] == list(range(25))
+    assert manager.delivered == 25 and manager.spooled == 0
@@ -0,0 +1,91 @@
+from core.metrics import MetricsRegistry
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.ops
+        ]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def hincrbyfloat(self, key, field, amount):
+        hash_ = self.hashes.setdefault(key, {})
+        hash_[field] = float(hash_.get(field, 0)) + amount
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def scan_iter(self, match, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.hashes):
+            if key.startswith(prefix):
+                yield key
+
+
+def build_registry():
+    registry = MetricsRegistry(flush_interval=5)
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram(
+        "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)
+    )
+    return registry, requests, latency
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry, _, latency = build_registry()
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(3, "/a")
+
+    text = registry.render(registry.local())
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 3.55' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+async def test_flush_aggregates_workers_without_double_counting():
+    redis = FakeRedis()
+    first, first_requests, _ = build_registry()
+    second, second_requests, _ = build_registry()
+
+    first_requests.inc("/a")
+    await first.flush(redis)
+    first_requests.inc("/a")
+    await first.flush(redis)
+    await first.flush(redis)
+    second_requests.inc("/a", amount=3)
+    await second.flush(redis)
+
+    text = first.render(await first.aggregate(redis))
+
+    assert 'requests_total{route="/a"} 5' in text
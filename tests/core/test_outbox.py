@@ -0,0 +1,176 @@
+from unittest.mock import AsyncMock, patch
+
+from aiokafka.errors import KafkaConnectionError, KafkaError
+from sqlalchemy import delete, select, update
+
+from core.kafka.kafka_producer import kafka_producer
+from core.outbox import OutboxRelay, add_outbox_event
+from database.models.audit_log import AuditLog
+from database.models.outbox_event import OutboxEvent
+from tests.conftest import TestingSessionLocal
+
+
+def connected():
+    return patch.object(kafka_producer.connected, "is_set", return_value=True)
+
+
+async def test_relay_publishes_committed_events_and_keeps_failures():
+    async with TestingSessionLocal() as db:
+        first = add_outbox_event(
+            db, action="test.outbox", resource_type="test", organization_id=7
+        )
+        second = add_outbox_event(
+            db, action="test.outbox", resource_type="test", organization_id=8
+        )
+        await db.commit()
+
+    relay = OutboxRelay(
+        batch_size=10, poll_interval=0.01, max_attempts=3, retry_backoff=60
+    )
+    send_batch = AsyncMock(return_value=[None, KafkaError("broker down")])
+
+    with (
+        patch("core.outbox.AsyncSessionLocal", TestingSessionLocal),
+        patch("core.outbox.kafka_producer.send_batch", send_batch),
+    ):
+        # Nothing is attempted while the broker is unreachable
+        assert await relay.relay_once() == 0
+        assert send_batch.await_count == 0
+
+        with connected():
+            assert await relay.relay_once() == 2
+
+    messages = send_batch.await_args.args[0]
+    assert [key for _, _, key in messages] == [b"org:7", b"org:8"]
+    assert messages[0][1]["event_id"] == str(first.event_id)
+    assert relay.published == 1 and relay.failed == 1
+
+    async with TestingSessionLocal() as db:
+        pending = (await db.execute(select(OutboxEvent))).scalars().all()
+
+        assert [event.event_id for event in pending] == [second.event_id]
+        assert pending[0].attempts == 1
+
+        await db.execute(delete(OutboxEvent))
+        await db.commit()
+
+
+async def test_lost_connection_does_not_count_as_an_attempt():
+    async with TestingSessionLocal() as db:
+        first, second = [
+            add_outbox_event(
+                db, action="test.outbox", resource_type="test", organization_id=7
+            )
+            for _ in range(2)
+        ]
+        await db.commit()
+
+    relay = OutboxRelay(
+        batch_size=10, poll_interval=0.01, max_attempts=1, retry_backoff=60
+    )
+    send_batch = AsyncMock(return_value=[KafkaConnectionError("connection lost")])
+
+    with (
+        patch("core.outbox.AsyncSessionLocal", TestingSessionLocal),
+        patch("core.outbox.kafka_producer.send_batch", send_batch),
+        connected(),
+    ):
+        assert await relay.relay_once() == 2
+        assert send_batch.await_count == 1
+        assert relay.failed == 0 and relay.dead_lettered == 0
+
+    async with TestingSessionLocal() as db:
+        pending = (
+            (await db.execute(select(OutboxEvent).order_by(OutboxEvent.id)))
+            .scalars()
+            .all()
+        )
+
+        assert [(event.event_id, event.attempts) for event in pending] == [
+            (first.event_id, 0),
+            (second.event_id, 0),
+        ]
+        assert pending[0].next_attempt_at is None
+
+        await db.execute(delete(OutboxEvent))
+        await db.commit()
+
+
+async def test_database_sink_stages_the_audit_row_with_the_change():
+    with patch("core.outbox.AUDIT_SINK", "database"):
+        async with TestingSessionLocal() as db:
+            row = add_outbox_event(
+                db, action="test.outbox", resource_type="test", organization_id=7
+            )
+            await db.commit()
+
+    async with TestingSessionLocal() as db:
+        audit = (
+            await db.execute(select(AuditLog).where(AuditLog.id == row.id))
+        ).scalar_one()
+
+        assert audit.action == "test.outbox" and audit.organization_id == 7
+        assert (await db.execute(select(OutboxEvent))).scalars().all() == []
+
+        await db.execute(delete(AuditLog).where(AuditLog.id == row.id))
+        await db.commit()
+
+
+async def test_relay_keeps_key_order_backs_off_and_dead_letters():
+    async with TestingSessionLocal() as db:
+        first, second, other = [
+            add_outbox_event(
+                db, action="test.outbox", resource_type="test", organization_id=org
+            )
+            for org in (7, 7, 8)
+        ]
+        await db.commit()
+
+    relay = OutboxRelay(
+        batch_size=10, poll_interval=0.01, max_attempts=2, retry_backoff=60
+    )
+    send_batch = AsyncMock(return_value=[KafkaError("broker down"), None])
+
+    with (
+        patch("core.outbox.AsyncSessionLocal", TestingSessionLocal),
+        patch("core.outbox.kafka_producer.send_batch", send_batch),
+        connected(),
+    ):
+        assert await relay.relay_once() == 3
+
+        # The second org:7 event is held back behind the failed first one
+        sent = [payload["event_id"] for _, payload, _ in send_batch.await_args.args[0]]
+        assert sent == [str(first.event_id), str(other.event_id)]
+        assert send_batch.await_count == 1
+
+        # The failed event backs off, and its key waits with it
+        assert await relay.relay_once() == 0
+
+        async with TestingSessionLocal() as db:
+            await db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.event_id == first.event_id)
+                .values(next_attempt_at=None)
+            )
+            await db.commit()
+
+        send_batch.return_value = [KafkaError("broker down")]
+        assert await relay.relay_once() == 2
+        assert relay.dead_lettered == 1
+
+        # A dead-lettered event no longer holds up its key
+        send_batch.return_value = [None]
+        assert await relay.relay_once() == 1
+        sent = [payload["event_id"] for _, payload, _ in send_batch.await_args.args[0]]
+        assert sent == [str(second.event_id)]
+        assert await relay.relay_once() == 0
+
+    async with TestingSessionLocal() as db:
+        pending = (await db.execute(select(OutboxEvent))).scalars().all()
+
+        assert [(event.event_id, event.attempts) for event in pending] == [
+            (first.event_id, 2)
+        ]
+
+        await db.execute(delete(OutboxEvent))
+        await db.commit()
@@ -0,0 +1,78 @@
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from core.query_budget import QueryBudgetMiddleware, budget_violations, query_budget
+from core.request_timing import record
+from database.db.session import _stop_query_timer
+from tests.conftest import engine
+
+
+def execute(statement: str):
+    # Feeds the engine's after_cursor_execute hook as a real statement would
+    conn = SimpleNamespace(info={"query_start_time": [time.perf_counter()]})
+    cursor = SimpleNamespace(rowcount=1)
+    _stop_query_timer(conn, cursor, statement, None, None, False)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/within")
+    @query_budget(db=2, redis=1)
+    async def within():
+        execute("SELECT id FROM users WHERE id = 1")
+        record("redis", 0.0, "GET")
+        return {}
+
+    @app.get("/over")
+    @query_budget(db=1, redis=0)
+    async def over():
+        execute("SELECT id FROM users WHERE id = 1")
+        execute("SELECT id FROM projects WHERE id = 1")
+        return {}
+
+    @app.get("/n-plus-one")
+    async def n_plus_one():
+        for user_id in range(3):
+            execute(f"SELECT name FROM users WHERE id = {user_id}")
+        return {}
+
+    app.add_middleware(QueryBudgetMiddleware, mode="enforce", n_plus_one_threshold=3)
+    return app
+
+
+async def test_query_budget_reports_overruns_and_repeated_statements():
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+        await c.get("/within")
+        assert not budget_violations
+
+        await c.get("/over")
+        await c.get("/n-plus-one")
+
+    violations = list(budget_violations)
+    budget_violations.clear()
+
+    assert [(v["message"], v["request"]) for v in violations] == [
+        ("Query budget exceeded", "GET /over"),
+        ("Possible N+1 query", "GET /n-plus-one"),
+    ]
+    assert violations[0]["db_calls"] == 2
+    assert violations[1]["fingerprint"] == "SELECT name FROM users WHERE id = ?"
+    assert violations[1]["count"] == 3
+
+
+async def test_failed_statements_do_not_leave_timers_on_the_connection():
+    async with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM no_such_table"))
+        await conn.execute(text("SELECT 1"))
+
+        assert conn.info.get("query_start_time") == []
@@ -0,0 +1,40 @@
+from core.query_stats import QueryStats, fingerprint
+
+
+def test_fingerprint_normalizes_literals_and_lists():
+    assert fingerprint(
+        "SELECT users.id FROM users WHERE users.email = $1 AND users.is_deleted IS false"
+    ) == fingerprint(
+        "SELECT users.id FROM users\n  WHERE users.email = 'a@b.c' AND users.is_deleted IS false"
+    )
+    assert fingerprint("SELECT * FROM t WHERE id IN ($1, $2, $3) LIMIT 10") == (
+        "SELECT * FROM t WHERE id IN (?+) LIMIT ?"
+    )
+    assert fingerprint("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == (
+        "INSERT INTO t (a, b) VALUES (?, ?)+"
+    )
+    assert fingerprint("SELECT users_1.id::TEXT FROM users AS users_1") == (
+        "SELECT users_1.id::TEXT FROM users AS users_1"
+    )
+
+
+def test_query_stats_ranks_fingerprints(caplog):
+    stats = QueryStats(max_fingerprints=2, window=100, slow_threshold=0.5)
+
+    stats.observe("SELECT id FROM projects WHERE id = 7", 0.9, 0)
+    for email in ("a", "b", "c"):
+        stats.observe(f"SELECT id FROM users WHERE email = '{email}'", 0.01, 1)
+    stats.observe("DELETE FROM jti_blocklist WHERE expires_at < $1", 0.001, 3)
+
+    top = stats.top(limit=5, order_by="count")
+
+    # The projects query was the least recently seen once the cap was hit
+    assert [entry["fingerprint"] for entry in top] == [
+        "SELECT id FROM users WHERE email = ?",
+        "DELETE FROM jti_blocklist WHERE expires_at < ?",
+    ]
+    assert top[0]["count"] == 3
+    assert top[0]["rows"] == 3
+    assert [
+        r.fingerprint for r in caplog.records if r.getMessage() == "Slow query"
+    ] == ["SELECT id FROM projects WHERE id = ?"]
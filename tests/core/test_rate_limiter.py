@@ -0,0 +1,29 @@
+from core.rate_limiter import MemoryRateLimitStore
+
+
+def test_memory_store_limits_per_key():
+    store = MemoryRateLimitStore(max_keys=10, sweep_interval=60)
+
+    assert [store.acquire("ip:1", 20, 60) for _ in range(3)] == [0, 0, 0]
+    assert store.acquire("ip:1", 20, 60) > 0
+    assert store.acquire("ip:2", 20, 60) == 0
+
+
+def test_memory_store_is_bounded():
+    store = MemoryRateLimitStore(max_keys=100, sweep_interval=60)
+
+    for i in range(1000):
+        store.acquire(f"ip:{i}", 20, 60)
+
+    assert len(store.tats) == 100
+    assert store.evicted == 900
+    assert "ip:999" in store.tats
+
+
+def test_memory_store_sweeps_idle_keys():
+    store = MemoryRateLimitStore(max_keys=10, sweep_interval=60)
+    store.acquire("idle", 0, 60)
+    store.acquire("busy", 20, 60)
+
+    assert store.sweep() == 1
+    assert list(store.tats) == ["busy"]
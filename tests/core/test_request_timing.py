@@ -0,0 +1,66 @@
+import logging
+
+import httpx
+from fastapi import FastAPI
+
+from core.logging_middleware import AccessLogSampler, LoggingMiddleware
+from core.request_timing import ServerTimingMiddleware, record, timed
+
+
+@timed("auth")
+async def authenticate():
+    record("redis", 0.002, "GET")
+    record("redis", 0.001, "MGET")
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        await authenticate()
+        record("db", 0.005, "SELECT")
+        return []
+
+    app.add_middleware(
+        LoggingMiddleware, sampler=AccessLogSampler(rules=[], slow_seconds=60)
+    )
+    app.add_middleware(ServerTimingMiddleware, mode=mode)
+    return app
+
+
+async def test_server_timing_header_and_access_log(caplog):
+    transport = httpx.ASGITransport(app=build_app("totals"))
+    with caplog.at_level(logging.INFO):
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            response = await c.get("/items")
+
+    entries = {
+        entry.split(";")[0]: entry
+        for entry in response.headers["server-timing"].split(", ")
+    }
+    assert set(entries) == {"auth", "redis", "db", "app"}
+    assert entries["redis"] == 'redis;dur=3.000;desc="2 calls"'
+
+    (access_log,) = [r for r in caplog.records if r.getMessage() == "HTTP request"]
+    assert access_log.timing_ms["db"] == 5.0
+    assert access_log.timing_calls == {"auth": 1, "redis": 2, "db": 1}
+    assert not hasattr(access_log, "timing_spans")
+
+
+async def test_server_timing_detailed_mode_lists_spans():
+    transport = httpx.ASGITransport(app=build_app("detailed"))
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+        response = await c.get("/items")
+
+    header = response.headers["server-timing"]
+    assert 'redis.0;dur=2.000;desc="GET' in header
+    assert "db.3;dur=5.000" in header
+
+
+async def test_server_timing_off():
+    transport = httpx.ASGITransport(app=build_app("off"))
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+        response = await c.get("/items")
+
+    assert "server-timing" not in response.headers
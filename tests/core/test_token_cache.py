@@ -0,0 +1,46 @@
+import time
+
+from unittest.mock import AsyncMock, patch
+
+from api.v2.schemas.authorization_schemas import TokenData
+from core.config import env
+from core.token_blocklist import cache_revoked_jti
+from core.token_cache import VerifiedTokenCache
+
+
+def make_token_data(jti: str, exp: float) -> TokenData:
+    return TokenData(user_id=1, token_type="access", jti=jti, exp=int(exp))
+
+
+def test_token_cache_serves_until_revoked():
+    cache = VerifiedTokenCache(max_entries=10)
+    digest = cache.digest("token")
+    cache.put(digest, make_token_data("jti-1", time.time() + 300))
+
+    assert cache.get(digest).jti == "jti-1"
+
+    cache.revoke("jti-1", int(time.time() + 300))
+
+    assert cache.get(digest) is None
+    cache.put(digest, make_token_data("jti-1", time.time() + 300))
+    assert cache.get(digest) is None
+
+
+def test_token_cache_skips_expired_tokens():
+    cache = VerifiedTokenCache(max_entries=10)
+    digest = cache.digest("expired")
+    cache.put(digest, make_token_data("jti-2", time.time() - 1))
+
+    assert cache.get(digest) is None
+
+
+async def test_revoked_jti_without_exp_expires_with_the_refresh_token():
+    redis = AsyncMock()
+    payload = TokenData(user_id=1, token_type="refresh", jti="jti-3")
+
+    with patch("core.token_blocklist.redis", redis):
+        await cache_revoked_jti(payload)
+
+    redis.set.assert_awaited_once_with(
+        "jti_blocklist:jti-3", 1, ex=env.refresh_token_expire_days * 24 * 60 * 60
+    )
@@ -86,3 +86,69 @@ async def test_refresh_token_missing_cookie(client: AsyncClient):
     response = await client.post("/v2/auth/refresh-token")
     assert response.status_code == 401
     assert response.json()["detail"] == "Refresh Token missing"
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_rejected_after_logout(client: AsyncClient):
+    password = "Strongpassword#12345678"
+    email = "logout-blocklist@example.com"
+    register_payload = {
+        "name": "Logout User",
+        "email": email,
+        "password": password,
+    }
+
+    register_response = await client.post("/v2/users/register", json=register_payload)
+    assert register_response.status_code == 201
+
+    login_response = await client.post(
+        "/v2/auth/login",
+        data={"username": email, "password": password},
+    )
+    assert login_response.status_code == 200
+    refresh_token = login_response.cookies.get("refresh_token")
+
+    logout_response = await client.post(
+        "/v2/auth/logout",
+        cookies={"refresh_token": refresh_token},
+    )
+    assert logout_response.status_code == 200
+
+    refresh_response = await client.post(
+        "/v2/auth/refresh-token",
+        cookies={"refresh_token": refresh_token},
+    )
+    assert refresh_response.status_code == 401
+    assert refresh_response.json()["detail"] == "Token expired or blocklisted"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refresh_with_the_same_cookie_is_a_replay(
+    client: AsyncClient,
+):
+    password = "Strongpassword#12345678"
+    email = "refresh-replay@example.com"
+    register_response = await client.post(
+        "/v2/users/register",
+        json={"name": "Replay User", "email": email, "password": password},
+    )
+    assert register_response.status_code == 201
+
+    login_response = await client.post(
+        "/v2/auth/login",
+        data={"username": email, "password": password},
+    )
+    refresh_token = login_response.cookies.get("refresh_token")
+
+    first = await client.post(
+        "/v2/auth/refresh-token", cookies={"refresh_token": refresh_token}
+    )
+    assert first.status_code == 200
+
+    # The second request passed the blocklist check before the first committed
+    with patch("core.utils.is_jti_blocklisted", new=AsyncMock(return_value=False)):
+        second = await client.post(
+            "/v2/auth/refresh-token", cookies={"refresh_token": refresh_token}
+        )
+    assert second.status_code == 401
+    assert second.json()["detail"] == "Token expired or blocklisted"
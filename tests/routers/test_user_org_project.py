@@ -1,20 +1,68 @@
+import base64
+import orjson
 import pytest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
 from httpx import AsyncClient
 
+from core.request_timing import record
+from core.utils import invalidate_redis_keys_on_profile_change
+from database.models.audit_log import AuditLog
+from database.models.users import Users
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def set(self, *args, **kwargs):
+        self.commands.append(lambda: self.redis.set(*args, pipelined=True, **kwargs))
+        return self
+
+    def get(self, key):
+        self.commands.append(lambda: self.redis.get(key, pipelined=True))
+        return self
+
+    def incr(self, key):
+        self.commands.append(lambda: self.redis.incr(key, pipelined=True))
+        return self
+
+    async def execute(self):
+        record("redis", 0.0, "PIPELINE")
+        return [await command() for command in self.commands]
+
 
 class FakeAsyncRedis:
+    """Counts every command as one Redis round trip for the query budgets;
+    pipelined commands are counted once, by FakePipeline.execute."""
+
     def __init__(self):
         self.store = {}
 
-    async def get(self, key):
+    async def get(self, key, pipelined=False):
+        if not pipelined:
+            record("redis", 0.0, "GET")
         return self.store.get(key)
 
-    async def set(self, key, value, ex=None):
+    async def mget(self, keys):
+        record("redis", 0.0, "MGET")
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False, pipelined=False):
+        if not pipelined:
+            record("redis", 0.0, "SET")
+        if nx and key in self.store:
+            return None
         self.store[key] = value
         return True
 
-    async def incr(self, key):
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def incr(self, key, pipelined=False):
+        if not pipelined:
+            record("redis", 0.0, "INCR")
         value = int(self.store.get(key, 0) or 0) + 1
         self.store[key] = value
         return value
@@ -26,10 +74,7 @@ def mock_redis():
     with (
         patch("core.oauth2.redis", fake_redis),
         patch("core.utils.redis", fake_redis),
-        patch("api.v2.users.list_orgs.redis", fake_redis),
-        patch("api.v2.organizations.list_users.redis", fake_redis),
-        patch("api.v2.projects.list_projects.redis", fake_redis),
-        patch("api.v2.projects.list_members.redis", fake_redis),
+        patch("core.redis.versioned_cache.redis", fake_redis),
     ):
         yield
 
@@ -42,11 +87,12 @@ def mock_audit_logs():
         patch("api.v2.organizations.register.audit_logs", new=AsyncMock()),
         patch("api.v2.organizations.add_user.audit_logs", new=AsyncMock()),
         patch("api.v2.organizations.remove_member.audit_logs", new=AsyncMock()),
+        patch("api.v2.organizations.sync_members.audit_logs", new=AsyncMock()),
         patch("api.v2.projects.create.audit_logs", new=AsyncMock()),
         patch("api.v2.projects.update.audit_logs", new=AsyncMock()),
         patch("api.v2.projects.delete.audit_logs", new=AsyncMock()),
-        patch("api.v2.projects.add_user.audit_logs", new=AsyncMock()),
         patch("api.v2.projects.remove_user.audit_logs", new=AsyncMock()),
+        patch("api.v2.projects.sync_members.audit_logs", new=AsyncMock()),
     ):
         yield
 
@@ -279,3 +325,442 @@ async def test_project_membership_flow(client: AsyncClient):
     )
     assert list_after_remove_response.status_code == 404
     assert list_after_remove_response.json()["detail"] == "No member in the project"
+
+
+@pytest.mark.asyncio
+async def test_list_projects_cursor_pagination(client: AsyncClient):
+    email = "cursorflow@example.com"
+    password = "Strongpassword#12345678"
+
+    await register_user(client, email, password)
+    access_token = await login_user(client, email, password)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    org_response = await client.post(
+        "/v2/organizations/register",
+        json={"name": "Cursor Org"},
+        headers=headers,
+    )
+    assert org_response.status_code == 201
+    org_id = org_response.json()["id"]
+
+    select_response = await client.post(
+        f"/v2/organizations/select/{org_id}", headers=headers
+    )
+    selected_headers = {
+        "Authorization": f"Bearer {select_response.json()['access_token']}"
+    }
+
+    for name in ("Cursor A", "Cursor B", "Cursor C"):
+        create_response = await client.post(
+            "/v2/projects/", json={"name": name}, headers=selected_headers
+        )
+        assert create_response.status_code == 201
+
+    first_page = await client.get("/v2/projects/?page_size=2", headers=selected_headers)
+    assert first_page.status_code == 200
+    first_data = first_page.json()
+    assert [p["name"] for p in first_data["project_details"]] == [
+        "Cursor A",
+        "Cursor B",
+    ]
+    assert first_data["next_cursor"]
+
+    second_page = await client.get(
+        f"/v2/projects/?page_size=2&after={first_data['next_cursor']}",
+        headers=selected_headers,
+    )
+    assert second_page.status_code == 200
+    second_data = second_page.json()
+    assert [p["name"] for p in second_data["project_details"]] == ["Cursor C"]
+    assert second_data["next_cursor"] is None
+
+    bool_cursor = base64.urlsafe_b64encode(b'{"id":true}').decode()
+    for cursor in ("not-a-cursor", "\u00e9", bool_cursor):
+        invalid_cursor = await client.get(
+            "/v2/projects/", params={"after": cursor}, headers=selected_headers
+        )
+        assert invalid_cursor.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_members_streams_ndjson_and_honours_etag(
+    client: AsyncClient, db_session
+):
+    email = "exportflow@example.com"
+    password = "Strongpassword#12345678"
+
+    user = await register_user(client, email, password)
+    access_token = await login_user(client, email, password)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    org_response = await client.post(
+        "/v2/organizations/register",
+        json={"name": "Export Org"},
+        headers=headers,
+    )
+    org_id = org_response.json()["id"]
+
+    select_response = await client.post(
+        f"/v2/organizations/select/{org_id}", headers=headers
+    )
+    selected_headers = {
+        "Authorization": f"Bearer {select_response.json()['access_token']}"
+    }
+
+    export_response = await client.get(
+        "/v2/organizations/users/export", headers=selected_headers
+    )
+    assert export_response.status_code == 200
+    assert export_response.headers["content-type"] == "application/x-ndjson"
+    rows = [orjson.loads(line) for line in export_response.text.splitlines()]
+    assert rows == [
+        {
+            "user_id": user["id"],
+            "name": "Org Project User",
+            "email": email,
+            "role": "owner",
+        }
+    ]
+
+    etag = export_response.headers["etag"]
+    not_modified = await client.get(
+        "/v2/organizations/users/export",
+        headers={**selected_headers, "If-None-Match": etag},
+    )
+    assert not_modified.status_code == 304
+
+    member = await db_session.get(Users, user["id"])
+    member.name = "Renamed User"
+    await db_session.flush()
+    await invalidate_redis_keys_on_profile_change(user["id"])
+
+    renamed = await client.get(
+        "/v2/organizations/users/export",
+        headers={**selected_headers, "If-None-Match": etag},
+    )
+    assert renamed.status_code == 200
+    assert renamed.headers["etag"] != etag
+    assert orjson.loads(renamed.text)["name"] == "Renamed User"
+
+    csv_response = await client.get(
+        "/v2/organizations/users/export?format=csv", headers=selected_headers
+    )
+    assert csv_response.status_code == 200
+    assert csv_response.text.splitlines()[0] == "user_id,name,email,role"
+
+
+@pytest.mark.asyncio
+async def test_audit_logs_are_filtered_and_paged_newest_first(
+    client: AsyncClient, db_session
+):
+    email = "auditflow@example.com"
+    password = "Strongpassword#12345678"
+
+    user = await register_user(client, email, password)
+    access_token = await login_user(client, email, password)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    org_response = await client.post(
+        "/v2/organizations/register",
+        json={"name": "Audit Org"},
+        headers=headers,
+    )
+    org_id = org_response.json()["id"]
+
+    select_response = await client.post(
+        f"/v2/organizations/select/{org_id}", headers=headers
+    )
+    selected_headers = {
+        "Authorization": f"Bearer {select_response.json()['access_token']}"
+    }
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i, action in enumerate(["user.added", "project.created"] * 3):
+        db_session.add(
+            AuditLog(
+                timestamp=start + timedelta(minutes=i),
+                actor_user_id=user["id"],
+                organization_id=org_id,
+                action=action,
+                resource_type="test",
+                resource_id=str(i),
+            )
+        )
+    db_session.add(
+        AuditLog(
+            timestamp=start,
+            organization_id=org_id + 1000,
+            action="user.added",
+            resource_type="test",
+        )
+    )
+    await db_session.flush()
+
+    first_page = await client.get(
+        "/v2/organizations/audit-logs?action=user.added&page_size=2",
+        headers=selected_headers,
+    )
+    assert first_page.status_code == 200
+    first_data = first_page.json()
+    assert [log["resource_id"] for log in first_data["audit_logs"]] == ["4", "2"]
+    assert first_data["next_cursor"]
+
+    second_page = await client.get(
+        "/v2/organizations/audit-logs?action=user.added&page_size=2"
+        f"&after={first_data['next_cursor']}",
+        headers=selected_headers,
+    )
+    assert [log["resource_id"] for log in second_page.json()["audit_logs"]] == ["0"]
+    assert second_page.json()["next_cursor"] is None
+
+    windowed = await client.get(
+        "/v2/organizations/audit-logs",
+        params={
+            "since": (start + timedelta(minutes=1)).isoformat(),
+            "until": (start + timedelta(minutes=3)).isoformat(),
+        },
+        headers=selected_headers,
+    )
+    assert [log["resource_id"] for log in windowed.json()["audit_logs"]] == ["2", "1"]
+
+    for cursor in ("not-a-cursor", "\u00e9", "\x00"):
+        invalid_cursor = await client.get(
+            "/v2/organizations/audit-logs",
+            params={"after": cursor},
+            headers=selected_headers,
+        )
+        assert invalid_cursor.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_add_and_remove_members_report_each_email(client: AsyncClient):
+    password = "Strongpassword#12345678"
+    owner_email = "bulkowner@example.com"
+    await register_user(client, owner_email, password)
+    for i in range(3):
+        await register_user(client, f"bulk{i}@example.com", password)
+
+    access_token = await login_user(client, owner_email, password)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    org_response = await client.post(
+        "/v2/organizations/register", json={"name": "Bulk Org"}, headers=headers
+    )
+    org_id = org_response.json()["id"]
+    select_response = await client.post(
+        f"/v2/organizations/select/{org_id}", headers=headers
+    )
+    selected_headers = {
+        "Authorization": f"Bearer {select_response.json()['access_token']}"
+    }
+
+    add_response = await client.post(
+        "/v2/organizations/members/bulk",
+        json={
+            "members": [
+                {"email": "bulk0@example.com", "role": "member"},
+                {"email": "bulk1@example.com", "role": "admin"},
+                {"email": owner_email, "role": "member"},
+                {"email": "nobody@example.com", "role": "member"},
+                {"email": "bulk0@example.com", "role": "admin"},
+            ]
+        },
+        headers=selected_headers,
+    )
+    assert add_response.status_code == 200
+    assert [r["status"] for r in add_response.json()["results"]] == [
+        "added",
+        "added",
+        "already_member",
+        "not_found",
+        "duplicate",
+    ]
+
+    users_response = await client.get(
+        "/v2/organizations/users", headers=selected_headers
+    )
+    assert sorted(u["email"] for u in users_response.json()["user_details"]) == [
+        "bulk0@example.com",
+        "bulk1@example.com",
+        owner_email,
+    ]
+
+    remove_response = await client.request(
+        "DELETE",
+        "/v2/organizations/members/bulk",
+        json={
+            "emails": [
+                "bulk0@example.com",
+                "bulk2@example.com",
+                owner_email,
+                "nobody@example.com",
+            ]
+        },
+        headers=selected_headers,
+    )
+    assert remove_response.status_code == 200
+    assert [r["status"] for r in remove_response.json()["results"]] == [
+        "removed",
+        "not_member",
+        "last_owner",
+        "not_found",
+    ]
+
+    users_response = await client.get(
+        "/v2/organizations/users", headers=selected_headers
+    )
+    assert sorted(u["email"] for u in users_response.json()["user_details"]) == [
+        "bulk1@example.com",
+        owner_email,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sync_members_applies_desired_state_and_supports_dry_run(
+    client: AsyncClient,
+):
+    password = "Strongpassword#12345678"
+    owner_email = "syncowner@example.com"
+    await register_user(client, owner_email, password)
+    for i in range(4):
+        await register_user(client, f"sync{i}@example.com", password)
+
+    access_token = await login_user(client, owner_email, password)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    org_response = await client.post(
+        "/v2/organizations/register", json={"name": "Sync Org"}, headers=headers
+    )
+    org_id = org_response.json()["id"]
+    select_response = await client.post(
+        f"/v2/organizations/select/{org_id}", headers=headers
+    )
+    selected_headers = {
+        "Authorization": f"Bearer {select_response.json()['access_token']}"
+    }
+
+    await client.post(
+        "/v2/organizations/members/bulk",
+        json={
+            "members": [
+                {"email": "sync0@example.com", "role": "member"},
+                {"email": "sync1@example.com", "role": "member"},
+            ]
+        },
+        headers=selected_headers,
+    )
+    await client.post(
+        "/v2/projects/", json={"name": "Sync Project"}, headers=selected_headers
+    )
+    projects_response = await client.get("/v2/projects/", headers=selected_headers)
+    project_id = projects_response.json()["project_details"][0]["project_id"]
+    await client.post(
+        f"/v2/projects/{project_id}/member",
+        json={"email": "sync0@example.com"},
+        headers=selected_headers,
+    )
+
+    desired = {
+        "members": [
+            {"email": owner_email, "role": "owner"},
+            {"email": "sync1@example.com", "role": "admin"},
+            {"email": "sync2@example.com", "role": "member"},
+            {"email": "ghost@example.com", "role": "member"},
+        ]
+    }
+    dry_run = await client.put(
+        "/v2/organizations/members/sync?dry_run=true",
+        json=desired,
+        headers=selected_headers,
+    )
+    assert dry_run.status_code == 200
+    diff = dry_run.json()
+    assert diff["dry_run"] is True
+    assert [(c["email"], c["to_role"]) for c in diff["added"]] == [
+        ("sync2@example.com", "member")
+    ]
+    assert [(c["email"], c["from_role"]) for c in diff["removed"]] == [
+        ("sync0@example.com", "member")
+    ]
+    assert [
+        (c["email"], c["from_role"], c["to_role"]) for c in diff["role_changed"]
+    ] == [("sync1@example.com", "member", "admin")]
+    assert diff["not_found"] == ["ghost@example.com"]
+
+    users_response = await client.get(
+        "/v2/organizations/users", headers=selected_headers
+    )
+    assert len(users_response.json()["user_details"]) == 3
+
+    applied = await client.put(
+        "/v2/organizations/members/sync", json=desired, headers=selected_headers
+    )
+    assert applied.status_code == 200
+    assert {k: v for k, v in applied.json().items() if k != "dry_run"} == {
+        k: v for k, v in diff.items() if k != "dry_run"
+    }
+
+    users_response = await client.get(
+        "/v2/organizations/users", headers=selected_headers
+    )
+    assert sorted(u["email"] for u in users_response.json()["user_details"]) == [
+        "sync1@example.com",
+        "sync2@example.com",
+        owner_email,
+    ]
+
+    # Removing sync0 from the organization also removed it from the project
+    project_sync = await client.put(
+        f"/v2/projects/{project_id}/members/sync?dry_run=true",
+        json={
+            "emails": ["sync1@example.com", "sync2@example.com", "sync3@example.com"]
+        },
+        headers=selected_headers,
+    )
+    assert project_sync.json() == {
+        "dry_run": True,
+        "added": ["sync1@example.com", "sync2@example.com"],
+        "removed": [],
+        "not_in_organization": ["sync3@example.com"],
+        "not_found": [],
+    }
+
+    for emails in (["sync1@example.com", "sync2@example.com"], ["sync1@example.com"]):
+        project_sync = await client.put(
+            f"/v2/projects/{project_id}/members/sync",
+            json={"emails": emails},
+            headers=selected_headers,
+        )
+        assert project_sync.status_code == 200
+    assert project_sync.json()["removed"] == ["sync2@example.com"]
+
+    members_response = await client.get(
+        f"/v2/projects/{project_id}/members", headers=selected_headers
+    )
+    assert [m["email"] for m in members_response.json()["member_details"]] == [
+        "sync1@example.com"
+    ]
+
+    no_owner = await client.put(
+        "/v2/organizations/members/sync",
+        json={"members": [{"email": "sync1@example.com", "role": "admin"}]},
+        headers=selected_headers,
+    )
+    assert no_owner.status_code == 400
+
+    # An owner email that matches no live user does not count as an owner
+    ghost_owner = await client.put(
+        "/v2/organizations/members/sync",
+        json={
+            "members": [
+                {"email": "ghost@example.com", "role": "owner"},
+                {"email": "sync1@example.com", "role": "admin"},
+            ]
+        },
+        headers=selected_headers,
+    )
+    assert ghost_owner.status_code == 400
+
+    users_response = await client.get(
+        "/v2/organizations/users", headers=selected_headers
+    )
+    assert owner_email in [u["email"] for u in users_response.json()["user_details"]]